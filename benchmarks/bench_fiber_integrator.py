@@ -0,0 +1,101 @@
+"""
+Benchmark of the NumPy fiber integrator against the OpenSees moment-curvature analysis.
+
+A rectangular RC section is meshed by FiberSecMesh, with Concrete01 cover and core and Steel01 rebars.
+The moment-curvature curve is computed by MomentCurvature (a zeroLengthSection element and SmartAnalyze),
+by FiberMomentCurvature for the same axial load, and by FiberMomentCurvature.sweep for many axial loads.
+The wall time, the (P, phi) points per second and the difference of the moments are reported.
+
+Usage::
+
+    python benchmarks/bench_fiber_integrator.py --mesh-size 0.05 --incr-phi 2e-4 --num-axial 50
+"""
+
+import argparse
+import time
+
+import numpy as np
+import openseespy.opensees as ops
+
+import opstool as opst
+
+MATERIALS = {
+    1: ("Concrete01", (-30.0, -0.002, -15.0, -0.005)),
+    2: ("Concrete01", (-40.0, -0.006, -30.0, -0.015)),
+    3: ("Steel01", (400.0, 2.0e5, 0.02)),
+}
+LAWS = {
+    1: opst.anlys.KentParkConcreteLaw(*MATERIALS[1][1]),
+    2: opst.anlys.KentParkConcreteLaw(*MATERIALS[2][1]),
+    3: opst.anlys.BilinearSteelLaw(*MATERIALS[3][1]),
+}
+
+
+def build_section(mesh_size: float):
+    outlines = [[0, 0], [1.0, 0], [1.0, 0.6], [0, 0.6]]
+    coverlines = opst.pre.section.offset(outlines, d=0.05)
+    sec_mesh = opst.pre.section.FiberSecMesh()
+    sec_mesh.add_patch_group(
+        {
+            "cover": opst.pre.section.create_polygon_patch(outlines, holes=[coverlines]),
+            "core": opst.pre.section.create_polygon_patch(coverlines),
+        }
+    )
+    sec_mesh.set_mesh_size({"cover": mesh_size, "core": mesh_size})
+    sec_mesh.set_ops_mat_tag({"cover": 1, "core": 2})
+    sec_mesh.mesh()
+    sec_mesh.add_rebar_line(
+        points=opst.pre.section.offset(coverlines, d=0.02), dia=0.025, gap=0.1, ops_mat_tag=3
+    )
+    sec_mesh.centring()
+    return sec_mesh
+
+
+def define_ops_section(sec_mesh):
+    ops.wipe()
+    ops.model("basic", "-ndm", 3, "-ndf", 6)
+    for tag, (mat_type, args) in MATERIALS.items():
+        ops.uniaxialMaterial(mat_type, tag, *args)
+    sec_mesh.to_opspy_cmds(secTag=1, GJ=1e6)
+
+
+def main(mesh_size: float, incr_phi: float, max_phi: float, num_axial: int):
+    sec_mesh = build_section(mesh_size)
+    P = -3.0
+    define_ops_section(sec_mesh)
+    mc = opst.anlys.MomentCurvature(sec_tag=1, axial_force=P)
+    start = time.perf_counter()
+    mc.analyze(axis="y", max_phi=max_phi, incr_phi=incr_phi)
+    t_ops = time.perf_counter() - start
+
+    fmc = opst.anlys.FiberMomentCurvature(sec_mesh, LAWS, axial_force=P)
+    start = time.perf_counter()
+    fmc.analyze(axis="y", max_phi=max_phi, incr_phi=incr_phi)
+    t_numpy = time.perf_counter() - start
+
+    axial_forces = np.linspace(-20.0, 0.0, num_axial)
+    start = time.perf_counter()
+    data = fmc.sweep(axial_forces, axis="y", max_phi=max_phi, incr_phi=incr_phi)
+    t_sweep = time.perf_counter() - start
+
+    n = min(len(mc.M), len(fmc.M))
+    diff = np.max(np.abs(mc.M[:n] - fmc.M[:n])) / np.max(np.abs(mc.M))
+    num_points = int(data["numSteps"].sum())
+    print(f"{len(fmc.fibers)} fibers, {len(mc.M)} steps, max relative difference of M: {diff:.2e}")
+    print(f"{'Method':<36}{'Time [s]':>10}{'Points':>10}{'Points/s':>12}")
+    for name, t, points in (
+        ("MomentCurvature (OpenSees)", t_ops, len(mc.M)),
+        ("FiberMomentCurvature.analyze", t_numpy, len(fmc.M)),
+        (f"FiberMomentCurvature.sweep ({num_axial} P)", t_sweep, num_points),
+    ):
+        print(f"{name:<36}{t:>10.3f}{points:>10d}{points / t:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mesh-size", type=float, default=0.05)
+    parser.add_argument("--incr-phi", type=float, default=2e-4)
+    parser.add_argument("--max-phi", type=float, default=0.06)
+    parser.add_argument("--num-axial", type=int, default=50)
+    args = parser.parse_args()
+    main(args.mesh_size, args.incr_phi, args.max_phi, args.num_axial)
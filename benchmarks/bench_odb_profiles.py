@@ -0,0 +1,88 @@
+"""
+Benchmark of the ODB storage profiles on the bundled example models.
+
+For each model, a static analysis is run and its responses are saved with each profile,
+the write time, read time and file size are reported.
+
+Usage::
+
+    python benchmarks/bench_odb_profiles.py --steps 50 --models Frame3D Shell3D Pier-Brick
+"""
+
+import argparse
+import os
+import time
+
+import openseespy.opensees as ops
+import xarray as xr
+
+import opstool as opst
+from opstool.utils import CONSTANTS
+
+PROFILES = [None, "zlib", "archive", "fast-write", "visualization"]
+
+
+def run_analysis(model: str, num_steps: int):
+    opst.load_ops_examples(model)
+    ops.wipeAnalysis()
+    ops.timeSeries("Linear", 999)
+    ops.pattern("Plain", 999, 999)
+    fixed_nodes = ops.getFixedNodes()
+    for tag in ops.getNodeTags()[::7]:
+        ndm, ndf = len(ops.nodeCoord(tag)), ops.getNDF(tag)[0]
+        if tag in fixed_nodes or ndf < ndm:
+            continue
+        load = [0.0] * ndf
+        load[ndm - 1] = -1.0
+        ops.load(tag, *load)
+    ops.system("UmfPack")
+    ops.numberer("RCM")
+    ops.constraints("Transformation")
+    ops.test("NormDispIncr", 1e-6, 20)
+    ops.algorithm("Newton")
+    ops.integrator("LoadControl", 1.0 / num_steps)
+    ops.analysis("Static")
+    odb = opst.post.CreateODB(odb_tag="bench", save_every=None, keep_last_steps=None)
+    for _ in range(num_steps):
+        ops.analyze(1)
+        odb.fetch_response_step()
+    return odb
+
+
+def bench_model(model: str, num_steps: int):
+    odb = run_analysis(model, num_steps)
+    filename = f"{CONSTANTS.get_output_dir()}/{CONSTANTS.get_resp_filename()}-bench.nc"
+    results = []
+    for profile in PROFILES:
+        start = time.perf_counter()
+        if profile == "zlib":
+            odb.save_response(zlib=True)
+        else:
+            odb.save_response(profile=profile)
+        write_time = time.perf_counter() - start
+        start = time.perf_counter()
+        with xr.open_datatree(filename, engine="netcdf4") as dt:
+            dt.load()
+        read_time = time.perf_counter() - start
+        size = os.path.getsize(filename) / 1024 ** 2
+        results.append((model, str(profile), write_time, read_time, size))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--models", nargs="+", default=["Frame3D", "ArchBridge", "Shell3D", "Pier-Brick"])
+    args = parser.parse_args()
+
+    results = []
+    for model in args.models:
+        results.extend(bench_model(model, args.steps))
+    lines = [f"{'model':<12}{'profile':<16}{'write [s]':>10}{'read [s]':>10}{'size [MB]':>11}"]
+    for model, profile, write_time, read_time, size in results:
+        lines.append(f"{model:<12}{profile:<16}{write_time:>10.3f}{read_time:>10.3f}{size:>11.2f}")
+    print("\n".join(lines))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark of the fiber extraction of FiberSecMesh on the RC box section of the section mesh examples.
+
+For each mesh size, the section is meshed and the wall time of each meshing step is reported by
+``FiberSecMesh.get_mesh_timing()``, together with the time of the former per-triangle loop,
+whose fiber centers and areas are checked against the vectorized ones.
+
+Usage::
+
+    python benchmarks/bench_sec_mesh.py --mesh-sizes 0.25 0.1 0.05 0.025
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import opstool as opst
+
+
+def build_section(mesh_size: float):
+    # docs/examples/section.mesh/rc_mesh.ipynb
+    outlines = [[0.5, 0], [7.5, 0], [8, 0.5], [8, 4.5], [7.5, 5], [0.5, 5], [0, 4.5], [0, 0.5]]
+    coverlines = opst.pre.section.offset(outlines, d=0.08)
+    cover_geo = opst.pre.section.create_polygon_patch(outlines, holes=[coverlines])
+    holelines1 = [[1, 1], [3.5, 1], [3.5, 4], [1, 4]]
+    holelines2 = [[4.5, 1], [7, 1], [7, 4], [4.5, 4]]
+    core_geo = opst.pre.section.create_polygon_patch(coverlines, holes=[holelines1, holelines2])
+    sec_mesh = opst.pre.section.FiberSecMesh()
+    sec_mesh.add_patch_group({"cover": cover_geo, "core": core_geo})
+    sec_mesh.set_mesh_size({"cover": mesh_size, "core": mesh_size})
+    sec_mesh.set_ops_mat_tag({"cover": 1, "core": 2})
+    sec_mesh.mesh()
+    return sec_mesh
+
+
+def loop_fiber_data(sec_mesh):
+    """The former per-triangle loop of FiberSecMesh._get_mesh_data."""
+    vertices = sec_mesh.mesh_obj["vertices"]
+    triangles = sec_mesh.mesh_obj["triangles"][:, :3]
+    triangle_attributes = sec_mesh.mesh_obj["triangle_attributes"]
+    attributes = np.atleast_1d(np.unique(triangle_attributes))
+    cells_map = {name: [] for name in sec_mesh.geom_group_map.keys()}
+    for name, attri in zip(sec_mesh.geom_names, attributes):
+        idx = triangle_attributes == attri
+        cells_map[name].append(triangles[idx[:, 0]])
+    centers_map, areas_map = dict(), dict()
+    for name in cells_map.keys():
+        areas, centers = [], []
+        for face in np.vstack(cells_map[name]):
+            coord1, coord2, coord3 = vertices[face[0]], vertices[face[1]], vertices[face[2]]
+            centers.append((coord1 + coord2 + coord3) / 3)
+            x1, y1 = coord1[:2]
+            x2, y2 = coord2[:2]
+            x3, y3 = coord3[:2]
+            areas.append(0.5 * np.abs(x2 * y3 + x1 * y2 + x3 * y1 - x3 * y2 - x2 * y1 - x1 * y3))
+        centers_map[name], areas_map[name] = np.array(centers), np.array(areas)
+    return centers_map, areas_map
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mesh-sizes", type=float, nargs="+", default=[0.25, 0.1, 0.05, 0.025])
+    args = parser.parse_args()
+
+    lines = [
+        f"{'mesh size':>10}{'triangles':>11}{'triangulate [s]':>17}{'section [s]':>13}"
+        f"{'fibers [s]':>12}{'loop [s]':>10}{'speedup':>9}"
+    ]
+    for mesh_size in args.mesh_sizes:
+        sec_mesh = build_section(mesh_size)
+        timing = sec_mesh.get_mesh_timing()
+        start = time.perf_counter()
+        centers_map, areas_map = loop_fiber_data(sec_mesh)
+        loop_time = time.perf_counter() - start
+        for name in centers_map.keys():
+            np.testing.assert_allclose(sec_mesh.fiber_centers_map[name], centers_map[name])
+            np.testing.assert_allclose(sec_mesh.fiber_areas_map[name], areas_map[name])
+        lines.append(
+            f"{mesh_size:>10g}{len(sec_mesh.mesh_obj['triangles']):>11d}{timing['triangulate']:>17.4f}"
+            f"{timing['section']:>13.4f}{timing['fibers']:>12.4f}{loop_time:>10.4f}"
+            f"{loop_time / timing['fibers']:>9.1f}"
+        )
+    print("\n".join(lines))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark of the section property cache of FiberSecMesh on the RC box section of the section mesh examples.
+
+For each mesh size, the wall time of ``get_frame_props`` and ``get_sec_props`` is reported
+for a cold cache (the sectionproperties analyses are solved), for the same section built again
+(memory cache), for a new session (disk cache), and after ``rotate`` and ``centring``,
+whose props are transformed analytically from the cached ones.
+
+Usage::
+
+    python benchmarks/bench_sec_props.py --mesh-sizes 0.25 0.1 0.05
+"""
+
+import argparse
+import tempfile
+import time
+
+from opstool.pre.section.sec_mesh import _SEC_PROPS_CACHE
+
+from bench_sec_mesh import build_section
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mesh-sizes", type=float, nargs="+", default=[0.25, 0.1, 0.05])
+    args = parser.parse_args()
+
+    lines = [
+        f"{'mesh size':>10}{'triangles':>11}{'frame [s]':>11}{'sec [s]':>10}{'memory [s]':>12}"
+        f"{'disk [s]':>10}{'rotate [s]':>12}{'centring [s]':>14}"
+    ]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for mesh_size in args.mesh_sizes:
+            _SEC_PROPS_CACHE.clear()
+            sec_mesh = build_section(mesh_size).set_props_cache_dir(cache_dir)
+            t_frame = timed(sec_mesh.get_frame_props)
+            # the warping analysis runs when the shear areas are first requested
+            t_sec = timed(sec_mesh.get_sec_props)
+            t_memory = timed(build_section(mesh_size).get_sec_props)
+            _SEC_PROPS_CACHE.clear()
+            t_disk = timed(build_section(mesh_size).set_props_cache_dir(cache_dir).get_sec_props)
+            t_rotate = timed(sec_mesh.rotate, 30)
+            t_centring = timed(sec_mesh.centring)
+            lines.append(
+                f"{mesh_size:>10g}{len(sec_mesh.mesh_obj['triangles']):>11d}{t_frame:>11.4f}{t_sec:>10.4f}"
+                f"{t_memory:>12.4f}{t_disk:>10.4f}{t_rotate:>12.4f}{t_centring:>14.4f}"
+            )
+    print("\n".join(lines))
+
+
+if __name__ == "__main__":
+    main()
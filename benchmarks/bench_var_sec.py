@@ -0,0 +1,86 @@
+"""
+Benchmark of the batch meshing of a tapered hollow pier section along a member.
+
+The stations are meshed by ``mesh_var_sections``, which triangulates the section at end i once and maps
+the mesh to each station, and by the former workflow, one ``FiberSecMesh.mesh()`` per station from the
+outlines of ``var_line_string``. The wall time of the meshing, the fiber areas of both, and the wall time
+of the frame properties of all stations (optionally in a process pool) are reported.
+
+Usage::
+
+    python benchmarks/bench_var_sec.py --num-stations 200 --mesh-size 0.1 --num-workers 4
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import opstool as opst
+
+
+def box_points(b, h, t, d=0.05):
+    outline = [[0, 0], [b, 0], [b, h], [0, h]]
+    return outline, opst.pre.section.offset(outline, d=d), [[t, t], [b - t, t], [b - t, h - t], [t, h - t]]
+
+
+def build_section(outline, cover, hole, mesh_size, mesh=False):
+    sec_mesh = opst.pre.section.FiberSecMesh()
+    sec_mesh.add_patch_group(
+        {
+            "cover": opst.pre.section.create_polygon_patch(outline, holes=[cover]),
+            "core": opst.pre.section.create_polygon_patch(cover, holes=[hole]),
+        }
+    )
+    sec_mesh.set_mesh_size(mesh_size)
+    sec_mesh.set_ops_mat_tag({"cover": 1, "core": 2})
+    if mesh:
+        sec_mesh.mesh()
+    return sec_mesh
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-stations", type=int, default=200)
+    parser.add_argument("--mesh-size", type=float, default=0.1)
+    parser.add_argument("--num-workers", type=int, default=1)
+    args = parser.parse_args()
+
+    points_i, points_j = box_points(2.0, 3.0, 0.4), box_points(2.5, 5.0, 0.5)
+    path = [[0, 0, 0], [0, 0, 30]]
+    loc_sec = np.linspace(0, 1, args.num_stations)
+
+    start = time.perf_counter()
+    sec_meshes = opst.pre.section.mesh_var_sections(
+        build_section(*points_i, args.mesh_size), build_section(*points_j, args.mesh_size), path, loc_sec=loc_sec
+    )
+    t_batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stations = [opst.pre.section.var_line_string(pi, pj, path, loc_sec=loc_sec) for pi, pj in zip(points_i, points_j)]
+    loop_meshes = [build_section(*points, args.mesh_size, mesh=True) for points in zip(*stations)]
+    t_loop = time.perf_counter() - start
+
+    diff = max(abs(a.get_geom_area() - b.get_geom_area()) / b.get_geom_area() for a, b in zip(sec_meshes, loop_meshes))
+    num_fibers = sum(len(areas) for areas in sec_meshes[0].fiber_areas_map.values())
+
+    start = time.perf_counter()
+    opst.pre.section.mesh_var_sections(
+        build_section(*points_i, args.mesh_size),
+        build_section(*points_j, args.mesh_size),
+        path,
+        loc_sec=loc_sec,
+        sec_props="frame",
+        num_workers=args.num_workers,
+    )
+    t_props = time.perf_counter() - start
+
+    print(f"{args.num_stations} stations, {num_fibers} fibers, max relative difference of area: {diff:.2e}")
+    print(f"{'Method':<44}{'Time [s]':>10}")
+    print(f"{'FiberSecMesh.mesh() per station':<44}{t_loop:>10.3f}")
+    print(f"{'mesh_var_sections':<44}{t_batch:>10.3f}")
+    print(f"{f'mesh_var_sections + frame props ({args.num_workers} workers)':<44}{t_props:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
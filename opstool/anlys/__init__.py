@@ -1,7 +1,18 @@
 from ._smart_analyze import SmartAnalyze
-from ._sec_analysis import MomentCurvature
+from ._smart_telemetry import SmartAnalyzeTelemetry
+from ._sec_analysis import MomentCurvature, MomentCurvatureSweep
+from ._batch_runner import run_ground_motions
+from ._fiber_integrator import FiberMomentCurvature, ElasticLaw, BilinearSteelLaw, KentParkConcreteLaw, ManderConcreteLaw
 
 __all__ = [
     "SmartAnalyze",
-    "MomentCurvature"
+    "SmartAnalyzeTelemetry",
+    "MomentCurvature",
+    "MomentCurvatureSweep",
+    "run_ground_motions",
+    "FiberMomentCurvature",
+    "ElasticLaw",
+    "BilinearSteelLaw",
+    "KentParkConcreteLaw",
+    "ManderConcreteLaw",
 ]
@@ -0,0 +1,160 @@
+from typing import Callable, Union
+
+import numpy as np
+import openseespy.opensees as ops
+import pandas as pd
+from rich import print
+
+from ..post import CreateODB
+from ._parallel import run_processes
+from ._smart_analyze import SmartAnalyze
+
+# The tag of the time series and load pattern of the ground motion, which should not be used by the model.
+GM_TAG = 999999
+
+
+def run_ground_motions(
+    model_builder: Callable,
+    records: dict,
+    scale_factors: Union[float, list, tuple, np.ndarray] = 1.0,
+    direction: int = 1,
+    analysis_builder: Callable = None,
+    smart_analyze_args: dict = None,
+    save_odb: bool = True,
+    odb_args: dict = None,
+    num_workers: int = None,
+    timeout: float = None,
+    mp_context: str = None,
+    verbose: bool = True,
+) -> pd.DataFrame:
+    """Run a batch of ground motion cases, e.g., for multi-record studies or incremental dynamic analysis (IDA),
+    each case in its own worker process, since the OpenSees domain is a global state of each process.
+
+    A case is a record scaled by a factor, in each case:
+
+    #. ``model_builder()`` builds the model, including the gravity analysis if needed;
+    #. the record is applied by a ``Path`` time series and a ``UniformExcitation`` pattern with the tag 999999;
+    #. ``analysis_builder()`` defines the analysis commands, such as ``constraints``, ``numberer``,
+       ``system`` and ``integrator``;
+    #. the transient analysis is run by :class:`SmartAnalyze` with the time step of the record;
+    #. the responses are saved to an ODB with the tag ``"{record}-{scale}"``,
+       which can be read by :func:`opstool.post.get_nodal_responses` etc.
+       The case index is appended if the tag is already used, e.g., for the scale factors 1.0 and 1.0000001.
+
+    Parameters
+    -----------
+    model_builder: Callable
+        The function without arguments to build the model, which should begin with ``ops.wipe()``.
+        Use ``functools.partial`` to bind the arguments.
+    records: dict
+        The ground motion records, the keys are the names and the values are tuples of ``(dt, accelerations)``.
+    scale_factors: Union[float, list, tuple, np.ndarray], default=1.0
+        The scale factors, each record is run with each scale factor.
+    direction: int, default=1
+        The direction of the ``UniformExcitation`` pattern.
+    analysis_builder: Callable, default=None
+        The function without arguments to define the analysis commands.
+        If None, ``constraints("Transformation")``, ``numberer("RCM")``, ``system("UmfPack")``
+        and ``integrator("Newmark", 0.5, 0.25)`` are used.
+    smart_analyze_args: dict, default=None
+        The control parameters of :class:`SmartAnalyze`.
+        By default, ``logMode="null"`` is used to avoid the workers writing to the same log file.
+    save_odb: bool, default=True
+        If True, the responses of each case are saved to an ODB.
+    odb_args: dict, default=None
+        The parameters of :class:`opstool.post.CreateODB`, except ``odb_tag``.
+    num_workers: int, default=None
+        The number of worker processes. If None, the number of CPUs.
+    timeout: float, default=None
+        The maximum wall time of each case in seconds, the worker is terminated after it.
+    mp_context: str, default=None
+        The start method of the worker processes, "fork", "spawn" or "forkserver".
+        If None, the default method of the platform.
+        The functions must be picklable, i.e., defined at the top level of a module, when "spawn" is used.
+    verbose: bool, default=True
+        If True, print the status of each case when it ends, otherwise the outputs of the workers are also silenced.
+
+    Returns
+    --------
+    pd.DataFrame, one row per case, with the columns:
+
+    * ``record``, ``scale`` and ``odbTag``;
+    * ``status``, "ok", "failed" (not converged), "error" (an exception was raised),
+      "crashed" (the worker exited unexpectedly) or "timeout";
+    * ``endTime`` and ``numSteps``, the analysis time and the number of steps reached;
+    * ``elapsed``, the wall time of the case in seconds;
+    * ``message``, the error message.
+
+    Examples
+    ---------
+    >>> def build():
+    >>>     opst.load_ops_examples("Frame3D")
+    >>> records = {"GM1": (0.01, accel1), "GM2": (0.02, accel2)}
+    >>> report = opst.anlys.run_ground_motions(build, records, scale_factors=[0.5, 1.0, 1.5], num_workers=4)
+    >>> resp = opst.post.get_nodal_responses(odb_tag=report["odbTag"][0])
+    """
+    cases, odb_tags = [], set()
+    for name, (dt, values) in records.items():
+        for scale in np.atleast_1d(scale_factors).tolist():
+            odb_tag = f"{name}-{scale:g}"
+            if odb_tag in odb_tags:
+                odb_tag = f"{odb_tag}-{len(cases)}"
+            odb_tags.add(odb_tag)
+            cases.append(dict(record=name, scale=scale, odbTag=odb_tag, dt=float(dt), values=values))
+    smart_analyze_args = {"logMode": "null", **(smart_analyze_args or dict())}
+    case_args = [
+        (case, model_builder, analysis_builder, smart_analyze_args, save_odb, odb_args or dict(), direction)
+        for case in cases
+    ]
+    logo = "[bold magenta]GroundMotions:[/bold magenta]"
+
+    results = [None] * len(cases)
+    for idx, result, elapsed in run_processes(
+        _run_case, case_args, num_workers, timeout, mp_context, quiet=not verbose
+    ):
+        case = cases[idx]
+        results[idx] = dict(
+            record=case["record"],
+            scale=case["scale"],
+            odbTag=case["odbTag"],
+            status=result["status"],
+            endTime=result.get("endTime", np.nan),
+            numSteps=result.get("numSteps", 0),
+            elapsed=elapsed,
+            message=result.get("message", ""),
+        )
+        if verbose:
+            color = "#6fc276" if result["status"] == "ok" else "#f85a40"
+            print(
+                f">>> {logo} {case['odbTag']} [bold {color}]{result['status']}[/bold {color}] "
+                f"in {elapsed:.3f} s. {results[idx]['message']}"
+            )
+    return pd.DataFrame(results)
+
+
+def _run_case(case, model_builder, analysis_builder, smart_analyze_args, save_odb, odb_args, direction):
+    dt, values = case["dt"], np.asarray(case["values"], dtype=float)
+    model_builder()
+    ops.timeSeries("Path", GM_TAG, "-dt", dt, "-values", *values, "-factor", case["scale"])
+    ops.pattern("UniformExcitation", GM_TAG, direction, "-accel", GM_TAG)
+    if analysis_builder is None:
+        ops.constraints("Transformation")
+        ops.numberer("RCM")
+        ops.system("UmfPack")
+        ops.integrator("Newmark", 0.5, 0.25)
+    else:
+        analysis_builder()
+    analysis = SmartAnalyze(analysis_type="Transient", **smart_analyze_args)
+    odb = CreateODB(odb_tag=case["odbTag"], **odb_args) if save_odb else None
+    ok, num_steps = 0, 0
+    for _ in range(len(values)):
+        ok = analysis.TransientAnalyze(dt)
+        if ok < 0:
+            break
+        num_steps += 1
+        if odb is not None:
+            odb.fetch_response_step()
+    analysis.close()
+    if odb is not None:
+        odb.save_response()
+    return dict(status="ok" if ok == 0 else "failed", endTime=ops.getTime(), numSteps=num_steps)
@@ -0,0 +1,515 @@
+import numpy as np
+import xarray as xr
+from typing import Union
+from warnings import warn
+
+from ._sec_analysis import MomentCurvature
+
+
+class ElasticLaw:
+    """Vectorized linear elastic uniaxial law, the same as the OpenSees ``Elastic`` material.
+
+    Parameters
+    ----------
+    E : float
+        Elastic modulus.
+    """
+
+    def __init__(self, E: float):
+        self.E = float(E)
+
+    def init_state(self, n: int) -> dict:
+        """Return the initial state of ``n`` fibers."""
+        return dict()
+
+    def trial(self, strain: np.ndarray, state: dict):
+        """Return the stress, tangent and trial state of the strain array."""
+        return self.E * strain, np.full_like(strain, self.E), state
+
+    def commit(self, state: dict) -> dict:
+        """Return the committed state of the converged trial state."""
+        return state
+
+
+class BilinearSteelLaw:
+    """Vectorized bilinear steel law with kinematic hardening, the same as the OpenSees ``Steel01`` material
+    without isotropic hardening.
+
+    Parameters
+    ----------
+    Fy : float
+        Yield strength.
+    E0 : float
+        Initial elastic tangent.
+    b : float
+        Strain-hardening ratio (ratio between post-yield tangent and initial elastic tangent).
+    """
+
+    def __init__(self, Fy: float, E0: float, b: float):
+        if not 0 <= b < 1:
+            raise ValueError("b must be in [0, 1)!")
+        self.Fy, self.E0, self.b = float(Fy), float(E0), float(b)
+        self.H = self.b * self.E0 / (1 - self.b)  # the kinematic hardening modulus
+
+    def init_state(self, n: int) -> dict:
+        """Return the initial state of ``n`` fibers."""
+        # the plastic strain and the back stress
+        return dict(ep=np.zeros(n), q=np.zeros(n))
+
+    def trial(self, strain: np.ndarray, state: dict):
+        """Return the stress, tangent and trial state of the strain array."""
+        E, H = self.E0, self.H
+        xi = E * (strain - state["ep"]) - state["q"]
+        f = np.abs(xi) - self.Fy
+        yielding = f > 0
+        dgamma = np.where(yielding, f / (E + H), 0.0) * np.sign(xi)
+        ep = state["ep"] + dgamma
+        q = state["q"] + H * dgamma
+        stress = E * (strain - ep)
+        tangent = np.where(yielding, E * H / (E + H), E)
+        return stress, tangent, dict(ep=ep, q=q)
+
+    def commit(self, state: dict) -> dict:
+        """Return the committed state of the converged trial state."""
+        return state
+
+
+class _ConcreteLaw:
+    """The compression-only concrete law, which unloads linearly from the minimum strain reached,
+    the stress is zero in tension."""
+
+    def init_state(self, n: int) -> dict:
+        """Return the initial state of ``n`` fibers."""
+        # the minimum (most compressive) strain reached and the stress at it,
+        # and the strain at zero stress and the slope of the unloading line
+        zeros = np.zeros(n)
+        return self.commit(dict(eps_min=zeros, sig_min=zeros))
+
+    def trial(self, strain: np.ndarray, state: dict):
+        """Return the stress, tangent and trial state of the strain array."""
+        env_stress, env_tangent = self.envelope(strain)
+        unload = strain < state["eps_end"]
+        on_envelope = strain <= state["eps_min"]
+        stress = np.where(on_envelope, env_stress, np.where(unload, state["slope"] * (strain - state["eps_end"]), 0.0))
+        tangent = np.where(on_envelope, env_tangent, np.where(unload, state["slope"], 0.0))
+        trial_state = dict(state, eps_min=np.where(on_envelope, strain, state["eps_min"]))
+        trial_state["sig_min"] = np.where(on_envelope, env_stress, state["sig_min"])
+        return stress, tangent, trial_state
+
+    def commit(self, state: dict) -> dict:
+        """Return the committed state of the converged trial state."""
+        eps_end, slope = self.unloading(state["eps_min"], state["sig_min"])
+        return dict(eps_min=state["eps_min"], sig_min=state["sig_min"], eps_end=eps_end, slope=slope)
+
+
+class KentParkConcreteLaw(_ConcreteLaw):
+    """Vectorized Kent-Park concrete law with degraded linear unloading/reloading stiffness
+    according to the work of Karsan-Jirsa, the same as the OpenSees ``Concrete01`` material.
+
+    Parameters
+    ----------
+    fpc : float
+        Concrete compressive strength at 28 days (compression is negative).
+    epsc0 : float
+        Concrete strain at maximum strength.
+    fpcu : float
+        Concrete crushing strength.
+    epsU : float
+        Concrete strain at crushing strength.
+
+    .. Note::
+        The signs of the parameters are ignored, they are taken as negative.
+    """
+
+    def __init__(self, fpc: float, epsc0: float, fpcu: float, epsU: float):
+        self.fpc, self.epsc0 = -abs(fpc), -abs(epsc0)
+        self.fpcu, self.epscu = -abs(fpcu), -abs(epsU)
+        self.Ec0 = 2 * self.fpc / self.epsc0
+        self.slope = (self.fpcu - self.fpc) / (self.epscu - self.epsc0)
+
+    def envelope(self, strain):
+        """Return the stress and tangent of the monotonic envelope."""
+        eta = strain / self.epsc0
+        stress = self.fpc * eta * (2 - eta)
+        tangent = self.Ec0 * (1 - eta)
+        post_peak = strain < self.epsc0
+        if post_peak.any():
+            crushed = strain < self.epscu
+            linear = self.fpc + self.slope * (strain - self.epsc0)
+            stress = np.where(post_peak, np.where(crushed, self.fpcu, linear), stress)
+            tangent = np.where(post_peak, np.where(crushed, 0.0, self.slope), tangent)
+        tension = strain > 0
+        stress[tension] = 0.0
+        tangent[tension] = 0.0
+        return stress, tangent
+
+    def unloading(self, eps_min, sig_min):
+        """Return the strain at zero stress and the slope of the unloading line from ``(eps_min, sig_min)``."""
+        eta = np.maximum(eps_min, self.epscu) / self.epsc0
+        ratio = np.where(eta < 2.0, 0.145 * eta**2 + 0.13 * eta, 0.707 * (eta - 2.0) + 0.834)
+        eps_end = ratio * self.epsc0
+        temp1 = eps_min - eps_end
+        temp2 = sig_min / self.Ec0
+        secant = (temp1 <= temp2) & (temp1 < 0)  # the secant to eps_end is not steeper than Ec0
+        safe = np.where(secant, temp1, 1.0)
+        eps_end = np.where(secant, eps_end, eps_min - temp2)
+        slope = np.where(secant, sig_min / safe, self.Ec0)
+        return eps_end, slope
+
+
+class ManderConcreteLaw(_ConcreteLaw):
+    """Vectorized Mander (Popovics) concrete law for confined or unconfined concrete,
+    the envelope is the same as the OpenSees ``Concrete04`` material without tension,
+    but it unloads with the initial tangent.
+
+    Parameters
+    ----------
+    fcc : float
+        Concrete compressive strength, confined or unconfined (compression is negative).
+    epscc : float
+        Concrete strain at maximum strength.
+    Ec : float
+        Initial tangent.
+    epscu : float, optional
+        Concrete strain at crushing, by default None, i.e., never crushes.
+        The stress is zero beyond it.
+
+    .. Note::
+        The signs of the parameters are ignored, they are taken as negative.
+    """
+
+    def __init__(self, fcc: float, epscc: float, Ec: float, epscu: float = None):
+        self.fcc, self.epscc, self.Ec = -abs(fcc), -abs(epscc), abs(Ec)
+        self.epscu = None if epscu is None else -abs(epscu)
+        Esec = self.fcc / self.epscc
+        if Esec >= self.Ec:
+            raise ValueError("Ec must be larger than the secant modulus fcc / epscc!")
+        self.r = self.Ec / (self.Ec - Esec)
+
+    def envelope(self, strain):
+        """Return the stress and tangent of the monotonic envelope."""
+        r = self.r
+        x = np.maximum(strain / self.epscc, 0.0)
+        xr = x**r
+        denominator = r - 1 + xr
+        stress = self.fcc * x * r / denominator
+        tangent = self.fcc / self.epscc * r * (r - 1) * (1 - xr) / denominator**2
+        zero = strain > 0
+        if self.epscu is not None:
+            zero = zero | (strain < self.epscu)
+        return np.where(zero, 0.0, stress), np.where(zero, 0.0, tangent)
+
+    def unloading(self, eps_min, sig_min):
+        """Return the strain at zero stress and the slope of the unloading line from ``(eps_min, sig_min)``."""
+        return eps_min - sig_min / self.Ec, np.full_like(eps_min, self.Ec)
+
+
+class FiberMomentCurvature(MomentCurvature):
+    """Moment-Curvature Analysis of a :class:`opstool.pre.section.FiberSecMesh` by a NumPy fiber integrator,
+    without the OpenSees domain.
+
+    As the zero-length section model of :class:`MomentCurvature`, the axial strain and the curvature about
+    the other axis are solved by the Newton iteration at each curvature step, so that the axial force is
+    ``axial_force`` and the other moment is zero, with the vectorized uniaxial laws of the fibers.
+    The strains and moments are about the area centroid of the fibers, as the OpenSees fiber section does.
+    The results ``phi``, ``M`` and ``FiberData`` are the same as those of :class:`MomentCurvature`,
+    and so are the methods to get, plot and post-process them.
+    :meth:`sweep` integrates many axial loads together.
+
+    Parameters
+    ----------
+    sec_mesh : FiberSecMesh
+        The meshed section, the OpenSees mat tags of the patches and rebars are used to look up ``materials``.
+    materials : dict[int, law]
+        The mat tag as key, and the uniaxial law as value, one of :class:`ElasticLaw`, :class:`BilinearSteelLaw`,
+        :class:`KentParkConcreteLaw` and :class:`ManderConcreteLaw`.
+    axial_force : float, optional
+        Axial load, compression is negative, by default 0
+
+    Examples
+    ---------
+    >>> materials = {
+    >>>     1: opst.anlys.KentParkConcreteLaw(-30, -0.002, -15, -0.005),
+    >>>     3: opst.anlys.BilinearSteelLaw(200, 2.0e5, 0.02),
+    >>> }
+    >>> mc = opst.anlys.FiberMomentCurvature(SEC_MESH, materials, axial_force=-1000)
+    >>> mc.analyze(axis="y", max_phi=0.05, incr_phi=1e-4)
+    >>> phi, M = mc.get_M_phi()
+    """
+
+    def __init__(self, sec_mesh, materials: dict, axial_force: float = 0) -> None:
+        super().__init__(sec_tag=None, axial_force=axial_force)
+        self.materials = materials
+        fibers = []
+        for name, centers in sec_mesh.fiber_centers_map.items():
+            areas = sec_mesh.fiber_areas_map[name]
+            mat_tag = sec_mesh.mat_ops_map[name]
+            fibers.append(np.column_stack([centers[:, :2], areas, np.full(len(areas), mat_tag)]))
+        for data in sec_mesh.rebar_data:
+            rebar_xy = np.atleast_2d(data["rebar_xy"])
+            area = np.pi / 4 * data["dia"] ** 2
+            fibers.append(np.column_stack([rebar_xy[:, :2], np.full((len(rebar_xy), 2), (area, data["matTag"]))]))
+        # From column 1 to 4: "yloc", "zloc", "area", "mat"
+        self.fibers = np.vstack(fibers)
+        self.groups = []
+        for mat_tag in np.unique(self.fibers[:, 3]):
+            if int(mat_tag) not in materials:
+                raise ValueError(f"The law of matTag {int(mat_tag)} is not specified in materials!")
+            idx = np.flatnonzero(self.fibers[:, 3] == mat_tag)
+            self.groups.append((materials[int(mat_tag)], idx))
+
+    def analyze(
+        self,
+        axis: str = "y",
+        max_phi: float = 0.5,
+        incr_phi: float = 1e-4,
+        limit_peak_ratio: float = 0.8,
+        cycle_analyze: bool = False,
+        tol: float = 1e-12,
+        max_iter: int = 50,
+    ):
+        """Performing Moment-Curvature Analysis.
+
+        Parameters
+        ----------
+        axis : str, optional, "y" or "z"
+            The axis of the section to be analyzed, by default "y".
+        max_phi : float, optional
+            The maximum curvature to analyze, by default 0.5.
+        incr_phi : float, optional
+            Curvature analysis increment, by default 1e-4.
+        limit_peak_ratio : float, optional
+            A ratio of the moment intensity after the peak used to stop the analysis., by default 0.8,
+            i.e., a 20% drop after peak.
+        cycle_analyze : bool, optional
+            Whether to perform cyclic analysis, by default False.
+        tol : float, optional
+            The tolerance of the fiber strain increment in the Newton iteration, by default 1e-12.
+        max_iter : int, optional
+            The maximum number of Newton iterations of each step, by default 50.
+
+        .. Note::
+            The termination of the analysis depends on whichever reaches `max_phi` or `post_peak_ratio` first.
+        """
+        if cycle_analyze:
+            max_phi = np.max(np.abs(self.cycle_path))
+            protocol = _split_path(self.cycle_path, incr_phi)
+        else:
+            protocol = _split_path([max_phi], incr_phi)
+        phi, M, stress, strain, num_steps, failed = self._integrate(
+            np.array([self.P]), axis, protocol, max_phi, limit_peak_ratio, tol, max_iter, fiber_data=True
+        )
+        if failed[0]:
+            raise RuntimeError("Analysis failed!")
+        n = num_steps[0]
+        fiber_data = np.concatenate(
+            [np.broadcast_to(self.fibers, (n, *self.fibers.shape)), stress[0, :n, :, None], strain[0, :n, :, None]],
+            axis=-1,
+        )
+        fiber_data[0] = 0.0
+        self.phi, self.M, self.FiberData = phi[0, :n], M[0, :n], fiber_data
+        print("FiberMomentCurvature: 🎉 Successfully finished! 🎉")
+
+    def sweep(
+        self,
+        axial_forces: Union[list[float], np.ndarray],
+        axis: str = "y",
+        max_phi: float = 0.5,
+        incr_phi: float = 1e-4,
+        limit_peak_ratio: float = 0.8,
+        fiber_data: bool = False,
+        tol: float = 1e-12,
+        max_iter: int = 50,
+    ) -> xr.Dataset:
+        """Performing Moment-Curvature Analysis of many axial loads at once,
+        all cases are integrated together as one array at each step,
+        so the cost of a step hardly depends on the number of axial loads.
+
+        Parameters
+        ----------
+        axial_forces : Union[list[float], np.ndarray]
+            The axial loads, compression is negative.
+        fiber_data : bool, optional
+            Whether to collect the fiber responses, by default False.
+
+        See :meth:`analyze` for the other parameters.
+
+        Returns
+        -------
+        xr.Dataset
+            With the variables ``phi``, ``M`` of dims ``(P, step)``,
+            ``FiberData`` of dims ``(P, step, fiber, property)`` if ``fiber_data`` is True,
+            and ``numSteps`` of dims ``(P,)``.
+            The steps after a case stopped are NaN.
+
+        .. Note::
+            A case whose Newton iteration is not converged stops at the last converged step,
+            with a warning, the other cases go on.
+        """
+        axial_forces = np.atleast_1d(np.asarray(axial_forces, dtype=float))
+        protocol = _split_path([max_phi], incr_phi)
+        phi, M, stress, strain, num_steps, failed = self._integrate(
+            axial_forces, axis, protocol, max_phi, limit_peak_ratio, tol, max_iter, fiber_data=fiber_data
+        )
+        if failed.any():
+            warn(
+                f"The Newton iteration of the section deformations is not converged for P = {axial_forces[failed]}, "
+                "these cases are stopped at the last converged step!"
+            )
+        coords = {"P": axial_forces, "step": np.arange(phi.shape[1])}
+        data = {
+            "phi": (("P", "step"), phi),
+            "M": (("P", "step"), M),
+            "numSteps": (("P",), num_steps),
+        }
+        if fiber_data:
+            fibers = np.broadcast_to(self.fibers, stress.shape + (4,))
+            fiber_data = np.concatenate([fibers, stress[..., None], strain[..., None]], axis=-1)
+            fiber_data[:, 0] = 0.0
+            fiber_data[np.isnan(phi)] = np.nan
+            data["FiberData"] = (("P", "step", "fiber", "property"), fiber_data)
+            coords["fiber"] = np.arange(len(self.fibers))
+            coords["property"] = ["yloc", "zloc", "area", "mat", "stress", "strain"]
+        return xr.Dataset(data, coords=coords)
+
+    def _integrate(self, axial_forces, axis, protocol, max_phi, stop_ratio, tol, max_iter, fiber_data):
+        """Integrate the cases of ``axial_forces`` together along the curvature protocol.
+        The arrays of the cases are of shape (case, step, ...), the steps after a case stopped are NaN.
+        A case is stopped when its Newton iteration is not converged, which is marked in the returned ``failed``."""
+        area = self.fibers[:, 2]
+        # the arms about the area centroid of the fibers, as the OpenSees fiber section does
+        y = self.fibers[:, 0] - area @ self.fibers[:, 0] / np.sum(area)
+        z = self.fibers[:, 1] - area @ self.fibers[:, 1] / np.sum(area)
+        # strain = eps0 + z * phi_y - y * phi_z, M_y = sum(stress * area * z), M_z = -sum(stress * area * y)
+        if axis.lower() == "y":
+            arms = np.vstack([np.ones_like(area), -y, z])
+        elif axis.lower() == "z":
+            arms = np.vstack([np.ones_like(area), z, -y])
+        else:
+            raise ValueError("Only supported axis = y or z!")
+        arms_area = arms * area
+        num_cases = len(axial_forces)
+        # the states of each case, of shape (case, fiber)
+        states = [
+            {key: np.tile(value, (num_cases, 1)) for key, value in law.init_state(len(idx)).items()}
+            for law, idx in self.groups
+        ]
+        running = np.ones(num_cases, dtype=bool)
+        # the axial load is applied in 10 steps with both curvatures free, as MomentCurvature does
+        u = np.zeros((num_cases, 3))
+        for i in range(1, 11):
+            target = np.zeros((num_cases, 3))
+            target[:, 0] = axial_forces * i / 10
+            converged, u, _, _, states = self._solve(u, 0.0, arms, arms_area, target, states, tol, max_iter, running)
+            running &= converged
+        # the axial strain and the curvature about the other axis, whose moment is zero
+        u, phi = u[:, :2], u[:, 2].copy()
+        target = np.zeros((num_cases, 2))
+        target[:, 0] = axial_forces
+
+        num_steps = len(protocol) + 1
+        PHI, M = np.full((num_cases, num_steps), np.nan), np.full((num_cases, num_steps), np.nan)
+        PHI[:, 0], M[:, 0] = 0.0, 0.0
+        if fiber_data:
+            STRESS = np.full((num_cases, num_steps, len(area)), np.nan)
+            STRAIN = np.full((num_cases, num_steps, len(area)), np.nan)
+        else:
+            STRESS = STRAIN = None
+        failed = ~running
+        last = np.zeros(num_cases, dtype=int)
+        M_max = np.zeros(num_cases)
+        for i, step_size in enumerate(protocol, start=1):
+            if not running.any():
+                break
+            phi += step_size
+            converged, u, stress, strain, states = self._solve(
+                u, phi[:, None] * arms[2], arms[:2], arms_area[:2], target, states, tol, max_iter, running
+            )
+            failed |= running & ~converged
+            running &= converged
+            curr_M = stress @ arms_area[2]
+            PHI[running, i], M[running, i] = phi[running], curr_M[running]
+            if fiber_data:
+                STRESS[running, i], STRAIN[running, i] = stress[running], strain[running]
+            last[running] = i
+            unloading = (curr_M - M[np.arange(num_cases), i - 1]) * step_size < 0
+            cond1 = unloading & (np.abs(curr_M) < M_max * (stop_ratio - 0.02))
+            cond2 = np.abs(phi) > max_phi
+            M_max = np.maximum(M_max, np.abs(curr_M))
+            running &= ~(cond1 | cond2)
+        num_steps = last + 1
+        n = int(np.max(num_steps))
+        if fiber_data:
+            STRESS, STRAIN = STRESS[:, :n], STRAIN[:, :n]
+        return PHI[:, :n], M[:, :n], STRESS, STRAIN, num_steps, failed
+
+    def _solve(self, u, strain0, arms, arms_area, target, states, tol, max_iter, active):
+        """Solve the free section deformations ``u`` of the ``active`` cases by the Newton iteration,
+        so that the section forces conjugate to them are ``target``,
+        the fiber strain is ``strain0 + u @ arms``.
+        Each case converges on its own, return the mask of the converged cases, ``u``, the stress and strain
+        (NaN for the other cases) and the states, which are committed for the converged cases only."""
+        num_cases, num_fibers = len(u), arms.shape[1]
+        strain0 = np.broadcast_to(strain0, (num_cases, num_fibers))
+        u = u.copy()
+        stress, strain = np.full((num_cases, num_fibers), np.nan), np.full((num_cases, num_fibers), np.nan)
+        states = [{key: value.copy() for key, value in state.items()} for state in states]
+        converged = np.zeros(num_cases, dtype=bool)
+        scale = np.max(np.abs(arms), axis=1)  # to measure the increments in strain
+        todo = np.flatnonzero(active)  # the cases being iterated
+        trial_u = u[todo]
+        for _ in range(max_iter):
+            if len(todo) == 0:
+                break
+            trial_strain = strain0[todo] + trial_u @ arms
+            trial_stress, tangent = np.empty_like(trial_strain), np.empty_like(trial_strain)
+            trial_states = []
+            for (law, idx), state in zip(self.groups, states):
+                sub_state = {key: value[todo] for key, value in state.items()}
+                trial_stress[:, idx], tangent[:, idx], trial_state = law.trial(trial_strain[:, idx], sub_state)
+                trial_states.append(trial_state)
+            stiffness = np.einsum("in,jn,cn->cij", arms_area, arms, tangent)
+            du = _solve_cases(stiffness, target[todo] - trial_stress @ arms_area.T)
+            # the cases with a singular stiffness are dropped
+            ok = np.all(np.isfinite(du), axis=1)
+            done = ok & (np.max(np.abs(du) * scale, axis=1) <= tol)
+            cases = todo[done]
+            converged[cases] = True
+            u[cases], stress[cases], strain[cases] = trial_u[done], trial_stress[done], trial_strain[done]
+            for (law, _), state, trial_state in zip(self.groups, states, trial_states):
+                committed = law.commit({key: value[done] for key, value in trial_state.items()})
+                for key, value in committed.items():
+                    state[key][cases] = value
+            going = ok & ~done
+            todo, trial_u = todo[going], trial_u[going] + du[going]
+        return converged, u, stress, strain, states
+
+
+def _solve_cases(a, b):
+    """Solve the linear systems ``a @ x = b`` of all cases, x is NaN for the cases of singular ``a``."""
+    try:
+        return np.linalg.solve(a, b[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        x = np.full_like(b, np.nan)
+        for i in range(len(a)):
+            try:
+                x[i] = np.linalg.solve(a[i], b[i])
+            except np.linalg.LinAlgError:
+                pass
+        return x
+
+
+def _split_path(targets, max_step, eps=1e-12):
+    """Split the curvature path into steps no larger than ``max_step``, as ``SmartAnalyze.static_split`` does."""
+    targets = np.insert(np.atleast_1d(targets), 0, 0.0) if targets[0] != 0.0 else np.atleast_1d(targets)
+    steps = []
+    for section in np.diff(targets):
+        if abs(section) < eps:
+            continue
+        sign = 1.0 if section > 0 else -1.0
+        j = 0
+        while abs(section) - j * max_step > max_step + eps:
+            steps.append(sign * max_step)
+            j += 1
+        steps.append(section - sign * j * max_step)
+    return steps
@@ -0,0 +1,62 @@
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing.connection import wait
+
+
+def run_processes(func, cases: list, num_workers: int = None, timeout: float = None, mp_context: str = None,
+                  quiet: bool = False):
+    """Run ``func(*args)`` for each ``args`` in ``cases`` in its own worker process,
+    since the OpenSees domain is a global state of each process.
+
+    ``func`` should return a dict with the key ``status``.
+    A worker that raises an exception, crashes or exceeds ``timeout`` seconds
+    gives the status "error", "crashed" or "timeout" with a ``message``.
+
+    Yields
+    -------
+    (int, dict, float), the index of the case, the returned dict and the wall time in seconds,
+    in the order of completion.
+    """
+    num_workers = os.cpu_count() if num_workers is None else max(int(num_workers), 1)
+    ctx = multiprocessing.get_context(mp_context)
+    pending = list(range(len(cases)))
+    running = dict()  # case index: (process, connection, start time)
+    while pending or running:
+        while pending and len(running) < num_workers:
+            idx = pending.pop(0)
+            receiver, sender = ctx.Pipe(duplex=False)
+            process = ctx.Process(target=_worker, args=(sender, func, cases[idx], quiet), daemon=True)
+            process.start()
+            sender.close()
+            running[idx] = (process, receiver, time.perf_counter())
+        ready = wait([receiver for _, receiver, _ in running.values()], timeout=0.1)
+        for idx in list(running):
+            process, receiver, start = running[idx]
+            if receiver in ready:
+                try:
+                    result = receiver.recv()
+                except EOFError:
+                    process.join()
+                    result = dict(status="crashed", message=f"The worker exited with code {process.exitcode}.")
+            elif timeout is not None and time.perf_counter() - start > timeout:
+                process.terminate()
+                result = dict(status="timeout", message=f"The case exceeded {timeout} s.")
+            else:
+                continue
+            process.join()
+            receiver.close()
+            del running[idx]
+            yield idx, result, time.perf_counter() - start
+
+
+def _worker(sender, func, args, quiet):
+    if quiet:
+        sys.stdout = open(os.devnull, "w")
+    try:
+        result = func(*args)
+    except Exception as error:
+        result = dict(status="error", message=f"{type(error).__name__}: {error}")
+    sender.send(result)
+    sender.close()
@@ -2,10 +2,11 @@ import matplotlib.pyplot as plt
 import numpy as np
 import xarray as xr
 import openseespy.opensees as ops
-from typing import Union
+from typing import Callable, Union
 from warnings import warn
 from scipy.integrate import trapezoid
 
+from ._parallel import run_processes
 from ._smart_analyze import SmartAnalyze
 
 
@@ -425,6 +426,257 @@ class MomentCurvature:
             plt.gcf().subplots_adjust(bottom=0.15)
         return Phi_eq, M_eq
 
+class MomentCurvatureSweep:
+    """Parallel Moment-Curvature Analysis of a grid of sections, axial forces and axes,
+    e.g., the P-M interaction diagram of a pier section.
+
+    Each case is analyzed as :meth:`MomentCurvature.analyze` does, in its own worker process,
+    since the analysis rebuilds the OpenSees domain.
+    The curvature, moment and fiber responses of all cases are collected into one xarray Dataset
+    indexed by ``(secTag, P, axis, step)``,
+    and the interaction diagram and limit states are derived for all cases at once.
+
+    Parameters
+    ----------
+    section_builder : Callable
+        The function without arguments to define the sections,
+        which is called after ``ops.wipe()`` in each worker process.
+        Use ``functools.partial`` to bind the arguments.
+    sec_tags : Union[list[int], int]
+        The section tags defined by ``section_builder``.
+    axial_forces : Union[list[float], float]
+        The axial loads, compression is negative.
+    axes : Union[list[str], str], optional
+        The axes of the section to be analyzed, "y" and/or "z", by default "y".
+
+    Examples
+    ---------
+    >>> def build():
+    >>>     ops.model("basic", "-ndm", 3, "-ndf", 6)
+    >>>     # define materials and fiber section 1 ...
+    >>> sweep = MomentCurvatureSweep(build, sec_tags=1, axial_forces=np.linspace(-20000, 0, 11), axes=["y", "z"])
+    >>> data = sweep.analyze(max_phi=0.05, incr_phi=1e-4, num_workers=4)
+    >>> diagram = sweep.get_interaction_diagram()
+    >>> limit = sweep.get_limit_state(matTag=[1, 2], threshold=[-0.0033, 0.01])
+    """
+
+    def __init__(
+        self,
+        section_builder: Callable,
+        sec_tags: Union[list[int], int],
+        axial_forces: Union[list[float], float],
+        axes: Union[list[str], str] = "y",
+    ) -> None:
+        self.section_builder = section_builder
+        self.sec_tags = [int(tag) for tag in np.atleast_1d(sec_tags)]
+        self.axial_forces = [float(p) for p in np.atleast_1d(axial_forces)]
+        self.axes = [str(axis).lower() for axis in np.atleast_1d(axes)]
+        for axis in self.axes:
+            if axis not in ("y", "z"):
+                raise ValueError("Only supported axis = y or z!")
+        self.data = None
+
+    def analyze(
+        self,
+        max_phi: float = 0.5,
+        incr_phi: float = 1e-4,
+        limit_peak_ratio: float = 0.8,
+        smart_analyze: bool = True,
+        fiber_data: bool = True,
+        num_workers: int = None,
+        timeout: float = None,
+        mp_context: str = None,
+    ) -> xr.Dataset:
+        """Performing Moment-Curvature Analysis of all cases.
+
+        Parameters
+        ----------
+        max_phi : float, optional
+            The maximum curvature to analyze, by default 0.5.
+        incr_phi : float, optional
+            Curvature analysis increment, by default 1e-4.
+        limit_peak_ratio : float, optional
+            A ratio of the moment intensity after the peak used to stop the analysis., by default 0.8,
+            i.e., a 20% drop after peak.
+        smart_analyze : bool, optional
+            Whether to use smart analysis options, by default True.
+        fiber_data : bool, optional
+            Whether to collect the fiber responses, by default True.
+            They are needed by :meth:`get_limit_state` with ``matTag``,
+            and take ``steps * fibers * 6`` floats of memory per case.
+        num_workers : int, optional
+            The number of worker processes, by default None, i.e., the number of CPUs.
+        timeout : float, optional
+            The maximum wall time of each case in seconds, by default None.
+        mp_context : str, optional
+            The start method of the worker processes, "fork", "spawn" or "forkserver",
+            by default None, i.e., the default method of the platform.
+            ``section_builder`` must be picklable when "spawn" is used.
+
+        .. Note::
+            The steps of the cases are padded with NaN to the longest one, and so are the fibers of the sections.
+
+        Returns
+        -------
+        xr.Dataset
+            With the variables ``phi``, ``M`` of dims ``(secTag, P, axis, step)``,
+            ``FiberData`` of dims ``(secTag, P, axis, step, fiber, property)`` if ``fiber_data`` is True,
+            and ``numSteps``, ``status`` of dims ``(secTag, P, axis)``.
+        """
+        grid = [(tag, p, axis) for tag in self.sec_tags for p in self.axial_forces for axis in self.axes]
+        kwargs = dict(
+            max_phi=max_phi, incr_phi=incr_phi, stop_ratio=limit_peak_ratio, smart_analyze=smart_analyze
+        )
+        cases = [(self.section_builder, tag, p, axis, kwargs, fiber_data) for tag, p, axis in grid]
+        results = [None] * len(cases)
+        for idx, result, _ in run_processes(_sweep_case, cases, num_workers, timeout, mp_context, quiet=True):
+            results[idx] = result
+        failed = [f"{grid[i]}: {result['message']}" for i, result in enumerate(results) if result["status"] != "ok"]
+        if failed:
+            warn("Moment-Curvature analysis failed for (secTag, P, axis) = " + "; ".join(failed))
+
+        shape = (len(self.sec_tags), len(self.axial_forces), len(self.axes))
+        num_steps = np.array([len(result.get("phi", [])) for result in results], dtype=int).reshape(shape)
+        max_steps = max(int(np.max(num_steps)), 1)
+        phi = np.full((len(results), max_steps), np.nan)
+        M = np.full((len(results), max_steps), np.nan)
+        for i, result in enumerate(results):
+            if result["status"] == "ok":
+                phi[i, : len(result["phi"])] = result["phi"]
+                M[i, : len(result["M"])] = result["M"]
+        coords = {
+            "secTag": self.sec_tags,
+            "P": self.axial_forces,
+            "axis": self.axes,
+            "step": np.arange(max_steps),
+        }
+        dims = ("secTag", "P", "axis", "step")
+        data = {
+            "phi": (dims, phi.reshape(shape + (max_steps,))),
+            "M": (dims, M.reshape(shape + (max_steps,))),
+            "numSteps": (dims[:-1], num_steps),
+            "status": (dims[:-1], np.array([result["status"] for result in results]).reshape(shape)),
+        }
+        if fiber_data:
+            max_fibers = max([len(result["FiberData"][0]) for result in results if result["status"] == "ok"] + [1])
+            fibers = np.full((len(results), max_steps, max_fibers, 6), np.nan)
+            for i, result in enumerate(results):
+                if result["status"] == "ok":
+                    n_steps, n_fibers = result["FiberData"].shape[:2]
+                    fibers[i, :n_steps, :n_fibers] = result["FiberData"]
+            data["FiberData"] = (dims + ("fiber", "property"), fibers.reshape(shape + fibers.shape[1:]))
+            coords["fiber"] = np.arange(max_fibers)
+            coords["property"] = ["yloc", "zloc", "area", "mat", "stress", "strain"]
+        self.data = xr.Dataset(data, coords=coords)
+        print("MomentCurvatureSweep: 🎉 Successfully finished! 🎉")
+        return self.data
+
+    def get_interaction_diagram(self) -> xr.Dataset:
+        """Get the P-M interaction diagram, i.e., the peak moment of each case.
+
+        Returns
+        -------
+        xr.Dataset
+            With the variables ``M`` (the peak moment) and ``phi`` (the curvature at the peak)
+            of dims ``(secTag, P, axis)``.
+        """
+        M = self.data["M"].values
+        idx = np.argmax(np.nan_to_num(M, nan=-np.inf), axis=-1)
+        return self._take_steps(idx, self.data["numSteps"].values > 0)
+
+    def get_limit_state(
+        self,
+        matTag: Union[list[int], int] = 1,
+        threshold: Union[list[float], float] = 0.0,
+        peak_drop: Union[float, bool] = False,
+    ) -> xr.Dataset:
+        """Get the curvature and moment corresponding to a certain limit state of all cases,
+        see :meth:`MomentCurvature.get_limit_state` for the parameters.
+
+        Returns
+        -------
+        xr.Dataset
+            With the variables ``phi`` and ``M`` of dims ``(secTag, P, axis)``.
+        """
+        M = self.data["M"].values
+        num_steps = self.data["numSteps"].values
+        last = np.maximum(num_steps - 1, 0)
+        steps = np.arange(M.shape[-1])
+        if peak_drop:
+            ratio_ = 0.8 if peak_drop is True else 1 - peak_drop
+            idx = np.argmax(np.nan_to_num(M, nan=-np.inf), axis=-1)
+            peak = np.take_along_axis(M, idx[..., None], axis=-1)
+            reached = (steps >= idx[..., None]) & (M <= peak * ratio_)
+            bu, found = _first_true(reached, last)
+            bu = np.where(found, bu - 1, bu)
+            if not np.all(found[num_steps > 0]):
+                warn(
+                    f"Peak strength does not drop {1 - ratio_} in some cases, please increase target ductility ratio! "
+                    f"The last value is used as the limit state."
+                )
+        else:
+            if "FiberData" not in self.data:
+                raise ValueError("The fiber data is not collected, please analyze with fiber_data=True!")
+            mat_tags = np.atleast_1d(matTag)
+            thresholds = np.atleast_1d(threshold)
+            if len(mat_tags) != len(thresholds):
+                raise ValueError("The length of matTag and threshold should be the same!")
+            fiber_data = self.data["FiberData"].values
+            strain = fiber_data[..., 5]
+            mats = fiber_data[..., 1:2, :, 3]  # the fiber data of step 0 are zeros
+            bu = np.full(num_steps.shape, np.iinfo(int).max)
+            all_found = True
+            for mat, eu in zip(mat_tags, thresholds):
+                mask = np.abs(mats - int(mat)) < 1e-6
+                if eu >= 0:
+                    reached = np.max(np.where(mask, strain, -np.inf), axis=-1) >= eu
+                else:
+                    reached = np.min(np.where(mask, strain, np.inf), axis=-1) < eu
+                bu_, found = _first_true(reached, last)
+                bu = np.minimum(bu, bu_)
+                all_found = all_found and np.all(found[num_steps > 0])
+            if not all_found:
+                warn(
+                    "The ultimate strain is not reached in some cases, please increase target ductility ratio! "
+                    "The last value is used as the limit state."
+                )
+        return self._take_steps(bu, num_steps > 0)
+
+    def plot_interaction_diagram(self, ax=None):
+        """Plot the P-M interaction diagram of each section and axis.
+
+        Parameters
+        ------------
+        ax : matplotlib.axes.Axes, optional
+            The axes to plot the interaction diagram, by default None.
+        """
+        if ax is None:
+            _, ax = plt.subplots(1, 1, figsize=(10, 10 * 0.618))
+        diagram = self.get_interaction_diagram()
+        for tag in self.sec_tags:
+            for axis in self.axes:
+                ax.plot(
+                    diagram["M"].sel(secTag=tag, axis=axis),
+                    self.axial_forces,
+                    "o-",
+                    lw=2,
+                    label=f"secTag={tag}, axis={axis}",
+                )
+        ax.set_title("$P-M$", fontsize=28)
+        ax.set_xlabel("$M$", fontsize=25)
+        ax.set_ylabel("$P$", fontsize=25)
+        ax.legend(fontsize=15)
+        plt.gcf().subplots_adjust(bottom=0.15)
+
+    def _take_steps(self, idx, valid):
+        phi = np.take_along_axis(self.data["phi"].values, idx[..., None], axis=-1)[..., 0]
+        M = np.take_along_axis(self.data["M"].values, idx[..., None], axis=-1)[..., 0]
+        dims = ("secTag", "P", "axis")
+        return xr.Dataset(
+            {"phi": (dims, np.where(valid, phi, np.nan)), "M": (dims, np.where(valid, M, np.nan))},
+            coords={dim: self.data[dim].values for dim in dims},
+        )
+
 
 def _create_model(sec_tag):
     ops.model("basic", "-ndm", 3, "-ndf", 6)
@@ -462,6 +714,7 @@ def _analyze(
     cycle=False,
     cycle_path=None,
     debug: bool = False,
+    log_mode: str = "file",
 ):
     _create_model(sec_tag=sec_tag)
     if P != 0:
@@ -496,6 +749,7 @@ def _analyze(
             "minStep": 1.0e-12,
             "printPer": 10000000000,
             "debugMode": debug,
+            "logMode": log_mode,
         }
         analysis = SmartAnalyze(analysis_type="Static", **userControl)
         segs = analysis.static_split(protocol, maxStep=incr_phi)
@@ -562,3 +816,16 @@ def _get_center(ys, zs, areas):
     yo = np.sum(ys * areas) / np.sum(areas)
     zo = np.sum(zs * areas) / np.sum(areas)
     return yo, zo
+
+
+def _sweep_case(section_builder, sec_tag, P, axis, kwargs, fiber_data):
+    ops.wipe()
+    section_builder()
+    phi, M, fibers = _analyze(sec_tag=sec_tag, P=P, axis=axis, log_mode="null", **kwargs)
+    return dict(status="ok", phi=phi, M=M, FiberData=fibers if fiber_data else None)
+
+
+def _first_true(cond, default):
+    """The index of the first True along the last axis, and whether it is found."""
+    found = np.any(cond, axis=-1)
+    return np.where(found, np.argmax(cond, axis=-1), default), found
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
+import os
 import time
+from collections import deque
 
 import numpy as np
 import openseespy.opensees as ops
@@ -12,19 +14,63 @@ from rich.progress import (
     ProgressColumn,
 )
 from rich.console import RenderableType
-from contextlib import contextmanager
+from rich.markup import escape
 
 from ..utils import get_random_color
+from ._smart_telemetry import SmartAnalyzeTelemetry
+from ._smart_checkpoint import DomainCheckpoint
 
 
 LOG_FILE = '.SmartAnalyze-OpenSees.log'
-@contextmanager
-def suppress_ops_print(verbose=False):
-    if not verbose:
-        ops.logFile(LOG_FILE, '-noEcho')
-    # else:
-    #     ops.logFile(LOG_FILE)
-    yield
+LOG_MODES = ("file", "buffer", "null")
+
+
+class OpsOutputSession:
+    """Suppress the messages printed by OpenSees during a :class:`SmartAnalyze` session.
+
+    The OpenSees log is redirected once when the session starts, instead of at each step,
+    and the echo to the console is restored when the session is closed.
+
+    Parameters
+    -----------
+    mode: str, default="file"
+        One of "file", "buffer" and "null".
+        "file" writes the messages of the session to ``LOG_FILE``;
+        "buffer" also keeps the last ``buffer_size`` messages, which are shown when a step finally fails;
+        "null" discards the messages.
+    buffer_size: int, default=20
+        The number of messages to be shown in the "buffer" mode.
+    verbose: bool, default=False
+        If True, the messages are not suppressed.
+    """
+
+    def __init__(self, mode: str = "file", buffer_size: int = 20, verbose: bool = False):
+        if mode not in LOG_MODES:
+            raise ValueError(f"logMode must be one of {LOG_MODES}!")
+        self.mode = mode
+        self.buffer_size = buffer_size
+        self.verbose = verbose
+        self.filename = os.devnull if mode == "null" else LOG_FILE
+        self.active = False
+
+    def start(self):
+        if self.verbose or self.active:
+            return
+        ops.logFile(self.filename, "-noEcho")
+        self.active = True
+
+    def stop(self):
+        if self.active:
+            # OpenSees can not stop logging, so the log goes to the null device with the echo on
+            ops.logFile(os.devnull)
+            self.active = False
+
+    def get_messages(self) -> list:
+        """Get the last ``buffer_size`` messages of the session, only available in the "buffer" mode."""
+        if self.mode != "buffer" or not os.path.exists(self.filename):
+            return []
+        with open(self.filename, errors="replace") as f:
+            return [line.rstrip() for line in deque(f, maxlen=self.buffer_size) if line.strip()]
 
 
 class HHMMSSMSColumn(ProgressColumn):
@@ -38,6 +84,142 @@ class HHMMSSMSColumn(ProgressColumn):
         return f"[#037ef3]{hours:02} h : [#f85a40]{minutes:02} m : [#00c16e]{seconds:02} s : [#7552cc]{millis:03} ms"
 
 
+class StepController:
+    """Adaptive step size controller of :class:`SmartAnalyze`.
+
+    The step size is multiplied by ``grow_factor`` after ``grow_after`` consecutive successful steps
+    that converged within ``target_iter`` iterations (a smooth region),
+    and multiplied by ``relaxation`` after a failed step.
+    The last stable step size is remembered, so the next call starts from it instead of the full step.
+    A step clipped to the remaining part of the target step does not shrink the remembered step size.
+
+    Parameters
+    -----------
+    relaxation: float
+        The factor to shrink the step size on failure.
+    grow_factor: float
+        The factor to grow the step size in smooth regions.
+    grow_after: int
+        The number of consecutive smooth successes before growing.
+    target_iter: int
+        The steps that converged within this number of iterations (``ops.testIter()``) are smooth.
+    """
+
+    def __init__(self, relaxation: float, grow_factor: float, grow_after: int, target_iter: int):
+        self.relaxation = relaxation
+        self.grow_factor = grow_factor
+        self.grow_after = grow_after
+        self.target_iter = target_iter
+        self.stable_step = None  # the absolute value of the last stable step size
+        self.num_smooth = 0
+        self.num_failures = 0
+
+    def get_step(self, step: float):
+        """The step size to try first for a target step ``step``, with the same sign."""
+        if self.stable_step is None or self.stable_step >= abs(step):
+            return step
+        return np.sign(step) * self.stable_step
+
+    def on_success(self, step: float, num_iter: int, max_step: float, clipped: bool = False):
+        """Record a successful step and return the size of the next step, with the same sign.
+        ``clipped`` is True if the step was clipped to the remaining part of the target step."""
+        if clipped and self.stable_step is not None:
+            self.stable_step = max(self.stable_step, abs(step))
+        else:
+            self.stable_step = abs(step)
+        if num_iter <= self.target_iter:
+            self.num_smooth += 1
+        else:
+            self.num_smooth = 0
+        if self.num_smooth >= self.grow_after:
+            self.stable_step = min(self.stable_step * self.grow_factor, abs(max_step))
+            self.num_smooth = 0
+        return np.sign(step) * self.stable_step
+
+    def on_failure(self, step: float):
+        """Record a failed step and return the shrunk step size."""
+        self.num_failures += 1
+        self.num_smooth = 0
+        return step * self.relaxation
+
+
+class AlgorithmSelector:
+    """Learn the order of the fallback algorithms of :class:`SmartAnalyze` from the observed attempts.
+
+    The outcome and wall time of the last ``window`` attempts of each algorithm flag are kept.
+    The fallbacks are tried in the order of the expected cost to converge,
+    i.e., the total time of the attempts in the window divided by the number of successes.
+    The flags without attempts follow in the user order, and the flags that never converged in the window come last.
+    A fallback that rescues a failed step and has a lower expected cost than the primary algorithm
+    is promoted to the primary algorithm for the next ``promote_steps`` steps,
+    after which the first flag of ``algo_types`` is tried again.
+
+    Parameters
+    -----------
+    algo_types: list[int]
+        The algorithm flags, the first one is the primary algorithm.
+    window: int
+        The number of attempts of each algorithm in the sliding window.
+    promote_steps: int
+        The number of steps, i.e., ``TransientAnalyze`` or ``StaticAnalyze`` calls, for which a promotion lasts.
+    """
+
+    def __init__(self, algo_types: list, window: int, promote_steps: int):
+        self.algo_types = list(algo_types)
+        self.window = window
+        self.promote_steps = promote_steps
+        self.records = {flag: deque(maxlen=window) for flag in self.algo_types}  # (converged, cost)
+        self.promoted = None
+        self.promoted_steps_left = 0
+
+    @property
+    def primary(self):
+        """The algorithm flag to start each step with."""
+        return self.algo_types[0] if self.promoted is None else self.promoted
+
+    def add_attempt(self, flag: int, ok: int, cost: float):
+        if flag not in self.records:
+            self.records[flag] = deque(maxlen=self.window)
+        self.records[flag].append((ok == 0, cost))
+
+    def get_expected_cost(self, flag: int):
+        """The expected cost to converge, None if not attempted, inf if never converged in the window."""
+        records = self.records.get(flag)
+        if not records:
+            return None
+        num_success = sum(converged for converged, _ in records)
+        if num_success == 0:
+            return np.inf
+        return sum(cost for _, cost in records) / num_success
+
+    def get_fallbacks(self):
+        """The flags to try after the primary algorithm failed, in order."""
+        def sort_key(item):
+            idx, flag = item
+            cost = self.get_expected_cost(flag)
+            if cost is None:
+                return 1, idx
+            if np.isinf(cost):
+                return 2, idx
+            return 0, cost
+
+        flags = [(i, flag) for i, flag in enumerate(self.algo_types) if flag != self.primary]
+        return [flag for _, flag in sorted(flags, key=sort_key)]
+
+    def on_step(self):
+        """Called at the start of each step to age the promotion."""
+        if self.promoted is not None:
+            self.promoted_steps_left -= 1
+            if self.promoted_steps_left < 0:
+                self.promoted = None
+
+    def on_rescue(self, flag: int):
+        """Called when the fallback ``flag`` converged after the primary algorithm failed."""
+        if self.get_expected_cost(flag) < self.get_expected_cost(self.primary):
+            self.promoted = None if flag == self.algo_types[0] else flag
+            self.promoted_steps_left = self.promote_steps
+
+
 class SmartAnalyze:
     """The SmartAnalyze is a class to provide OpenSeesPy users an easier
     way to conduct analyses.
@@ -104,6 +286,18 @@ class SmartAnalyze:
         and the parameters must be included in the list, for example:
         algoTypes = [10, 20, 100],
         UserAlgoArgs = ["KrylovNewton", "-iterate", "initial", "-maxDim", 20]
+    learnAlgoTypes: bool, default=False
+        Only useful when tryAlterAlgoTypes is True.
+        If True, the success rate and wall time of each algorithm are tracked over a sliding window,
+        and the fallbacks are tried in the order of the expected cost to converge instead of the order in `algoTypes`.
+        A fallback that rescues a failed step and has a lower expected cost than the first algorithm
+        is promoted to the first algorithm for the next `promoteAlgoSteps` steps,
+        and the first flag in `algoTypes` is tried again after that.
+        If False, the last successful fallback is kept until all algorithms fail.
+    algoStatsWindow: int, default=50
+        Only useful when learnAlgoTypes is True. The number of attempts of each algorithm to be tracked.
+    promoteAlgoSteps: int, default=100
+        Only useful when learnAlgoTypes is True. The number of steps for which a promotion lasts.
 
     **Algorithm type flag reference**
 
@@ -206,17 +400,70 @@ class SmartAnalyze:
         The step tolerance when shortening the step length.
         If step length is smaller than minStep, special ways to converge the model will be used
         according to `try-` flags.
+    adaptiveStep: bool, default=False
+        If True, an adaptive step controller is used instead of re-attempting the fixed step.
+        The step size is shrunk by `relaxation` on failure, grown by `stepGrowFactor` after
+        `stepGrowAfter` consecutive steps that converged within `targetTestIter` iterations,
+        and the last stable step size is remembered across ``TransientAnalyze`` and ``StaticAnalyze`` calls.
+        If False, the failed step is divided by `relaxation` and the next call restarts at the full step.
+    stepGrowFactor: float, default=1.5
+        Only useful when adaptiveStep is True. The factor to grow the step size.
+    stepGrowAfter: int, default=2
+        Only useful when adaptiveStep is True. The number of consecutive smooth steps before growing.
+    targetTestIter: int, default=None
+        Only useful when adaptiveStep is True.
+        A step is smooth if ``ops.testIter()`` is not larger than this number.
+        If None, half of `testIterTimes`.
+
+    CHECKPOINT RELATED:
+    ===================
+    checkpointEvery: int, default=0
+        If larger than 0, the committed domain is saved every `checkpointEvery` successful steps.
+        When all the other ways to converge fail, the domain is rolled back to the last checkpoint,
+        and the steps since then are replayed with the adaptive step controller,
+        starting from the step size multiplied by `relaxation`.
+    checkpointRetries: int, default=2
+        Only useful when checkpointEvery > 0. The number of rollbacks for a failed step,
+        the starting step size of each retry is multiplied by `relaxation` again.
+    checkpointMode: str, default="database"
+        Only useful when checkpointEvery > 0.
+        If "database", the domain is saved by the OpenSees ``database``, ``save`` and ``restore`` commands,
+        which include the states of the elements and materials.
+        Not all elements support these commands, e.g., ``restore`` crashes for ``forceBeamColumn``
+        and fiber sections of multiple materials in some OpenSeesPy versions, so test the model with a short run first.
+        If the commands fail, a warning is issued and the "nodal" mode is used instead.
+        If "nodal", a checkpoint is the nodal displacements, velocities and accelerations and the domain time,
+        the states of the elements and materials are not rolled back,
+        so it is only exact for path-independent models, and a warning is issued at each rollback.
+    checkpointDir: str, default=None
+        Only useful when checkpointEvery > 0. The directory of the checkpoint files.
+        If None, the checkpoints are kept in memory or in a temporary directory.
+        Otherwise, the nodal state of the last checkpoint is also written to this directory,
+        so that a crashed run can be resumed by :meth:`resume`.
 
     LOGGING RELATED:
     ===================
     debugMode: bool, default=False
         If True, print as much information as possible.
         If False, the progress bar will be used.
-        If False, a log file named '.SmartAnalyze-OpenSees.log'
-        will be generated to store the information printed by OpenSees.
+        If False, the information printed by OpenSees is suppressed according to `logMode`.
+    logMode: str, default="file"
+        How the information printed by OpenSees is suppressed, it is set once when the class is created
+        and restored by :meth:`close`.
+        If "file", it is stored in a log file named '.SmartAnalyze-OpenSees.log'.
+        If "buffer", it is also stored in the log file, and the last `logBufferSize` messages
+        are printed when a step finally fails.
+        If "null", it is discarded.
+    logBufferSize: int, default=20
+        Only useful when logMode is "buffer". The number of messages printed on failure.
     printPer: int, default=50
         Print to the console every several trials.
         This is only useful when debugMode = True.
+    telemetry: bool, default=False
+        If True, each ``ops.analyze`` attempt is recorded, with the step size, recovery strategy,
+        algorithm, ``testIter``, ``testNorm`` and wall time,
+        see :class:`~opstool.anlys.SmartAnalyzeTelemetry`.
+        The recorder is available as ``SmartAnalyze.telemetry``.
 
     Examples
     ---------
@@ -287,11 +534,25 @@ class SmartAnalyze:
             "tryAlterAlgoTypes": False,
             "algoTypes": [40, 10, 20, 30, 50, 60, 70, 90],
             "UserAlgoArgs": None,
+            "learnAlgoTypes": False,
+            "algoStatsWindow": 50,
+            "promoteAlgoSteps": 100,
             "initialStep": None,
             "relaxation": 0.5,
             "minStep": 1.0e-6,
+            "adaptiveStep": False,
+            "stepGrowFactor": 1.5,
+            "stepGrowAfter": 2,
+            "targetTestIter": None,
+            "checkpointEvery": 0,
+            "checkpointRetries": 2,
+            "checkpointMode": "database",
+            "checkpointDir": None,
             "debugMode": False,
             "printPer": 20,
+            "telemetry": False,
+            "logMode": "file",
+            "logBufferSize": 20,
         }
         self.control_args["looseTestTolTo"] = 100 * self.control_args["testTol"]
         for name in kargs.keys():
@@ -306,6 +567,21 @@ class SmartAnalyze:
         self.logo_analysis_type = f"[bold cerulean]{self.analysis_type}"
 
         self.debug_mode = self.control_args["debugMode"]
+        self.telemetry = SmartAnalyzeTelemetry() if self.control_args["telemetry"] else None
+        self.algorithm_flag = None
+        self.algo_selector = None
+        if self.control_args["learnAlgoTypes"]:
+            self.algo_selector = AlgorithmSelector(
+                self.control_args["algoTypes"],
+                window=self.control_args["algoStatsWindow"],
+                promote_steps=self.control_args["promoteAlgoSteps"],
+            )
+        self.output = OpsOutputSession(
+            mode=self.control_args["logMode"],
+            buffer_size=self.control_args["logBufferSize"],
+            verbose=self.debug_mode,
+        )
+        self.output.start()
 
         # initial test commands
         self._set_init_test()
@@ -328,11 +604,31 @@ class SmartAnalyze:
             "step": 0.0,
             "node": 0,
             "dof": 0,
+            "calls": 0,
+            "strategy": "initial",
         }
 
         self.progress = None
         self.task = None
 
+        target_iter = self.control_args["targetTestIter"]
+        if target_iter is None:
+            target_iter = max(self.control_args["testIterTimes"] // 2, 1)
+        self.step_controller = StepController(
+            relaxation=self.control_args["relaxation"],
+            grow_factor=self.control_args["stepGrowFactor"],
+            grow_after=self.control_args["stepGrowAfter"],
+            target_iter=target_iter,
+        )
+
+        self.checkpoint = None
+        if self.control_args["checkpointEvery"] > 0:
+            self.checkpoint = DomainCheckpoint(
+                every=self.control_args["checkpointEvery"],
+                mode=self.control_args["checkpointMode"],
+                directory=self.control_args["checkpointDir"],
+            )
+
     def _set_progress_bar(self, npts):
         self.progress = Progress(
             # TextColumn(f"{self.logo_progress} • {{task.description}}"),
@@ -515,17 +811,33 @@ class SmartAnalyze:
     def _analyze(self):
         initial_step = self.control_args["initialStep"]
         verbose = True if self.debug_mode else False
+        self.current_args["calls"] += 1
+        if self.algo_selector is not None:
+            self.algo_selector.on_step()
+            if self.algorithm_flag != self.algo_selector.primary:
+                self._setAlgorithm(self.algo_selector.primary, self.control_args["UserAlgoArgs"], verbose=verbose)
+
+        if self.checkpoint is not None and self.checkpoint.meta is None:
+            # the initial state, so that the steps before the first periodic checkpoint can be rolled back
+            self.checkpoint.save(self.current_args["progress"])
+
+        if self.control_args["adaptiveStep"]:
+            ok = self._adaptive_analyze(initial_step, verbose)
+        else:
+            self.current_args["strategy"] = "initial"
+            ok = self._analyze_one_step(initial_step, verbose=verbose)
 
-        ok = self._analyze_one_step(initial_step, verbose=verbose)
+            if ok < 0:
+                ok = self._try_add_test_times(initial_step, verbose)
+            if ok < 0:
+                ok = self._try_alter_algo_types(initial_step, verbose)
+            if ok < 0:
+                ok = self._try_relax_step(initial_step, verbose)
+            if ok < 0:
+                ok = self._try_loose_test_tol(initial_step, verbose)
 
-        if ok < 0:
-            ok = self._try_add_test_times(initial_step, verbose)
-        if ok < 0:
-            ok = self._try_alter_algo_types(initial_step, verbose)
-        if ok < 0:
-            ok = self._try_relax_step(initial_step, verbose)
-        if ok < 0:
-            ok = self._try_loose_test_tol(initial_step, verbose)
+        if ok < 0 and self.checkpoint is not None:
+            ok = self._try_rollback(initial_step, verbose)
 
         if ok < 0:
             color = get_random_color()
@@ -535,10 +847,19 @@ class SmartAnalyze:
             if self.progress is not None:
                 self.progress.stop()
 
+            messages = self.output.get_messages()
+            if len(messages) > 0:
+                print(f">>> {self.logo} The last {len(messages)} messages of OpenSees:")
+                print(escape("\n".join(messages)))
+
             return ok
 
         self.current_args["progress"] += 1
         self.current_args["counter"] += 1
+        if self.checkpoint is not None:
+            self.checkpoint.add_step(
+                self.current_args["node"], self.current_args["dof"], initial_step, self.current_args["progress"]
+            )
 
         color = get_random_color()
 
@@ -585,6 +906,41 @@ class SmartAnalyze:
             None
         """
         self._stop_progress_bar()
+        self.output.stop()
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+
+    def resume(self):
+        """Resume a run from the last checkpoint written to `checkpointDir`, e.g., after a crash.
+        The model and the analysis commands must be defined the same way as the crashed run before calling this.
+        The nodal state and time of the checkpoint are restored, while the elements and materials
+        start from their current states, so the resumed run is exact only for path-independent models,
+        and a warning is issued.
+
+        Returns:
+            int, the number of steps completed at the checkpoint, i.e., the number of segments to be skipped.
+
+        Examples:
+            >>> analysis = opst.anlys.SmartAnalyze(checkpointEvery=100, checkpointDir="checkpoints")
+            >>> segs = analysis.transient_split(npts)
+            >>> start = analysis.resume()
+            >>> for _ in segs[start:]:
+            >>>     analysis.TransientAnalyze(dt)
+        """
+        if self.checkpoint is None or self.checkpoint.directory is None:
+            raise ValueError("resume requires checkpointEvery > 0 and checkpointDir!")
+        meta = self.checkpoint.load()
+        if meta is None:
+            return 0
+        self.current_args["progress"] = meta["progress"]
+        if self.progress is not None:
+            self.progress.update(self.task, completed=meta["progress"])
+        color = get_random_color()
+        print(
+            f">>> ⏩ {self.logo} Resumed from the checkpoint at time [bold {color}]{meta['time']:.3e}[/bold {color}], "
+            f"step [bold {color}]{meta['progress']}[/bold {color}]."
+        )
+        return meta["progress"]
 
     def _analyze_one_step(self, step: float, verbose):
         if self.analysis_type == "Static":
@@ -597,13 +953,31 @@ class SmartAnalyze:
 
             # reset sensitivity analysis algorithm
             self._run_sensitivity_algorithm()
-            with suppress_ops_print(verbose=verbose):
-                ok = ops.analyze(1)
+            start = time.perf_counter_ns()
+            ok = ops.analyze(1)
         else:
-            with suppress_ops_print(verbose=verbose):
-                ok = ops.analyze(1, step)
+            start = time.perf_counter_ns()
+            ok = ops.analyze(1, step)
+        elapsed = time.perf_counter_ns() - start
 
         self.current_args["step"] = step
+        if self.algo_selector is not None:
+            self.algo_selector.add_attempt(self.algorithm_flag, ok, elapsed)
+        if self.telemetry is not None:
+            # testNorm has one slot per allowed iteration, the unused ones are zero
+            num_iter, norms = ops.testIter(), ops.testNorm()
+            num_norms = min(num_iter, len(norms))
+            self.telemetry.add_record(
+                step=self.current_args["calls"],
+                time=ops.getTime(),
+                step_size=step,
+                strategy=self.current_args["strategy"],
+                algorithm=self.algorithm_flag,
+                ok=ok,
+                test_iter=num_iter,
+                test_norm=norms[num_norms - 1] if num_norms > 0 else np.nan,
+                elapsed_ns=elapsed,
+            )
 
         return ok
 
@@ -613,6 +987,7 @@ class SmartAnalyze:
         times = self.control_args["testIterTimesMore"]
         if isinstance(times, (int, float)):
             times = [int(times)]
+        self.current_args["strategy"] = "addTestTimes"
 
         ok = -1
         for num in times:
@@ -652,8 +1027,13 @@ class SmartAnalyze:
         if len(self.control_args["algoTypes"]) <= 1:
             return -1
 
+        self.current_args["strategy"] = "alterAlgoTypes"
+        if self.algo_selector is None:
+            primary, fallbacks = self.control_args["algoTypes"][0], self.control_args["algoTypes"][1:]
+        else:
+            primary, fallbacks = self.algo_selector.primary, self.algo_selector.get_fallbacks()
         ok = -1
-        for algo_flag in self.control_args["algoTypes"][1:]:
+        for algo_flag in fallbacks:
             color = get_random_color()
             if verbose:
                 print(
@@ -667,10 +1047,12 @@ class SmartAnalyze:
             )
             ok = self._analyze_one_step(step, verbose=verbose)
             if ok == 0:
+                if self.algo_selector is not None:
+                    self.algo_selector.on_rescue(algo_flag)
                 return ok
         if ok < 0:  # goback
             self._setAlgorithm(
-                self.control_args["algoTypes"][0],
+                primary,
                 self.control_args["UserAlgoArgs"],
                 verbose=self.debug_mode
             )
@@ -681,6 +1063,7 @@ class SmartAnalyze:
         min_step = self.control_args["minStep"]
         step_try = step * alpha  # The current step size we're trying to use
         step_remaining = step  # How much of the time step is left to complete
+        self.current_args["strategy"] = "relaxStep"
 
         if verbose:
             color = get_random_color()
@@ -727,6 +1110,67 @@ class SmartAnalyze:
                     )
         return ok
 
+    def _adaptive_analyze(self, step, verbose, strategy="adaptiveStep"):
+        """Complete ``step`` by substeps whose sizes are given by the step controller."""
+        controller = self.step_controller
+        min_step = self.control_args["minStep"]
+        step_remaining = step
+        step_try = controller.get_step(step)
+        ok = 0
+        while abs(step_remaining) > self.eps:
+            clipped = abs(step_try) > abs(step_remaining)
+            if clipped:
+                step_try = step_remaining  # avoid overshooting
+            self.current_args["strategy"] = strategy
+            ok = self._analyze_one_step(step_try, verbose=verbose)
+            if ok < 0:
+                ok = self._try_add_test_times(step_try, verbose)
+            if ok < 0:
+                ok = self._try_alter_algo_types(step_try, verbose)
+            if ok < 0 and abs(step_try) * controller.relaxation < min_step:
+                # the last resort at the min step
+                ok = self._try_loose_test_tol(step_try, verbose)
+                if ok < 0:
+                    color = get_random_color()
+                    print(
+                        f">>> ▶️ {self.logo} Current step [bold {color}]%.3e[/bold {color}] beyond the min step!"
+                        % (abs(step_try) * controller.relaxation)
+                    )
+                    return ok
+            if ok == 0:
+                step_remaining -= step_try
+                step_try = controller.on_success(step_try, ops.testIter(), step, clipped=clipped)
+            else:
+                step_try = controller.on_failure(step_try)
+            if verbose:
+                color = get_random_color()
+                print(
+                    f">>> ▶️ {self.logo} Remaining step [bold {color}]{step_remaining:.3e}[/bold {color}], "
+                    f"next sub-step size [bold {color}]{step_try:.3e}[/bold {color}]"
+                )
+        return ok
+
+    def _try_rollback(self, step, verbose):
+        node, dof = self.current_args["node"], self.current_args["dof"]
+        ok = -1
+        for i in range(self.control_args["checkpointRetries"]):
+            meta = self.checkpoint.restore()
+            color = get_random_color()
+            print(
+                f">>> ⏪ {self.logo} Rolling back to the checkpoint at time "
+                f"[bold {color}]{meta['time']:.3e}[/bold {color}], retry [bold {color}]{i + 1}[/bold {color}]."
+            )
+            relaxation = self.control_args["relaxation"] ** (i + 1)
+            for node_, dof_, step_ in self.checkpoint.steps + [(node, dof, step)]:
+                self.current_args["node"], self.current_args["dof"] = node_, dof_
+                self.step_controller.stable_step = abs(step_) * relaxation
+                ok = self._adaptive_analyze(step_, verbose, strategy="rollback")
+                if ok < 0:
+                    break
+            if ok == 0:
+                return ok
+        return ok
+
     def _try_loose_test_tol(self, step, verbose):
         if not self.control_args["tryLooseTestTol"]:
             return -1
@@ -736,6 +1180,7 @@ class SmartAnalyze:
                 f">>> ⚠️ {self.logo} Warning: [bold {color}]Loosing test tolerance to "
                 f"{self.control_args['looseTestTolTo']}[/bold {color}]"
             )
+        self.current_args["strategy"] = "looseTestTol"
         ops.test(
             self.control_args["testType"],
             self.control_args["looseTestTolTo"],
@@ -758,6 +1203,7 @@ class SmartAnalyze:
         )
 
     def _setAlgorithm(self, algotype, user_algo_args: list = None, verbose=True):
+        self.algorithm_flag = algotype
         color = get_random_color()
         prefix = ">>> ▶️"
 
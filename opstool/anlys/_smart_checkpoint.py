@@ -0,0 +1,174 @@
+import os
+import shutil
+import tempfile
+from warnings import warn
+
+import numpy as np
+import openseespy.opensees as ops
+
+CHECKPOINT_MODES = ("database", "nodal")
+# The two commit tags are used in turn, so that the last checkpoint is intact while the next one is being saved.
+CHECKPOINT_TAGS = (11, 12)
+CHECKPOINT_FILE = "checkpoint.npz"
+NODAL_WARNING = (
+    "The nodal checkpoint rolls back only the nodal displacements, velocities, accelerations and the time, "
+    "the elements and materials keep their current states, so the results are exact only for path-independent models!"
+)
+
+
+class DomainCheckpoint:
+    """Periodic checkpoints of the committed OpenSees domain for :class:`SmartAnalyze`.
+
+    In the "database" mode, the domain is saved by the OpenSees ``database``, ``save`` and ``restore`` commands,
+    which include the committed states of the elements and materials.
+    If these commands fail, a warning is issued and the "nodal" mode is used instead.
+
+    In the "nodal" mode, a checkpoint is the nodal state vector, i.e., the displacements,
+    velocities and accelerations of all nodes, and the domain time.
+    The elements and materials are not rolled back, so a rollback is exact only for path-independent models,
+    and a warning is issued at each rollback.
+
+    If ``directory`` is not None, the nodal state vector of the last checkpoint is also written to
+    ``directory/checkpoint.npz``, so that a crashed run can be resumed by :meth:`load`.
+    The steps since the last checkpoint are remembered, so that they can be replayed after a rollback.
+
+    .. Note::
+        The ``database`` commands rely on ``sendSelf`` and ``recvSelf`` of each element and material,
+        which are not implemented by all of them, e.g., ``restore`` crashes for ``forceBeamColumn``
+        and fiber sections of multiple materials in some OpenSeesPy versions,
+        and the database can not be restored by another process.
+        Test the model with a short run first.
+
+    Parameters
+    -----------
+    every: int
+        Save a checkpoint after every ``every`` successful steps.
+    mode: str, default="database"
+        "database" or "nodal".
+    directory: str, default=None
+        The directory of the checkpoint files.
+        If None, the nodal state vector is kept in memory, and the database files are written to
+        a temporary directory, which is removed by :meth:`close`.
+    """
+
+    def __init__(self, every: int, mode: str = "database", directory: str = None):
+        if mode not in CHECKPOINT_MODES:
+            raise ValueError(f"checkpointMode must be one of {CHECKPOINT_MODES}!")
+        self.every = every
+        self.mode = mode
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self.db_directory = None
+        if mode == "database":
+            self.db_directory = tempfile.mkdtemp(prefix="SmartAnalyze-") if directory is None else directory
+            try:
+                ops.database("File", os.path.join(self.db_directory, "domain"))
+            except Exception as error:
+                self._fall_back(error)
+        self.meta = None  # tag, time and progress of the last checkpoint
+        self.nodal_state = None  # node tags, ndf of each node, and the concatenated disp, vel and accel
+        self.steps = []  # (node, dof, step) of the successful steps since the last checkpoint
+        self.num_saved = 0
+
+    def add_step(self, node: int, dof: int, step: float, progress: int):
+        """Record a successful step, and save a checkpoint every ``every`` steps."""
+        self.steps.append((node, dof, step))
+        if len(self.steps) >= self.every:
+            self.save(progress)
+
+    def save(self, progress: int):
+        """Save the committed domain, ``progress`` is the number of successful steps."""
+        tag = CHECKPOINT_TAGS[self.num_saved % len(CHECKPOINT_TAGS)]
+        self.meta = dict(tag=tag, time=ops.getTime(), progress=progress)
+        if self.mode == "database":
+            try:
+                ops.save(tag)
+            except Exception as error:
+                self._fall_back(error)
+        # the nodal state is also kept in the database mode, for the fallback to the nodal mode
+        node_tags = ops.getNodeTags()
+        self.nodal_state = dict(
+            nodeTags=np.array(node_tags, dtype=np.int64),
+            ndf=np.array([len(ops.nodeDisp(tag)) for tag in node_tags], dtype=np.int64),
+            disp=np.concatenate([ops.nodeDisp(tag) for tag in node_tags]),
+            vel=np.concatenate([ops.nodeVel(tag) for tag in node_tags]),
+            accel=np.concatenate([ops.nodeAccel(tag) for tag in node_tags]),
+        )
+        if self.directory is not None:
+            filename = os.path.join(self.directory, CHECKPOINT_FILE)
+            with open(filename + ".tmp", "wb") as f:
+                np.savez(f, **self.nodal_state, **self.meta)
+            os.replace(filename + ".tmp", filename)
+        self.steps = []
+        self.num_saved += 1
+
+    def restore(self):
+        """Roll the domain back to the last checkpoint.
+
+        Returns
+        --------
+        dict of the checkpoint, with keys ``tag``, ``time`` and ``progress``, or None if no checkpoint is saved.
+        """
+        if self.meta is None:
+            return None
+        if self.mode == "database":
+            try:
+                ops.restore(self.meta["tag"])
+                ops.domainChange()
+                # a restored database can not be restored again, save the restored domain by the other tag,
+                # ``domainChange`` must not be called after this save
+                tag = CHECKPOINT_TAGS[self.num_saved % len(CHECKPOINT_TAGS)]
+                ops.save(tag)
+                self.meta["tag"] = tag
+                self.num_saved += 1
+                return self.meta
+            except Exception as error:
+                self._fall_back(error)
+        warn(NODAL_WARNING)
+        self._set_nodal_state()
+        ops.domainChange()
+        return self.meta
+
+    def load(self):
+        """Restore the nodal state vector and time of the last checkpoint written to ``directory`` by a previous run.
+        The model must be rebuilt the same way before, the elements and materials start from their current states.
+
+        Returns
+        --------
+        dict of the checkpoint, or None if no checkpoint is found.
+        """
+        if self.directory is None:
+            raise ValueError("Only the checkpoints written to a directory can be loaded!")
+        filename = os.path.join(self.directory, CHECKPOINT_FILE)
+        if not os.path.exists(filename):
+            return None
+        with np.load(filename) as data:
+            self.nodal_state = {key: data[key] for key in ("nodeTags", "ndf", "disp", "vel", "accel")}
+            meta = dict(tag=int(data["tag"]), time=float(data["time"]), progress=int(data["progress"]))
+        warn(NODAL_WARNING)
+        self._set_nodal_state(time=meta["time"])
+        ops.domainChange()
+        # the database of the previous run can not be restored, start a new one
+        self.meta = None
+        self.steps = []
+        self.save(meta["progress"])
+        return meta
+
+    def close(self):
+        if self.db_directory is not None and self.directory is None:
+            shutil.rmtree(self.db_directory, ignore_errors=True)
+
+    def _fall_back(self, error):
+        warn(f"The OpenSees database commands failed ({error}), the nodal checkpoints are used instead!")
+        self.mode = "nodal"
+
+    def _set_nodal_state(self, time: float = None):
+        state = self.nodal_state
+        offsets = np.concatenate([[0], np.cumsum(state["ndf"])])
+        for i, tag in enumerate(state["nodeTags"].tolist()):
+            for j, idx in enumerate(range(offsets[i], offsets[i + 1])):
+                ops.setNodeDisp(tag, j + 1, float(state["disp"][idx]), "-commit")
+                ops.setNodeVel(tag, j + 1, float(state["vel"][idx]), "-commit")
+                ops.setNodeAccel(tag, j + 1, float(state["accel"][idx]), "-commit")
+        ops.setTime(self.meta["time"] if time is None else time)
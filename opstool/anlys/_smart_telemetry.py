@@ -0,0 +1,127 @@
+import numpy as np
+import xarray as xr
+from rich import print
+from rich.table import Table
+
+# The recovery strategies of SmartAnalyze, the index is stored in the records.
+STRATEGIES = ("initial", "addTestTimes", "alterAlgoTypes", "relaxStep", "looseTestTol", "adaptiveStep", "rollback")
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("step", np.int64),  # index of the TransientAnalyze or StaticAnalyze call
+        ("time", np.float64),  # the domain time after the attempt
+        ("stepSize", np.float64),
+        ("strategy", np.int8),  # index in STRATEGIES
+        ("algorithm", np.int16),  # the algorithm flag of SmartAnalyze
+        ("ok", np.int8),
+        ("testIter", np.int32),
+        ("testNorm", np.float64),  # the last norm of the test
+        ("elapsedNs", np.int64),  # the wall time of ops.analyze
+    ]
+)
+
+
+class SmartAnalyzeTelemetry:
+    """The convergence telemetry of :class:`SmartAnalyze`.
+
+    Each ``ops.analyze`` attempt is recorded, with the step index, domain time, step size,
+    recovery strategy, algorithm flag, return code, ``ops.testIter()``, the last ``ops.testNorm()``
+    and the elapsed wall time in nanoseconds.
+
+    .. Note::
+        Set ``telemetry=True`` in :class:`SmartAnalyze` to enable the recording,
+        the recorder is available as ``SmartAnalyze.telemetry``.
+
+    Parameters
+    -----------
+    capacity: int, default=1024
+        The initial number of records to be preallocated, it is doubled when full.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.records = np.zeros(max(int(capacity), 1), dtype=RECORD_DTYPE)
+        self.num_records = 0
+
+    def add_record(self, step, time, step_size, strategy, algorithm, ok, test_iter, test_norm, elapsed_ns):
+        if self.num_records == len(self.records):
+            self.records = np.concatenate([self.records, np.zeros_like(self.records)])
+        self.records[self.num_records] = (
+            step, time, step_size, STRATEGIES.index(strategy), algorithm, ok, test_iter, test_norm, elapsed_ns
+        )
+        self.num_records += 1
+
+    def to_numpy(self) -> np.ndarray:
+        """Get the records as a NumPy structured array."""
+        return self.records[: self.num_records].copy()
+
+    def to_xarray(self) -> xr.Dataset:
+        """Get the records as an xarray Dataset along the ``attempt`` dimension.
+        The strategy names are stored in the ``strategies`` attribute."""
+        records = self.records[: self.num_records]
+        data = {name: ("attempt", records[name]) for name in RECORD_DTYPE.names}
+        return xr.Dataset(
+            data,
+            coords={"attempt": np.arange(self.num_records)},
+            attrs={"strategies": STRATEGIES},
+        )
+
+    def save(self, filename: str):
+        """Save the records to a compact binary ``.npy`` file, which can be read by :meth:`load`."""
+        np.save(filename, self.to_numpy(), allow_pickle=False)
+
+    @classmethod
+    def load(cls, filename: str):
+        """Load the records saved by :meth:`save`."""
+        records = np.load(filename, allow_pickle=False)
+        telemetry = cls(capacity=len(records))
+        telemetry.records[: len(records)] = records.astype(RECORD_DTYPE)
+        telemetry.num_records = len(records)
+        return telemetry
+
+    def summary(self, print_table: bool = True) -> dict:
+        """Summarize where the time was spent, by strategy and by algorithm.
+
+        Parameters
+        -----------
+        print_table: bool, default=True
+            If True, print the summary tables.
+
+        Returns
+        --------
+        dict, with keys ``"strategy"`` and ``"algorithm"``,
+        each maps a strategy name or an algorithm flag to a dict of
+        ``attempts``, ``successes``, ``iterations`` and ``seconds``.
+        """
+        records = self.records[: self.num_records]
+        summary = {
+            "strategy": _group_records(records, records["strategy"], lambda idx: STRATEGIES[idx]),
+            "algorithm": _group_records(records, records["algorithm"], int),
+        }
+        if print_table:
+            for key, title in (("strategy", "Strategy"), ("algorithm", "Algorithm")):
+                table = Table(title=f"SmartAnalyze time by {title.lower()}")
+                for column in (title, "Attempts", "Successes", "Iterations", "Time [s]"):
+                    table.add_column(column, justify="right")
+                for name, values in summary[key].items():
+                    table.add_row(
+                        str(name),
+                        str(values["attempts"]),
+                        str(values["successes"]),
+                        str(values["iterations"]),
+                        f"{values['seconds']:.4f}",
+                    )
+                print(table)
+        return summary
+
+
+def _group_records(records, keys, to_name):
+    groups = dict()
+    for key in np.unique(keys):
+        rows = records[keys == key]
+        groups[to_name(key)] = dict(
+            attempts=len(rows),
+            successes=int(np.sum(rows["ok"] == 0)),
+            iterations=int(np.sum(rows["testIter"])),
+            seconds=float(np.sum(rows["elapsedNs"]) * 1e-9),
+        )
+    return groups
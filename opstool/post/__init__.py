@@ -1,7 +1,9 @@
-from .model_data import save_model_data, load_model_data
+from .model_data import save_model_data, load_model_data, get_model_fingerprint
 from .eigen_data import save_eigen_data, load_eigen_data, get_eigen_data
 from .responses_data import CreateODB, loadODB, get_model_data, update_unit_system, reset_unit_system
 from .responses_data import get_nodal_responses, get_element_responses, get_sensitivity_responses
+from .responses_data import get_monitored_responses
+from .responses_data import merge_odbs
 # from ._unit_postprocess import get_post_unit_multiplier, get_post_unit_symbol
 
 from ..utils import set_odb_path
@@ -14,6 +16,7 @@ __all__ = [
     "save_model_data",
     "save_eigen_data",
     "load_model_data",
+    "get_model_fingerprint",
     "load_eigen_data",
     "get_eigen_data",
     "CreateODB",
@@ -22,4 +25,6 @@ __all__ = [
     "get_nodal_responses",
     "get_element_responses",
     "get_sensitivity_responses",
+    "get_monitored_responses",
+    "merge_odbs",
 ]
@@ -1,3 +1,4 @@
+import time
 from collections import defaultdict
 import numpy as np
 import openseespy.opensees as ops
@@ -25,6 +26,42 @@ SOLID_CELL_TYPE_VTK = {4: 10, 8: 12, 10: 24, 20: 25, 24: 33, 27: 29}
 INT_TYPE = np.int32
 FLOAT_TYPE = np.float32
 
+LOCAL_AXIS_NAMES = (("xaxis", "xlocal"), ("yaxis", "ylocal"), ("zaxis", "zlocal"))
+
+
+def _make_ele_types(*groups):
+    """Map each class tag to the first element type whose class tags contain it."""
+    ele_types = dict()
+    for ele_type, class_tags in reversed(groups):
+        ele_types.update(dict.fromkeys(class_tags, ele_type))
+    return ele_types
+
+
+# Element types of the two-node elements and the others, in the order of precedence
+LINE_ELE_TYPES = _make_ele_types(
+    ("truss", OPS_ELE_TAGS.Truss), ("beam", OPS_ELE_TAGS.Beam), ("link", OPS_ELE_TAGS.Link)
+)
+UNSTRU_ELE_TYPES = _make_ele_types(
+    ("plane", OPS_ELE_TAGS.Plane),
+    ("shell", OPS_ELE_TAGS.Shell),
+    ("solid", OPS_ELE_TAGS.Solid),
+    ("joint", OPS_ELE_TAGS.Joint),
+)
+CENTER_ELE_TYPES = ("truss", "beam", "link", "plane", "shell", "solid", "joint")
+ALL_ELE_TYPES = ("line", "contact") + CENTER_ELE_TYPES
+CONTACT_CLASS_TAGS = frozenset(OPS_ELE_TAGS.Contact)
+ZERO_LENGTH_CONTACT_TAGS = frozenset([22, 23, 24, 25, 140])
+
+
+def _non_empty(cells):
+    return cells if len(cells) > 0 else []
+
+
+def _trim_cells(cells):
+    """Drop the padding columns that are not used by any cell."""
+    return cells[:, : int(np.max(cells[:, 0], initial=0)) + 1]
+
+
 class FEMData:
     """
     A class for collecting data in the current domain of OpenSeesPy.
@@ -42,6 +79,7 @@ class FEMData:
         self.ELE_CELLS_TAGS = defaultdict(
             list
         )  # key: EleClassName, value: Element tags
+        self.timings = dict()  # key: stage, value: time in seconds
         # ------------------------------------------------------------------------
         # --------------------------nodal info------------------------------------
         # ------------------------------------------------------------------------
@@ -49,6 +87,7 @@ class FEMData:
         self.unused_node_tags = []  # record unused nodal tags by this pacakge
         self.node_coords = []  # Nodal Coords
         self.node_index = dict()  # Key: nodeTag, value: index in self.node_coords
+        self._node_sorter = None  # the indices that sort self.node_tags
         self.node_ndims, self.node_ndofs = [], []  # Nodal Dims, Nodal dofs
         self.bounds, self.min_bound, self.max_bound = tuple(), 0, 0
         # Fixed node
@@ -241,228 +280,237 @@ class FEMData:
                 self.mp_dofs.append(fixities)
         self.mp_pair_nodes = np.array(self.mp_pair_nodes)
 
-    def _make_truss_info(self, ele_tag):
-        self.truss_tags.append(ele_tag)
-        ele_nodes = ops.eleNodes(ele_tag)
-        node_i, node_j = ele_nodes[:2]
-        idx_i, idx_j = self.node_index[node_i], self.node_index[node_j]
-        # --------------------------------------------------------
-        self.truss_cells.append([2, idx_i, idx_j])
+    def _get_node_index(self, node_tags):
+        """Map the node tags to the row indices of ``self.node_coords``."""
+        if self._node_sorter is None:
+            self._node_sorter = np.argsort(np.asarray(self.node_tags, dtype=int), kind="stable")
+        all_tags = np.asarray(self.node_tags, dtype=int)
+        node_tags = np.asarray(node_tags, dtype=int)
+        return self._node_sorter[np.searchsorted(all_tags, node_tags, sorter=self._node_sorter)]
 
-    @staticmethod
-    def _get_local_axis(ele_tag):
-        xaxis = ops.eleResponse(ele_tag, "xaxis")
-        yaxis = ops.eleResponse(ele_tag, "yaxis")
-        zaxis = ops.eleResponse(ele_tag, "zaxis")
-        if not xaxis:
-            xaxis = ops.eleResponse(ele_tag, "xlocal")
-        if not yaxis:
-            yaxis = ops.eleResponse(ele_tag, "ylocal")
-        if not zaxis:
-            zaxis = ops.eleResponse(ele_tag, "zlocal")
-        if xaxis:
-            xaxis = np.array(xaxis) / np.linalg.norm(xaxis)
-        else:
-            xaxis = np.array([0.0, 0.0, 0.0])
-        if yaxis:
-            yaxis = np.array(yaxis) / np.linalg.norm(yaxis)
-        else:
-            yaxis = np.array([0.0, 0.0, 0.0])
-        if zaxis:
-            zaxis = np.array(zaxis) / np.linalg.norm(zaxis)
+    def _get_cells(self, positions, ele_nodes, num_nodes=None):
+        """Build the cells ``[numNodes, idx1, idx2, ...]`` of the elements at ``positions``,
+        rows are padded by -1 to the element with the most nodes.
+        If ``num_nodes`` is given, only the first ``num_nodes`` nodes of each element are used.
+        """
+        if num_nodes is None:
+            nums = np.array([len(ele_nodes[i]) for i in positions], dtype=int)
         else:
-            zaxis = np.array([0.0, 0.0, 0.0])
-        return xaxis, yaxis, zaxis
-
-    def _make_link_info(self, ele_tag):
-        node_i, node_j = ops.eleNodes(ele_tag)[:2]
-        idx_i, idx_j = self.node_index[node_i], self.node_index[node_j]
-        coordi, coordj = self.node_coords[idx_i], self.node_coords[idx_j]
-        # --------------------------------------------------------
-        self.link_tags.append(ele_tag)
-        self.link_cells.append([2, idx_i, idx_j])
-        self.link_centers.append((coordi + coordj) / 2)
-        self.link_lengths.append(np.linalg.norm(coordj - coordi))
-        xaxis, yaxis, zaxis = self._get_local_axis(ele_tag)
-        self.link_xaxis.append(xaxis)
-        self.link_yaxis.append(yaxis)
-        self.link_zaxis.append(zaxis)
-
-    def _make_beam_info(self, ele_tag):
-        node_i, node_j = ops.eleNodes(ele_tag)[:2]
-        idx_i, idx_j = self.node_index[node_i], self.node_index[node_j]
-        # --------------------------------------------------------
-        self.beam_tags.append(ele_tag)
-        self.beam_cells.append([2, idx_i, idx_j])
-        # --------------------------------------------------------
-        self.beam_centers.append(
-            (self.node_coords[idx_i] + self.node_coords[idx_j]) / 2
-        )
-        self.beam_lengths.append(
-            np.sqrt(np.sum((self.node_coords[idx_i] - self.node_coords[idx_j]) ** 2))
-        )
-        xaxis, yaxis, zaxis = self._get_local_axis(ele_tag)
-        self.beam_xaxis.append(xaxis)
-        self.beam_yaxis.append(yaxis)
-        self.beam_zaxis.append(zaxis)
-
-    def _make_contact_info(self, ele_tag, ele_class_tag):
-        ele_nodes = ops.eleNodes(ele_tag)
-        key = OPS_ELE_CLASSTAG2TYPE[ele_class_tag]
-        self.contact_tags.append(ele_tag)
-        cell = []
-        if ele_class_tag in [22, 23, 24, 25, 140]:  # zero-length element
-            if len(ele_nodes) == 2:
-                pass
-            elif len(ele_nodes) > 2:
-                mid = len(ele_nodes) // 2
-                part1 = ele_nodes[:mid]
-                part2 = ele_nodes[mid:]
-                part2 = part2[::-1]
-                for tag1, tag2 in zip(part1, part2):
-                    cell.extend([2, self.node_index[tag1], self.node_index[tag2]])
-                    self.ELE_CELLS_VTK[key].append([2, self.node_index[tag1], self.node_index[tag2]])
-                    self.ELE_CELLS_TYPE_VTK[key].append(LINE_CELL_TYPE_VTK[2])
-                    self.ELE_CELLS_TAGS[key].append(ele_tag)
-        else:
-            ele_nodes = ops.eleNodes(ele_tag)
-            cNode = ele_nodes[-2]
-            rNodes = ele_nodes[:-2]
-            # record the last Lagrange multiplier node that will be not used
-            self.unused_node_tags.append(ele_nodes[-1])
-            for rntag in rNodes:
-                cell.extend([2, self.node_index[cNode], self.node_index[rntag]])
-                self.ELE_CELLS_VTK[key].append([2, self.node_index[cNode], self.node_index[rntag]])
-                self.ELE_CELLS_TYPE_VTK[key].append(LINE_CELL_TYPE_VTK[2])
-                self.ELE_CELLS_TAGS[key].append(ele_tag)
-        self.contact_cells.append(cell)
-
-    def _make_all_line_info(self, ele_tag, class_tag):
-        idxs = [self.node_index[tag_] for tag_ in ops.eleNodes(ele_tag)[:2]]
-        key = OPS_ELE_CLASSTAG2TYPE[class_tag]
-        self.ELE_CELLS_VTK[key].append([2] + idxs)
-        self.ELE_CELLS_TYPE_VTK[key].append(LINE_CELL_TYPE_VTK[2])
-        self.ELE_CELLS_TAGS[key].append(ele_tag)
-        self.all_line_tags.append(ele_tag)
-        self.all_line_cells.append([2] + idxs)
-
-    def _make_plane_shell_solid_info(self, ele_type: str, ele_tag, class_tag):
-        ele_nodes = ops.eleNodes(ele_tag)
-        idxs = [self.node_index[tag_] for tag_ in ele_nodes]
-        key = OPS_ELE_CLASSTAG2TYPE[class_tag]
-        if class_tag in OPS_ELE_TAGS.Wall:
-            idxs = [idxs[0], idxs[1], idxs[3], idxs[2]]
-        # ---------------------------------------------------------------------------
-        self.ELE_CELLS_VTK[key].append([len(idxs)] + idxs)
-        self.ELE_CELLS_TAGS[key].append(ele_tag)
-        self.unstru_tags.append(ele_tag)
-        self.unstru_cells.append([len(idxs)] + idxs)
-        if ele_type.lower() == "plane":
-            self.ELE_CELLS_TYPE_VTK[key].append(PLANE_CELL_TYPE_VTK[len(ele_nodes)])
-            self.unstru_cells_type.append(PLANE_CELL_TYPE_VTK[len(ele_nodes)])
-            self.plane_cells.append([len(idxs)] + idxs)
-            self.plane_cells_type.append(PLANE_CELL_TYPE_VTK[len(ele_nodes)])
-        elif ele_type.lower() == "shell":
-            self.ELE_CELLS_TYPE_VTK[key].append(PLANE_CELL_TYPE_VTK[len(ele_nodes)])
-            self.unstru_cells_type.append(PLANE_CELL_TYPE_VTK[len(ele_nodes)])
-            self.shell_cells.append([len(idxs)] + idxs)
-            self.shell_cells_type.append(PLANE_CELL_TYPE_VTK[len(ele_nodes)])
-        else:  # solid
-            self.ELE_CELLS_TYPE_VTK[key].append(SOLID_CELL_TYPE_VTK[len(ele_nodes)])
-            self.unstru_cells_type.append(SOLID_CELL_TYPE_VTK[len(ele_nodes)])
-            self.brick_cells.append([len(idxs)] + idxs)
-            self.brick_cells_type.append(SOLID_CELL_TYPE_VTK[len(ele_nodes)])
-
-    def _make_plane_info(self, ele_tag, class_tag):
-        self.plane_tags.append(ele_tag)
-        self._make_plane_shell_solid_info("plane", ele_tag, class_tag)
-
-    def _make_shell_info(self, ele_tag, class_tag):
-        self.shell_tags.append(ele_tag)
-        self._make_plane_shell_solid_info("shell", ele_tag, class_tag)
-
-    def _make_solid_info(self, ele_tag, class_tag):
-        self.brick_tags.append(ele_tag)
-        self._make_plane_shell_solid_info("solid", ele_tag, class_tag)
-
-    def _make_joint_info(self, ele_tag, class_tag):
-        self.unstru_tags.append(ele_tag)
-        self.joint_tags.append(ele_tag)
-        ele_nodes = ops.eleNodes(ele_tag)
-        idxs = [self.node_index[tag_] for tag_ in ele_nodes]
-        key = OPS_ELE_CLASSTAG2TYPE[class_tag]
-        self.ELE_CELLS_TAGS[key].append(ele_tag)
-        #  both len(idxs) in (4, 5) and len(idxs) == 7
-        self.ELE_CELLS_VTK[key].append([4] + idxs[:4])
-        self.ELE_CELLS_TYPE_VTK[key].append(PLANE_CELL_TYPE_VTK[4])
-        self.unstru_cells.append([4] + idxs[:4])
-        self.unstru_cells_type.append(PLANE_CELL_TYPE_VTK[4])
-        if len(idxs) == 7:  # Joint3D, add a quad
-            self.ELE_CELLS_VTK[key].append([4, idxs[4], idxs[1], idxs[5], idxs[3]])
-            self.ELE_CELLS_TYPE_VTK[key].append(PLANE_CELL_TYPE_VTK[4])
-            self.unstru_cells.append([4, idxs[4], idxs[1], idxs[5], idxs[3]])
-            self.unstru_cells_type.append(PLANE_CELL_TYPE_VTK[4])
-
-    def _make_ele_centers(self, ele_tag, class_tag):
-        # coords
-        ele_nodes = ops.eleNodes(ele_tag)
-        idxs = [self.node_index[tag_] for tag_ in ele_nodes]
-        coords = [self.node_coords[idx] for idx in idxs]
-        self.ele_centers.append(np.mean(coords, axis=0))
-        # ele_class_tags
-        self.ele_class_tags.append(class_tag)
-        self.ele_tags.append(ele_tag)
+            nums = np.full(len(positions), num_nodes, dtype=int)
+        max_num = int(np.max(nums, initial=0))
+        cells = np.full((len(positions), max_num + 1), -1, dtype=int)
+        cells[:, 0] = nums
+        mask = np.arange(max_num) < nums[:, None]
+        flat_tags = [tag for i, num in zip(positions, nums) for tag in ele_nodes[i][:num]]
+        cells[:, 1:][mask] = self._get_node_index(flat_tags)
+        return cells
+
+    def _get_centers(self, cells):
+        """Average the nodal coordinates of the cells, the cells with the same number of nodes are done at once."""
+        centers = np.zeros((len(cells), 3), dtype=self.node_coords.dtype)
+        for num in np.unique(cells[:, 0]):
+            rows = np.nonzero(cells[:, 0] == num)[0]
+            centers[rows] = np.mean(self.node_coords[cells[rows, 1: num + 1]], axis=1)
+        return centers
+
+    @staticmethod
+    def _get_local_axes(ele_tags, class_tags):
+        """Get the normalized local axes of the elements, with shape (3, num_eles, 3).
+
+        The response name, e.g., ``xaxis`` or ``xlocal``, is resolved once for each element class,
+        and zero vectors are returned for the elements without local axes.
+        """
+        axes = np.zeros((3, len(ele_tags), 3))
+        has_axis = np.zeros((3, len(ele_tags)), dtype=bool)
+        resolved = dict()  # key: (class_tag, axis), value: the response name or None
+        for i, (ele_tag, class_tag) in enumerate(zip(ele_tags, class_tags)):
+            for k, names in enumerate(LOCAL_AXIS_NAMES):
+                if (class_tag, k) in resolved:
+                    name = resolved[(class_tag, k)]
+                    axis = ops.eleResponse(ele_tag, name) if name is not None else []
+                else:
+                    name, axis = None, []
+                    for name_ in names:
+                        axis = ops.eleResponse(ele_tag, name_)
+                        if axis:
+                            name = name_
+                            break
+                    resolved[(class_tag, k)] = name
+                if axis:
+                    axes[k, i, : len(axis)] = axis[:3]
+                    has_axis[k, i] = True
+        # the same as np.linalg.norm of each vector
+        norms = np.sqrt(axes[..., None, :] @ axes[..., :, None])[..., 0, 0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            axes = np.where(has_axis[..., None], axes / norms[..., None], 0.0)
+        return axes
+
+    def _get_line_data(self, ele_tags, class_tags, cells):
+        """Get the centers, lengths and local axes of the two-node elements."""
+        coords_i = self.node_coords[cells[:, 1]]
+        coords_j = self.node_coords[cells[:, 2]]
+        centers = (coords_i + coords_j) / 2
+        lengths = np.sqrt(np.sum((coords_i - coords_j) ** 2, axis=1))
+        axes = self._get_local_axes(ele_tags.tolist(), class_tags.tolist())
+        return centers, lengths, axes
 
     def _make_ele_info(self):
-        for ele_tag in ops.getEleTags():
+        """Collect the element information.
+
+        The class tag and nodes of each element are queried once,
+        then the elements are grouped by type, and the cells, centers, lengths and local axes
+        of each group are built with array operations.
+        The time spent in each stage is recorded in ``self.timings``.
+        """
+        start = time.perf_counter()
+        ele_tags = ops.getEleTags()
+        class_tags, ele_nodes = [], []
+        for ele_tag in ele_tags:
             class_tag = ops.getEleClassTags(ele_tag)
             if not isinstance(class_tag, int):
                 class_tag = class_tag[0]
-            num_nodes = len(ops.eleNodes(ele_tag))
-            if num_nodes == 2:
-                self._make_all_line_info(ele_tag, class_tag)
-                if class_tag in OPS_ELE_TAGS.Truss:
-                    self._make_truss_info(ele_tag)
-                    self._make_ele_centers(ele_tag, class_tag)
-                elif class_tag in OPS_ELE_TAGS.Beam:
-                    self._make_beam_info(ele_tag)
-                    self._make_ele_centers(ele_tag, class_tag)
-                elif class_tag in OPS_ELE_TAGS.Link:
-                    self._make_link_info(ele_tag)
-                    self._make_ele_centers(ele_tag, class_tag)
+            class_tags.append(class_tag)
+            ele_nodes.append(ops.eleNodes(ele_tag))
+        self.timings["eleQuery"] = time.perf_counter() - start
+
+        # ----------------------------------------------------------------------
+        start = time.perf_counter()
+        groups = defaultdict(list)  # key: element type, value: positions in ele_tags
+        for i, (class_tag, nodes) in enumerate(zip(class_tags, ele_nodes)):
+            if len(nodes) == 2:
+                groups["line"].append(i)
+                ele_type = LINE_ELE_TYPES.get(class_tag)
             else:
-                if class_tag in OPS_ELE_TAGS.Plane:
-                    self._make_plane_info(ele_tag, class_tag)
-                    self._make_ele_centers(ele_tag, class_tag)
-                elif class_tag in OPS_ELE_TAGS.Shell:
-                    self._make_shell_info(ele_tag, class_tag)
-                    self._make_ele_centers(ele_tag, class_tag)
-                elif class_tag in OPS_ELE_TAGS.Solid:
-                    self._make_solid_info(ele_tag, class_tag)
-                    self._make_ele_centers(ele_tag, class_tag)
-                elif class_tag in OPS_ELE_TAGS.Joint:
-                    self._make_joint_info(ele_tag, class_tag)
-                    self._make_ele_centers(ele_tag, class_tag)
-            if class_tag in OPS_ELE_TAGS.Contact:
-                self._make_contact_info(ele_tag, class_tag)
-
-        # reshape, ensure array alignment, starting with the element with the most nodes
-        def reshape_cells(cells):
-            if len(cells) > 0:
-                nums = [len(cell) for cell in cells]
-                if len(set(nums)) > 1:
-                    max_num = np.max(nums)
-                    cells = [cell + [-1] * (max_num - len(cell)) for cell in cells]
-                else:
-                    cells = cells
+                ele_type = UNSTRU_ELE_TYPES.get(class_tag)
+            if ele_type is not None:
+                groups[ele_type].append(i)
+            if class_tag in CONTACT_CLASS_TAGS:
+                groups["contact"].append(i)
+        groups = {key: np.array(groups[key], dtype=int) for key in ALL_ELE_TYPES}
+        ele_tags = np.array(ele_tags, dtype=int)
+        class_tags = np.array(class_tags, dtype=int)
+        # VTK cells, each item is (positions, order within the element, cells, cell types, is unstructured)
+        vtk_cells = []
+
+        # ----------------------------------------------------------------------
+        positions = groups["line"]
+        cells = self._get_cells(positions, ele_nodes, num_nodes=2)
+        vtk_cells.append((positions, 0, cells, LINE_CELL_TYPE_VTK[2], False))
+        self.all_line_tags, self.all_line_cells = ele_tags[positions].tolist(), _non_empty(cells)
+
+        positions = groups["truss"]
+        cells = self._get_cells(positions, ele_nodes, num_nodes=2)
+        self.truss_tags, self.truss_cells = ele_tags[positions].tolist(), _non_empty(cells)
+
+        positions = groups["beam"]
+        cells = self._get_cells(positions, ele_nodes, num_nodes=2)
+        self.beam_tags, self.beam_cells = ele_tags[positions].tolist(), _non_empty(cells)
+        if len(positions) > 0:
+            self.beam_centers, self.beam_lengths, axes = self._get_line_data(
+                ele_tags[positions], class_tags[positions], cells
+            )
+            self.beam_xaxis, self.beam_yaxis, self.beam_zaxis = axes
+
+        positions = groups["link"]
+        cells = self._get_cells(positions, ele_nodes, num_nodes=2)
+        self.link_tags, self.link_cells = ele_tags[positions].tolist(), _non_empty(cells)
+        if len(positions) > 0:
+            self.link_centers, self.link_lengths, axes = self._get_line_data(
+                ele_tags[positions], class_tags[positions], cells
+            )
+            self.link_xaxis, self.link_yaxis, self.link_zaxis = axes
+
+        # ----------------------------------------------------------------------
+        for ele_type, name, cell_types_vtk in (
+                ("plane", "plane", PLANE_CELL_TYPE_VTK),
+                ("shell", "shell", PLANE_CELL_TYPE_VTK),
+                ("solid", "brick", SOLID_CELL_TYPE_VTK),
+        ):
+            positions = groups[ele_type]
+            cells = self._get_cells(positions, ele_nodes)
+            walls = np.isin(class_tags[positions], OPS_ELE_TAGS.Wall)
+            if np.any(walls):
+                cells[walls, 1:5] = cells[walls][:, [1, 2, 4, 3]]
+            cell_types = np.zeros(len(cells), dtype=int)
+            for num in np.unique(cells[:, 0]):
+                cell_types[cells[:, 0] == num] = cell_types_vtk[num]
+            vtk_cells.append((positions, 0, cells, cell_types, True))
+            setattr(self, f"{name}_tags", ele_tags[positions].tolist())
+            setattr(self, f"{name}_cells", _non_empty(cells))
+            setattr(self, f"{name}_cells_type", cell_types.tolist())
+
+        # both len(idxs) in (4, 5) and len(idxs) == 7 use the first four nodes, Joint3D adds a quad
+        positions = groups["joint"]
+        self.joint_tags = ele_tags[positions].tolist()
+        if len(positions) > 0:
+            cells = self._get_cells(positions, ele_nodes)
+            joint3d = cells[:, 0] == 7
+            cells[:, 0] = 4
+            vtk_cells.append((positions, 0, cells[:, :5], PLANE_CELL_TYPE_VTK[4], True))
+            vtk_cells.append(
+                (positions[joint3d], 1, cells[joint3d][:, [0, 5, 2, 6, 4]], PLANE_CELL_TYPE_VTK[4], True)
+            )
+
+        # the lines of the contact elements
+        self.contact_tags, self.contact_cells = [], []
+        for i in groups["contact"]:
+            nodes = ele_nodes[i]
+            if class_tags[i] in ZERO_LENGTH_CONTACT_TAGS:
+                mid = len(nodes) // 2
+                pairs = list(zip(nodes[:mid], nodes[mid:][::-1])) if len(nodes) > 2 else []
             else:
-                cells = cells
-            return cells
+                pairs = [(nodes[-2], tag) for tag in nodes[:-2]]
+                # record the last Lagrange multiplier node that will be not used
+                self.unused_node_tags.append(nodes[-1])
+            cells = self._get_cells(np.arange(len(pairs)), pairs)
+            vtk_cells.append((np.full(len(pairs), i), np.arange(1, len(pairs) + 1), cells, LINE_CELL_TYPE_VTK[2], False))
+            self.contact_tags.append(int(ele_tags[i]))
+            self.contact_cells.append(cells.ravel().tolist())
+        self.timings["eleGroups"] = time.perf_counter() - start
 
-        self.plane_cells = reshape_cells(self.plane_cells)
-        self.shell_cells = reshape_cells(self.shell_cells)
-        self.brick_cells = reshape_cells(self.brick_cells)
-        self.unstru_cells = reshape_cells(self.unstru_cells)
+        # ----------------------------------------------------------------------
+        start = time.perf_counter()
+        self._make_vtk_cells(vtk_cells, ele_tags, class_tags)
+        positions = np.sort(np.concatenate([groups[key] for key in CENTER_ELE_TYPES]))
+        self.ele_tags = ele_tags[positions].tolist()
+        self.ele_class_tags = class_tags[positions].tolist()
+        if len(positions) > 0:
+            self.ele_centers = self._get_centers(self._get_cells(positions, ele_nodes))
+        self.timings["eleCells"] = time.perf_counter() - start
+
+    def _make_vtk_cells(self, vtk_cells, ele_tags, class_tags):
+        """Merge the VTK cells in the element order, and split them by the element class names."""
+        vtk_cells = [item for item in vtk_cells if len(item[0]) > 0]
+        if len(vtk_cells) == 0:
+            return
+        positions = np.concatenate([item[0] for item in vtk_cells])
+        orders = np.concatenate([np.broadcast_to(item[1], len(item[0])) for item in vtk_cells])
+        cell_types = np.concatenate([np.broadcast_to(item[3], len(item[0])) for item in vtk_cells])
+        unstru = np.concatenate([np.full(len(item[0]), item[4]) for item in vtk_cells])
+        cells = np.full((len(positions), max(item[2].shape[1] for item in vtk_cells)), -1, dtype=int)
+        start = 0
+        for item in vtk_cells:
+            cells[start: start + len(item[0]), : item[2].shape[1]] = item[2]
+            start += len(item[0])
+        idx = np.lexsort((orders, positions))
+        positions, orders, cell_types, unstru, cells = (
+            positions[idx], orders[idx], cell_types[idx], unstru[idx], cells[idx]
+        )
+        # ----------------------------------------------------------------------
+        self.unstru_tags = ele_tags[positions[unstru & (orders == 0)]].tolist()
+        self.unstru_cells = _non_empty(_trim_cells(cells[unstru]))
+        self.unstru_cells_type = cell_types[unstru].tolist()
+        # ----------------------------------------------------------------------
+        row_class_tags = class_tags[positions]
+        _, first = np.unique(row_class_tags, return_index=True)
+        class_names = defaultdict(list)  # key: class name, value: class tags, in order of appearance
+        for class_tag in row_class_tags[np.sort(first)]:
+            class_names[OPS_ELE_CLASSTAG2TYPE[class_tag]].append(class_tag)
+        for name, tags in class_names.items():
+            rows = np.isin(row_class_tags, tags)
+            self.ELE_CELLS_VTK[name] = _trim_cells(cells[rows])
+            self.ELE_CELLS_TYPE_VTK[name] = cell_types[rows].tolist()
+            self.ELE_CELLS_TAGS[name] = ele_tags[positions[rows]].tolist()
 
     def _make_model_info(self):
         self._make_nodal_info()
@@ -9,6 +9,7 @@ from ._get_plane_resp import PlaneRespStepData
 from ._get_solid_resp import BrickRespStepData
 from ._get_contact_resp import ContactRespStepData
 from ._get_sensitivity_resp import SensitivityRespStepData
+from ._get_monitor_resp import MonitorRespStepData
 
 __all__ = [
     "ModelInfoStepData",
@@ -21,5 +22,6 @@ __all__ = [
     "PlaneRespStepData",
     "BrickRespStepData",
     "ContactRespStepData",
-    "SensitivityRespStepData"
+    "SensitivityRespStepData",
+    "MonitorRespStepData"
 ]
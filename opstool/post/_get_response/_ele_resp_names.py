@@ -0,0 +1,94 @@
+import openseespy.opensees as ops
+
+
+class EleRespNameCache:
+    """Resolve the ``eleResponse`` arguments of a response quantity once for each element class.
+
+    Different element classes accept different names for the same quantity,
+    e.g., ``basicDeformation``, ``chordRotation`` or ``deformations``.
+    The aliases are probed for the first element of each class,
+    and the working arguments are remembered,
+    so that later calls issue exactly one ``eleResponse`` per quantity.
+
+    It also stores the extraction plans of elements, e.g., the ``eleResponse`` arguments of
+    each integration point and fiber layer, which are discovered once by probing.
+
+    The cache is only valid for one model state,
+    :meth:`clear` must be called when the elements of the model change.
+    """
+
+    def __init__(self):
+        self.class_tags = dict()  # key: ele_tag, value: class tag
+        self.resolved = dict()  # key: (class_tag, aliases), value: args or None
+        self.plans = dict()  # key: (kind, ele_tag), value: plan
+
+    def clear(self):
+        self.class_tags.clear()
+        self.resolved.clear()
+        self.plans.clear()
+
+    def get_class_tag(self, ele_tag: int):
+        class_tag = self.class_tags.get(ele_tag)
+        if class_tag is None:
+            class_tag = ops.getEleClassTags(ele_tag)[0]
+            self.class_tags[ele_tag] = class_tag
+        return class_tag
+
+    def get_response(self, ele_tag: int, aliases: tuple):
+        """Get the response of an element by the first alias that works for its class.
+
+        Parameters
+        -----------
+        ele_tag: int
+            The element tag.
+        aliases: tuple
+            The aliases of the response, each is a str or a tuple of str,
+            i.e., the arguments of ``eleResponse`` after the element tag.
+
+        Returns
+        --------
+        list, empty if no alias works.
+        """
+        key = (self.get_class_tag(ele_tag), aliases)
+        if key in self.resolved:
+            if self.resolved[key] is None:
+                return []
+            return ops.eleResponse(ele_tag, *self.resolved[key])
+        for args in aliases:
+            args = (args,) if isinstance(args, str) else tuple(args)
+            resp = ops.eleResponse(ele_tag, *args)
+            if len(resp) > 0:
+                self.resolved[key] = args
+                return resp
+        self.resolved[key] = None
+        return []
+
+    def get_plan(self, ele_tag: int, kind: str, builder):
+        """Get the extraction plan of an element, ``builder(ele_tag)`` is only called the first time.
+
+        Parameters
+        -----------
+        ele_tag: int
+            The element tag.
+        kind: str
+            The kind of the plan, e.g., ``"gauss"`` or ``"shell"``.
+        builder: Callable
+            The function that probes the element and returns the plan.
+        """
+        key = (kind, ele_tag)
+        plan = self.plans.get(key)
+        if plan is None:
+            plan = builder(ele_tag)
+            self.plans[key] = plan
+        return plan
+
+
+def _probe_args(ele_tag: int, aliases):
+    """Return the first arguments in ``aliases`` that give a non-empty ``eleResponse``, or None."""
+    for args in aliases:
+        if len(ops.eleResponse(ele_tag, *args)) > 0:
+            return args
+    return None
+
+
+ELE_RESP_NAMES = EleRespNameCache()
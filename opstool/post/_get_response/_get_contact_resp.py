@@ -2,13 +2,14 @@ import openseespy.opensees as ops
 import xarray as xr
 import numpy as np
 
-from ._response_base import ResponseBase
+from ._response_base import ResponseBase, StepBuffer, _select_resp, _scale_resp
+from ._ele_resp_names import ELE_RESP_NAMES
 from ...utils import suppress_ops_print
 
 
 class ContactRespStepData(ResponseBase):
 
-    def __init__(self, ele_tags=None, model_update: bool = False, dtype: dict = None):
+    def __init__(self, ele_tags=None, model_update: bool = False, dtype: dict = None, max_steps: int = None):
         self.resp_names = [
             "globalForces", "localForces", "localDisp", "slips"
         ]
@@ -23,6 +24,7 @@ class ContactRespStepData(ResponseBase):
         self.dtype = dict(int=np.int32, float=np.float32)
         if isinstance(dtype, dict):
             self.dtype.update(dtype)
+        self.max_steps = max_steps
 
         self.attrs = {
             "Px": "Global force in the x-direction on the constrained node",
@@ -39,10 +41,11 @@ class ContactRespStepData(ResponseBase):
         self.resp_steps = None
         self.resp_steps_list = []
         for name in self.resp_names:
-            self.resp_steps_dict[name] = []
+            self.resp_steps_dict[name] = StepBuffer(self.max_steps)
         self.add_data_one_step(self.ele_tags)
         self.step_track = 0
-        self.times = [0.0]
+        self.times = StepBuffer(self.max_steps)
+        self.times.append(0.0)
 
     def reset(self):
         self.initialize()
@@ -86,7 +89,7 @@ class ContactRespStepData(ResponseBase):
     def _to_xarray(self):
         if self.model_update:
             self.resp_steps = xr.concat(self.resp_steps_list, dim="time", join="outer")
-            self.resp_steps.coords["time"] = self.times
+            self.resp_steps.coords["time"] = self.times.view()
         else:
             data_vars = dict()
             data_vars["globalForces"] = (["time", "eleTags", "globalDOFs"], self.resp_steps_dict["globalForces"])
@@ -96,7 +99,7 @@ class ContactRespStepData(ResponseBase):
             self.resp_steps = xr.Dataset(
                 data_vars=data_vars,
                 coords={
-                    "time": self.times,
+                    "time": self.times.view(),
                     "eleTags": self.ele_tags,
                     "globalDOFs": ["Px", "Py", "Pz"],
                     "localDOFs": ["N", "Tx", "Ty"],
@@ -128,30 +131,24 @@ class ContactRespStepData(ResponseBase):
         force_factor = unit_factors["force"]
         disp_factor = unit_factors["disp"]
 
-        resp_steps["globalForces"] *= force_factor
-        resp_steps["localForces"] *= force_factor
-        resp_steps["localDisp"] *= disp_factor
-        resp_steps["slips"] *= disp_factor
+        resp_steps = _scale_resp(resp_steps, "globalForces", force_factor)
+        resp_steps = _scale_resp(resp_steps, "localForces", force_factor)
+        resp_steps = _scale_resp(resp_steps, "localDisp", disp_factor)
+        resp_steps = _scale_resp(resp_steps, "slips", disp_factor)
 
         return resp_steps
 
     @staticmethod
-    def read_response(dt: xr.DataTree, resp_type: str = None, ele_tags=None, unit_factors: dict = None):
-        ds = ContactRespStepData.read_file(dt, unit_factors=unit_factors)
+    def read_response(
+            dt: xr.DataTree, resp_type: str = None, ele_tags=None, unit_factors: dict = None, time_range=None
+    ):
+        ds = dt["/ContactResponses"].to_dataset()
+        ds = _select_resp(ds, resp_type=resp_type, tag_dim="eleTags", tags=ele_tags, time_range=time_range)
+        if unit_factors is not None:
+            ds = ContactRespStepData._unit_transform(ds, unit_factors)
         if resp_type is None:
-            if ele_tags is None:
-                return ds
-            else:
-                return ds.sel(eleTags=ele_tags)
-        else:
-            if resp_type not in list(ds.keys()):
-                raise ValueError(
-                    f"resp_type {resp_type} not found in {list(ds.keys())}"
-                )
-            if ele_tags is not None:
-                return ds[resp_type].sel(eleTags=ele_tags)
-            else:
-                return ds[resp_type]
+            return ds
+        return ds[resp_type]
 
 
 def _get_contact_resp(link_tags, dtype):
@@ -182,11 +179,7 @@ def _get_contact_resp(link_tags, dtype):
 
 def _get_contact_resp_by_type(etag, etypes, type_="local"):
     etag = int(etag)
-    resp = []
-    for name in etypes:
-        resp = ops.eleResponse(etag, name)
-        if len(resp) > 0:
-            break
+    resp = ELE_RESP_NAMES.get_response(etag, etypes)
     if type_ == "local":
         if len(resp) == 0:
             resp = [0.0] * 3
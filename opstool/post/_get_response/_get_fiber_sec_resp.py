@@ -5,7 +5,7 @@ import openseespy.opensees as ops
 from typing import Union
 
 
-from ._response_base import ResponseBase, _expand_to_uniform_array
+from ._response_base import ResponseBase, StepBuffer, _select_resp, _scale_resp, _expand_to_uniform_array
 
 
 class FiberSecData:
@@ -36,7 +36,7 @@ def _set_fiber_sec_data(fiber_ele_tags: Union[str, list, tuple] = None):
 
 
 class FiberSecRespStepData(ResponseBase):
-    def __init__(self, fiber_ele_tags: Union[str, list, tuple] = None, dtype: dict = None):
+    def __init__(self, fiber_ele_tags: Union[str, list, tuple] = None, dtype: dict = None, max_steps: int = None):
         _set_fiber_sec_data(fiber_ele_tags)
         self.ELE_SEC_KEYS = FiberSecData.get_ele_sec_keys()
 
@@ -49,26 +49,32 @@ class FiberSecRespStepData(ResponseBase):
         self.dtype = dict(int=np.int32, float=np.float32)
         if isinstance(dtype, dict):
             self.dtype.update(dtype)
+        self.max_steps = max_steps
 
         self.secPoints = None
         self.fiberPoints = None
         self.DOFs = ["P", "Mz", "My", "T"]
+        # The fiber geometry does not change during the analysis, captured once in initialize.
+        self.fiber_geo = dict()
+        self.num_fibers = None
 
         self.initialize()
 
     def initialize(self):
         self.resp_steps = None
+        self._get_fiber_geo_data()
         for name in self.resp_names:
-            self.resp_steps_dict[name] = []
+            self.resp_steps_dict[name] = StepBuffer(self.max_steps)
         self.add_data_one_step()
         self.step_track = 0
-        self.times = [0.0]
+        self.times = StepBuffer(self.max_steps)
+        self.times.append(0.0)
 
     def reset(self):
         self.initialize()
 
     def add_data_one_step(self):
-        stress, strain, defo, force = _get_fiber_sec_resp(self.ELE_SEC_KEYS, dtype=self.dtype)
+        stress, strain, defo, force = _get_fiber_sec_resp(self.ELE_SEC_KEYS, self.num_fibers, dtype=self.dtype)
         self.resp_steps_dict["Stresses"].append(stress)
         self.resp_steps_dict["Strains"].append(strain)
         self.resp_steps_dict["secForce"].append(force)
@@ -83,7 +89,8 @@ class FiberSecRespStepData(ResponseBase):
 
     def _get_fiber_geo_data(self):
         all_ys, all_zs, all_mats, all_areas = [], [], [], []
-        for ele_tag, sec_num in self.ELE_SEC_KEYS.items():
+        num_fibers = np.zeros((len(self.ELE_SEC_KEYS), max(self.ELE_SEC_KEYS.values(), default=0)), dtype=int)
+        for k, (ele_tag, sec_num) in enumerate(self.ELE_SEC_KEYS.items()):
             ele_tag = int(ele_tag)
             sec_num = int(sec_num)
             ys, zs, areas, mats = [], [], [], []
@@ -93,19 +100,15 @@ class FiberSecRespStepData(ResponseBase):
                 zs.append(fiber_data[:, 1])
                 areas.append(fiber_data[:, 2])
                 mats.append(fiber_data[:, 3])
+                num_fibers[k, i] = len(fiber_data)
             all_ys.append(_expand_to_uniform_array(ys))
             all_zs.append(_expand_to_uniform_array(zs))
             all_areas.append(_expand_to_uniform_array(areas))
             all_mats.append(_expand_to_uniform_array(mats))
-        all_ys = _expand_to_uniform_array(all_ys)
-        all_zs = _expand_to_uniform_array(all_zs)
-        all_areas = _expand_to_uniform_array(all_areas)
-        all_mats = _expand_to_uniform_array(all_mats)
-
-        self.resp_steps["ys"] = (("eleTags", "secPoints", "fiberPoints"), all_ys)
-        self.resp_steps["zs"] = (("eleTags", "secPoints", "fiberPoints"), all_zs)
-        self.resp_steps["areas"] = (("eleTags", "secPoints", "fiberPoints"), all_areas)
-        self.resp_steps["matTags"] = (("eleTags", "secPoints", "fiberPoints"), all_mats)
+        self.num_fibers = num_fibers
+        self.fiber_geo = dict()
+        for name, data in zip(["ys", "zs", "areas", "matTags"], [all_ys, all_zs, all_areas, all_mats]):
+            self.fiber_geo[name] = _expand_to_uniform_array(data) if len(data) > 0 else np.zeros((0, 0, 0))
 
     def _to_xarray(self):
         # self.resp_steps = xr.concat(self.resp_steps, dim="time", join="outer")
@@ -117,7 +120,7 @@ class FiberSecRespStepData(ResponseBase):
         self.resp_steps = xr.Dataset(
             data_vars=data_vars,
             coords={
-                "time": self.times,
+                "time": self.times.view(),
                 "eleTags": list(self.ELE_SEC_KEYS.keys()),
                 "secPoints": self.secPoints,
                 "fiberPoints": self.fiberPoints,
@@ -126,7 +129,8 @@ class FiberSecRespStepData(ResponseBase):
         )
 
         # add geo data
-        self._get_fiber_geo_data()
+        for name, data in self.fiber_geo.items():
+            self.resp_steps[name] = (("eleTags", "secPoints", "fiberPoints"), data)
 
     def get_data(self):
         return self.resp_steps
@@ -155,71 +159,63 @@ class FiberSecRespStepData(ResponseBase):
         stress_factor = unit_factors["stress"]
 
         # ---------------------------------------------------------
-        resp_steps["Stresses"] *= stress_factor
+        resp_steps = _scale_resp(resp_steps, "Stresses", stress_factor)
         # ---------------------------------------------------------
-        resp_steps["secForce"].loc[{"DOFs": ["P"]}] *= force_factor
-        resp_steps["secForce"].loc[{"DOFs": ["Mz", "My", "T"]}] *= moment_factor
-        resp_steps["secDefo"].loc[{"DOFs": ["Mz", "My", "T"]}] *= curvature_factor
+        resp_steps = _scale_resp(resp_steps, "secForce", force_factor, "DOFs", ["P"])
+        resp_steps = _scale_resp(resp_steps, "secForce", moment_factor, "DOFs", ["Mz", "My", "T"])
+        resp_steps = _scale_resp(resp_steps, "secDefo", curvature_factor, "DOFs", ["Mz", "My", "T"])
         # --------------------------------------------------------
-        resp_steps["ys"] *= disp_factor
-        resp_steps["zs"] *= disp_factor
-        resp_steps["areas"] *= disp_factor ** 2
+        resp_steps = _scale_resp(resp_steps, "ys", disp_factor)
+        resp_steps = _scale_resp(resp_steps, "zs", disp_factor)
+        resp_steps = _scale_resp(resp_steps, "areas", disp_factor ** 2)
 
         return resp_steps
 
     @staticmethod
-    def read_response(dt: xr.DataTree, resp_type: str = None, ele_tags=None, unit_factors: dict = None):
-        ds = FiberSecRespStepData.read_file(dt, unit_factors=unit_factors)
+    def read_response(
+            dt: xr.DataTree, resp_type: str = None, ele_tags=None, unit_factors: dict = None, time_range=None
+    ):
+        ds = dt["/FiberSectionResponses"].to_dataset()
+        ds = _select_resp(ds, resp_type=resp_type, tag_dim="eleTags", tags=ele_tags, time_range=time_range)
+        if unit_factors is not None:
+            ds = FiberSecRespStepData._unit_transform(ds, unit_factors)
         if resp_type is None:
-            if ele_tags is None:
-                return ds
-            else:
-                return ds.sel(eleTags=ele_tags)
-        else:
-            if resp_type not in list(ds.keys()):
-                raise ValueError(
-                    f"resp_type {resp_type} not found in {list(ds.keys())}"
-                )
-            if ele_tags is not None:
-                return ds[resp_type].sel(eleTags=ele_tags)
-            else:
-                return ds[resp_type]
+            return ds
+        return ds[resp_type]
 
 
-def _get_fiber_sec_resp(ele_secs: dict, dtype: dict):
+def _get_fiber_sec_resp(ele_secs: dict, num_fibers: np.ndarray, dtype: dict):
     """Get the fiber section responses one step.
 
     Parameters
     -----------
-    ele_secs: Union[list, tuple]
-        [(ele_tag1, sec_tag1), (ele_tag1, sec_tag2), …, (ele_tag2, sec_tag1), …]
+    ele_secs: dict
+        key: ele_tag, value: the number of sections.
+    num_fibers: np.ndarray
+        The number of fibers of each section, shape (num_eles, max_num_secs),
+        which is used to fill the stresses and strains without checking the geometry again.
     """
-    all_stress = []
-    all_strains = []
-    for ele_tag, sec_num in ele_secs.items():
-        ele_tag = int(ele_tag)
-        sec_num = int(sec_num)
-        stress, strain, defo, force = [], [], [], []
-        for i in range(sec_num):
-            fiber_data = _get_fiber_sec_data(ele_tag, i+1, dtype=dtype)
-            stress.append(fiber_data[:, -2])
-            strain.append(fiber_data[:, -1])
-        all_stress.append(_expand_to_uniform_array(stress))
-        all_strains.append(_expand_to_uniform_array(strain))
-    all_stress = _expand_to_uniform_array(all_stress, dtype=dtype["float"])
-    all_strains = _expand_to_uniform_array(all_strains, dtype=dtype["float"])
-
-    # -----------------------------------------------------------------------
-    all_defo = []
-    all_force = []
-    for ele_tag, sec_num in ele_secs.items():
+    num_eles, max_num_secs = num_fibers.shape
+    max_num_fibers = int(num_fibers.max(initial=0))
+    all_stress = np.full((num_eles, max_num_secs, max_num_fibers), np.nan)
+    all_strains = np.full((num_eles, max_num_secs, max_num_fibers), np.nan)
+    all_defo = np.full((num_eles, max_num_secs, 4), np.nan)
+    all_force = np.full((num_eles, max_num_secs, 4), np.nan)
+    for k, (ele_tag, sec_num) in enumerate(ele_secs.items()):
         ele_tag = int(ele_tag)
-        sec_num = int(sec_num)
-        defo, force = [], []
-        for i in range(sec_num):
-            defo_forces = ops.eleResponse(
-                ele_tag, "section", f"{i+1}", "forceAndDeformation"
-            )
+        for i in range(int(sec_num)):
+            n = num_fibers[k, i]
+            fiber_data = ops.eleResponse(ele_tag, "section", f"{i + 1}", "fiberData2")
+            if len(fiber_data) == 0:
+                fiber_data = ops.eleResponse(ele_tag, "section", "fiberData2")
+            # From column 1 to 6: "yCoord", "zCoord", "area", 'mat', "stress", "strain"
+            fiber_data = np.reshape(fiber_data, (-1, 6))
+            # the fibers not returned in this step are left NaN
+            m = min(n, len(fiber_data))
+            all_stress[k, i, :m] = fiber_data[:m, 4]
+            all_strains[k, i, :m] = fiber_data[:m, 5]
+
+            defo_forces = ops.eleResponse(ele_tag, "section", f"{i + 1}", "forceAndDeformation")
             if len(defo_forces) == 4:
                 defo_forces = [
                     defo_forces[0],  # epsilon
@@ -233,15 +229,17 @@ def _get_fiber_sec_resp(ele_secs: dict, dtype: dict):
                 ]
             elif len(defo_forces) == 0:
                 defo_forces = [0.0] * 8
-            defo.append(defo_forces[:4])
-            force.append(defo_forces[4:])
-        all_defo.append(np.array(defo))
-        all_force.append(np.array(force))
-    all_defo = _expand_to_uniform_array(all_defo, dtype=dtype["float"])
-    all_force = _expand_to_uniform_array(all_force, dtype=dtype["float"])
+            defo, force = defo_forces[:4], defo_forces[4:]
+            all_defo[k, i, :len(defo)] = defo
+            all_force[k, i, :len(force)] = force
+    all_stress = all_stress.astype(dtype["float"])
+    all_strains = all_strains.astype(dtype["float"])
+    all_defo = all_defo.astype(dtype["float"])
+    all_force = all_force.astype(dtype["float"])
 
     return all_stress, all_strains, all_defo, all_force
 
+
 def _get_fiber_sec_data(ele_tag: int, sec_num: int = 1, dtype: dict = None):
     """Get the fiber sec data for a beam element.
 
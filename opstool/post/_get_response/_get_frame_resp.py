@@ -2,7 +2,8 @@ import numpy as np
 import openseespy.opensees as ops
 import xarray as xr
 
-from ._response_base import ResponseBase, _expand_to_uniform_array
+from ._response_base import ResponseBase, StepBuffer, _select_resp, _scale_resp
+from ._ele_resp_names import ELE_RESP_NAMES
 
 ELASTIC_BEAM_CLASSES = [3, 5, 5001, 145, 146, 63, 631]
 
@@ -14,7 +15,8 @@ class FrameRespStepData(ResponseBase):
                  ele_load_data=None,
                  elastic_frame_sec_points: int = 7,
                  model_update: bool = False,
-                 dtype: dict = None
+                 dtype: dict = None,
+                 max_steps: int = None
                  ):
         self.resp_names = [
             "localForces",
@@ -38,12 +40,14 @@ class FrameRespStepData(ResponseBase):
         self.dtype = dict(int=np.int32, float=np.float32)
         if isinstance(dtype, dict):
             self.dtype.update(dtype)
+        self.max_steps = max_steps
 
         self.localDofs = ["FX1", "FY1", "FZ1", "MX1", "MY1", "MZ1", "FX2", "FY2", "FZ2", "MX2", "MY2", "MZ2"]
         self.basicDofs = ["N", "MZ1", "MZ2", "MY1", "MY2", "T"]
         self.secDofs = ["N", "MZ", "VY", "MY", "VZ", "T"]
         self.secPoints = None
         self.sec_loc_dofs = None
+        self.sec_plan = None
         self.attrs = {
             "localDofs": "local coord system dofs at end 1 and end 2",
             "basicDofs": "basic coord system dofs at end 1 and end 2",
@@ -63,12 +67,14 @@ class FrameRespStepData(ResponseBase):
         self.resp_steps = None
         self.resp_steps_list = []
         for name in self.resp_names:
-            self.resp_steps_dict[name] = []
+            self.resp_steps_dict[name] = StepBuffer(self.max_steps)
         self.secPoints = None
         self.sec_loc_dofs = None
+        self.sec_plan = None
 
         self.add_data_one_step(self.ele_tags, self.ele_load_data)
-        self.times = [0.0]
+        self.times = StepBuffer(self.max_steps)
+        self.times.append(0.0)
         self.step_track = 0
 
     def reset(self):
@@ -91,8 +97,10 @@ class FrameRespStepData(ResponseBase):
         plastic_defos = _get_beam_basic_resp(
             ele_tags, ("plasticRotation", "plasticDeformation"), dtype=self.dtype
         )
+        if self.sec_plan is None or not self.sec_plan.matches(ele_tags, ele_load_data):
+            self.sec_plan = BeamSecPlan(ele_tags, ele_load_data)
         sec_f, sec_d, sec_locs = _get_beam_sec_resp(
-            ele_tags, ele_load_data, local_forces, self.elastic_frame_sec_points, dtype=self.dtype
+            self.sec_plan, local_forces, self.elastic_frame_sec_points, dtype=self.dtype
         )
         if self.sec_loc_dofs is None:
             if sec_locs.shape[-1] == 2:
@@ -139,7 +147,7 @@ class FrameRespStepData(ResponseBase):
     def _to_xarray(self):
         if self.model_update:
             self.resp_steps = xr.concat(self.resp_steps_list, dim="time", join="outer")
-            self.resp_steps.coords["time"] = self.times
+            self.resp_steps.coords["time"] = self.times.view()
         else:
             data_vars = dict()
             data_vars["localForces"] = (["time", "eleTags", "localDofs"], self.resp_steps_dict["localForces"])
@@ -162,7 +170,7 @@ class FrameRespStepData(ResponseBase):
             self.resp_steps = xr.Dataset(
                 data_vars=data_vars,
                 coords={
-                    "time": self.times,
+                    "time": self.times.view(),
                     "eleTags": self.ele_tags,
                     "localDofs": self.localDofs,
                     "basicDofs": self.basicDofs,
@@ -199,78 +207,46 @@ class FrameRespStepData(ResponseBase):
         disp_factor = unit_factors["disp"]
 
         # ---------------------------------------------------------
-        resp_steps["localForces"].loc[
-            {"localDofs": ["FX1", "FY1", "FZ1", "FX2", "FY2", "FZ2"]}
-        ] *= force_factor
-        resp_steps["localForces"].loc[
-            {"localDofs": ["MX1", "MY1", "MZ1", "MX2", "MY2", "MZ2"]}
-        ] *= moment_factor
+        resp_steps = _scale_resp(
+            resp_steps, "localForces", force_factor, "localDofs", ["FX1", "FY1", "FZ1", "FX2", "FY2", "FZ2"]
+        )
+        resp_steps = _scale_resp(
+            resp_steps, "localForces", moment_factor, "localDofs", ["MX1", "MY1", "MZ1", "MX2", "MY2", "MZ2"]
+        )
         # ---------------------------------------------------------
-        resp_steps["basicForces"].loc[
-            {"basicDofs": ["N"]}
-        ] *= force_factor
-        resp_steps["basicForces"].loc[
-            {"basicDofs": ["MZ1", "MZ2", "MY1", "MY2", "T"]}
-        ] *= moment_factor
-        resp_steps["basicDeformations"].loc[
-            {"basicDofs": ["N"]}
-        ] *= disp_factor
-        resp_steps["plasticDeformation"].loc[
-            {"basicDofs": ["N"]}
-        ] *= disp_factor
+        resp_steps = _scale_resp(resp_steps, "basicForces", force_factor, "basicDofs", ["N"])
+        resp_steps = _scale_resp(
+            resp_steps, "basicForces", moment_factor, "basicDofs", ["MZ1", "MZ2", "MY1", "MY2", "T"]
+        )
+        resp_steps = _scale_resp(resp_steps, "basicDeformations", disp_factor, "basicDofs", ["N"])
+        resp_steps = _scale_resp(resp_steps, "plasticDeformation", disp_factor, "basicDofs", ["N"])
         # ---------------------------------------------------------
-        resp_steps["sectionForces"].loc[
-            {"secDofs": ["N", "VY", "VZ"]}
-        ] *= force_factor
-        resp_steps["sectionForces"].loc[
-            {"secDofs": ["MZ", "MY", "T"]}
-        ] *= moment_factor
-        resp_steps["sectionDeformations"].loc[
-            {"secDofs": ["MZ", "MY", "T"]}
-        ] *= curvature_factor
+        resp_steps = _scale_resp(resp_steps, "sectionForces", force_factor, "secDofs", ["N", "VY", "VZ"])
+        resp_steps = _scale_resp(resp_steps, "sectionForces", moment_factor, "secDofs", ["MZ", "MY", "T"])
+        resp_steps = _scale_resp(resp_steps, "sectionDeformations", curvature_factor, "secDofs", ["MZ", "MY", "T"])
         # --------------------------------------------------------
-        resp_steps["sectionLocs"].loc[
-            {"locs": ["X"]}
-        ] *= disp_factor
-        if "Y" in resp_steps["sectionLocs"].coords["locs"]:
-            resp_steps["sectionLocs"].loc[
-                {"locs": ["Y"]}
-            ] *= disp_factor
-        if "Z" in resp_steps["sectionLocs"].coords["locs"]:
-            resp_steps["sectionLocs"].loc[
-                {"locs": ["Z"]}
-            ] *= disp_factor
+        resp_steps = _scale_resp(resp_steps, "sectionLocs", disp_factor, "locs", ["X", "Y", "Z"])
 
         return resp_steps
 
     @staticmethod
-    def read_response(dt: xr.DataTree, resp_type: str = None, ele_tags=None, unit_factors: dict = None):
-        ds = FrameRespStepData.read_file(dt, unit_factors=unit_factors)
+    def read_response(
+            dt: xr.DataTree, resp_type: str = None, ele_tags=None, unit_factors: dict = None, time_range=None
+    ):
+        ds = dt["/FrameResponses"].to_dataset()
+        ds = _select_resp(ds, resp_type=resp_type, tag_dim="eleTags", tags=ele_tags, time_range=time_range)
+        if unit_factors is not None:
+            ds = FrameRespStepData._unit_transform(ds, unit_factors)
         if resp_type is None:
-            if ele_tags is None:
-                return ds
-            else:
-                return ds.sel(eleTags=ele_tags)
-        else:
-            if resp_type not in list(ds.keys()):
-                raise ValueError(
-                    f"resp_type {resp_type} not found in {list(ds.keys())}"
-                )
-            if ele_tags is not None:
-                return ds[resp_type].sel(eleTags=ele_tags)
-            else:
-                return ds[resp_type]
+            return ds
+        return ds[resp_type]
 
 
 def _get_beam_local_force(beam_tags, resp_types, dtype):
     local_forces = []
     for eletag in beam_tags:
         eletag = int(eletag)
-        forces = []
-        for name in resp_types:
-            forces = ops.eleResponse(eletag, name)
-            if len(forces) > 0:
-                break
+        forces = ELE_RESP_NAMES.get_response(eletag, resp_types)
         if len(forces) == 0:
             forces = [0.0] * 12
         elif len(forces) == 6:
@@ -296,11 +272,7 @@ def _get_beam_basic_resp(beam_tags, resp_types, dtype):
     basic_resps = []
     for ele_tag in beam_tags:
         ele_tag = int(ele_tag)
-        resp = []
-        for name in resp_types:
-            resp = ops.eleResponse(ele_tag, name)
-            if len(resp) > 0:
-                break
+        resp = ELE_RESP_NAMES.get_response(ele_tag, resp_types)
         if len(resp) == 0:
             resp = [0.0] * 6
         elif len(resp) == 3:
@@ -316,7 +288,43 @@ def _get_beam_basic_resp(beam_tags, resp_types, dtype):
     return np.array(basic_resps, dtype=dtype["float"])
 
 
-def _get_beam_sec_resp(beam_tags, ele_load_data, local_forces, n_secs_elastic_beam, dtype):
+class BeamSecPlan:
+    """The data of frame elements that do not change between steps,
+    used to rebuild the section responses at each step.
+    It is only rebuilt when the element tags or the element loads change.
+
+    Parameters
+    -----------
+    beam_tags: Union[list, tuple]
+        The frame element tags.
+    ele_load_data: xr.DataArray
+        The element loads, see :meth:`ModelInfoStepData.get_current_frame_load_data`.
+    """
+
+    def __init__(self, beam_tags, ele_load_data):
+        self.beam_tags = np.array(beam_tags, dtype=int)
+        self.ele_load_data = ele_load_data
+        self.lengths, self.start_coords, self.end_coords = _get_ele_length(beam_tags)
+        is_elastic = [ELE_RESP_NAMES.get_class_tag(int(tag)) in ELASTIC_BEAM_CLASSES for tag in self.beam_tags]
+        self.elastic_idx = np.flatnonzero(is_elastic)
+        self.other_idx = np.flatnonzero(np.logical_not(is_elastic))
+        # The loads on the elastic beams, indexed by the position in elastic_idx
+        self.pattern_tags, self.load_pattern_idx, self.load_beam_idx, self.load_data = _parse_ele_load_data(
+            ele_load_data, self.beam_tags[self.elastic_idx]
+        )
+
+    def matches(self, beam_tags, ele_load_data):
+        same_loads = ele_load_data is self.ele_load_data or (
+            len(ele_load_data) == 0 and len(self.ele_load_data) == 0
+        )
+        return same_loads and np.array_equal(self.beam_tags, beam_tags)
+
+    def get_load_factors(self):
+        """The load factors of all patterns with element loads, fetched once per step."""
+        return np.array([ops.getLoadFactor(int(tag)) for tag in self.pattern_tags], dtype=float)
+
+
+def _parse_ele_load_data(ele_load_data, beam_tags):
     pattern_tags, load_eletags = [], []
     if len(ele_load_data) > 0:
         petags = ele_load_data.coords["PatternEleTags"].values
@@ -324,118 +332,121 @@ def _get_beam_sec_resp(beam_tags, ele_load_data, local_forces, n_secs_elastic_be
             num1, num2 = item.split("-")
             pattern_tags.append(int(num1))
             load_eletags.append(int(num2))
-    pattern_tags = np.array(pattern_tags)
-    load_eletags = np.array(load_eletags)
+    pattern_tags = np.array(pattern_tags, dtype=int)
+    beam_index = {tag: i for i, tag in enumerate(beam_tags)}
+    beam_idx = np.array([beam_index.get(tag, -1) for tag in load_eletags], dtype=int)
+    mask = beam_idx >= 0
+    if np.any(mask):
+        load_data = np.asarray(ele_load_data.data, dtype=float)[mask, 2:]
+    else:
+        load_data = np.zeros((0, 8))
+    unique_tags, pattern_idx = np.unique(pattern_tags[mask], return_inverse=True)
+    return unique_tags, pattern_idx, beam_idx[mask], load_data
+
+
+def _get_beam_sec_resp(plan, local_forces, n_secs_elastic_beam, dtype):
+    num_beams = len(plan.beam_tags)
+    # -----------------------------------------------------
+    xlocs = np.linspace(0, 1.0, n_secs_elastic_beam)
+    elastic_sec_f = _get_sec_forces(plan, local_forces[plan.elastic_idx], xlocs)
     # -----------------------------------------------------
-    beam_secF, beam_secD, beam_locs = [], [], []
-    beam_lengths, start_coords, end_coords = _get_ele_length(beam_tags)
-    for eletag, length, local_f in zip(beam_tags, beam_lengths, local_forces):
+    other_locs, other_sec_f, other_sec_d = [], [], []
+    for eletag, length in zip(plan.beam_tags[plan.other_idx], plan.lengths[plan.other_idx]):
         eletag = int(eletag)
-        if ops.getEleClassTags(eletag)[0] in ELASTIC_BEAM_CLASSES:  # elastic beam
-            xlocs = np.linspace(0, 1.0, n_secs_elastic_beam)
-            sec_f = _get_sec_forces(
-                eletag, length, ele_load_data, pattern_tags, load_eletags, local_f, xlocs
-            )
-            sec_d = np.zeros_like(sec_f)
-        else:
-            xlocs = []
-            sec_f, sec_d = [], []
-            locs = ops.sectionLocation(eletag)
-            locs = locs / length
-            for i, loc in enumerate(locs):
-                xlocs.append(loc)
-                forces = ops.sectionForce(eletag, i + 1)
-                if len(forces) == 0:
-                    forces = [0.0] * 6
-                elif len(forces) == 2:  # 2D fiber section
-                    forces = [forces[0], forces[1], 0.0, 0.0, 0.0, 0.0]  # N, Mz
-                elif len(forces) == 3:  # N, Mz, Vy
-                    forces = [forces[0], forces[1], forces[2], 0.0, 0.0, 0.0]
-                elif len(forces) == 4:  # N, Mz, My, T, fiber 3D
-                    forces = [forces[0], forces[1], 0.0, forces[2], 0.0, forces[3]]
-                elif len(forces) == 5:  # maybe SectionAggregator
-                    forces = [forces[0], forces[1], forces[4], forces[2], 0.0, forces[3]]
-                elif len(forces) > 6:  # maybe SectionAggregator
-                    forces = forces[:6]
-                defos = ops.sectionDeformation(eletag, i + 1)
-                if len(defos) == 0:
-                    defos = [0.0] * 6
-                elif len(defos) == 2:
-                    defos = [defos[0], defos[1], 0.0, 0.0, 0.0, 0.0]
-                elif len(defos) == 3:
-                    defos = [defos[0], defos[1], defos[2], 0.0, 0.0, 0.0]
-                elif len(defos) == 4:
-                    defos = [defos[0], defos[1], 0.0, defos[2], 0.0, defos[3]]
-                elif len(defos) == 5:
-                    defos = [defos[0], defos[1], defos[4], defos[2], 0.0, defos[3]]
-                elif len(defos) > 6:
-                    defos = defos[:6]
-                sec_f.append(forces)  # N, Mz, Vy, My, Vz, T
-                sec_d.append(defos)  # N, Mz, Vy, My, Vz, T
-        beam_locs.append(np.array(xlocs))
-        beam_secF.append(np.array(sec_f))
-        beam_secD.append(np.array(sec_d))
-    beam_locs = _expand_to_uniform_array(beam_locs, dtype=dtype["float"])
-    beam_secF = _expand_to_uniform_array(beam_secF, dtype=dtype["float"])
-    beam_secD = _expand_to_uniform_array(beam_secD, dtype=dtype["float"])
-    beam_sec_locs = _get_ele_sec_coords(start_coords, end_coords, beam_locs)
-    return beam_secF, beam_secD, beam_sec_locs.astype(dtype["float"])
-
-
-def _get_sec_forces(ele_tag, length, ele_load_data, pattern_tags, load_eletags, local_force, xlocs):
-    sec_locs = xlocs
-    sec_x = sec_locs * length
-    sec_f = np.full((len(xlocs), 6), 0.0)
+        sec_f, sec_d = [], []
+        locs = ops.sectionLocation(eletag)
+        locs = np.array(locs if locs else [], dtype=float) / length
+        for i in range(len(locs)):
+            forces = ops.sectionForce(eletag, i + 1)
+            if len(forces) == 0:
+                forces = [0.0] * 6
+            elif len(forces) == 2:  # 2D fiber section
+                forces = [forces[0], forces[1], 0.0, 0.0, 0.0, 0.0]  # N, Mz
+            elif len(forces) == 3:  # N, Mz, Vy
+                forces = [forces[0], forces[1], forces[2], 0.0, 0.0, 0.0]
+            elif len(forces) == 4:  # N, Mz, My, T, fiber 3D
+                forces = [forces[0], forces[1], 0.0, forces[2], 0.0, forces[3]]
+            elif len(forces) == 5:  # maybe SectionAggregator
+                forces = [forces[0], forces[1], forces[4], forces[2], 0.0, forces[3]]
+            elif len(forces) > 6:  # maybe SectionAggregator
+                forces = forces[:6]
+            defos = ops.sectionDeformation(eletag, i + 1)
+            if len(defos) == 0:
+                defos = [0.0] * 6
+            elif len(defos) == 2:
+                defos = [defos[0], defos[1], 0.0, 0.0, 0.0, 0.0]
+            elif len(defos) == 3:
+                defos = [defos[0], defos[1], defos[2], 0.0, 0.0, 0.0]
+            elif len(defos) == 4:
+                defos = [defos[0], defos[1], 0.0, defos[2], 0.0, defos[3]]
+            elif len(defos) == 5:
+                defos = [defos[0], defos[1], defos[4], defos[2], 0.0, defos[3]]
+            elif len(defos) > 6:
+                defos = defos[:6]
+            sec_f.append(forces)  # N, Mz, Vy, My, Vz, T
+            sec_d.append(defos)  # N, Mz, Vy, My, Vz, T
+        other_locs.append(locs)
+        other_sec_f.append(sec_f)
+        other_sec_d.append(sec_d)
+    # -----------------------------------------------------
+    num_secs = max([len(locs) for locs in other_locs] + [n_secs_elastic_beam if len(plan.elastic_idx) > 0 else 0])
+    beam_locs = np.full((num_beams, num_secs), np.nan)
+    beam_secF = np.full((num_beams, num_secs, 6), np.nan)
+    beam_secD = np.full((num_beams, num_secs, 6), np.nan)
+    if len(plan.elastic_idx) > 0:
+        beam_locs[plan.elastic_idx, :n_secs_elastic_beam] = xlocs
+        beam_secF[plan.elastic_idx, :n_secs_elastic_beam] = elastic_sec_f
+        beam_secD[plan.elastic_idx, :n_secs_elastic_beam] = 0.0
+    for k, locs, sec_f, sec_d in zip(plan.other_idx, other_locs, other_sec_f, other_sec_d):
+        if len(locs) > 0:
+            beam_locs[k, :len(locs)] = locs
+            beam_secF[k, :len(locs)] = sec_f
+            beam_secD[k, :len(locs)] = sec_d
+    beam_sec_locs = _get_ele_sec_coords(plan.start_coords, plan.end_coords, beam_locs)
+    return beam_secF.astype(dtype["float"]), beam_secD.astype(dtype["float"]), beam_sec_locs.astype(dtype["float"])
+
+
+def _get_sec_forces(plan, local_forces, xlocs):
+    """Section forces of all elastic beams at ``xlocs``, shape (num_elastic_beams, len(xlocs), 6)."""
+    sec_x = xlocs[None, :] * plan.lengths[plan.elastic_idx][:, None]
+    f = [local_forces[:, [i]] for i in range(12)]
+    sec_f = np.zeros(sec_x.shape + (6,))
     # N1, Mz1, Vy1, My1, Vz1, T1
-    sec_f[:, 0] = -local_force[0]
-    sec_f[:, 1] = -local_force[5] + local_force[1] * sec_x
-    sec_f[:, 2] = local_force[1]
-    sec_f[:, 3] = -local_force[4] - local_force[2] * sec_x
-    sec_f[:, 4] = -local_force[2]
-    sec_f[:, 5] = -local_force[3]
-    if ele_tag in load_eletags:
-        idx = np.abs(load_eletags - ele_tag) < 1e-4
-        load_data = ele_load_data[idx, 2:].data
-        ptags = pattern_tags[idx]
-        factors = [ops.getLoadFactor(int(ptag)) for ptag in ptags]
-    else:
-        load_data = [[0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0]]
-        factors = [0.0]
-    for ldata, factor in zip(load_data, factors):
-        wya, wyb, wza, wzb, wxa, wxb, xa, xb = ldata
-        if xb > xa and np.abs(xb - xa - 1) < 1e-2:  # Full uniform load
-            wx, wy, wz = wxa * factor, wya * factor, wza * factor
-            sec_f[:, 0] += -wx * sec_x
-            sec_f[:, 1] += 0.5 * wy * sec_x ** 2
-            sec_f[:, 2] += wy * sec_x
-            sec_f[:, 3] += -0.5 * wz * sec_x * sec_x
-            sec_f[:, 4] += -wz * sec_x
-        elif xb < xa:  # Point Load
-            px, py, pz = wxa * factor, wya * factor, wza * factor
-            xa = xa * length
-            idx = sec_x > xa
-            sec_f[idx, 0] += -px
-            sec_f[idx, 1] += py * (sec_x[idx] - xa)
-            sec_f[idx:, 2] += py
-            sec_f[idx:, 3] += -pz * (sec_x[idx] - xa)
-            sec_f[idx:, 4] += -pz
-        elif xb > xa and np.abs(xb - xa - 1) > 1e-2:  # Partial uniform load
-            wx, wy, wz = wxa * factor, wya * factor, wza * factor
-            xa = xa * length
-            xb = xb * length
-            idx2 = sec_x > xa & sec_x < xb
-            idx3 = sec_x >= xb
-            sec_f[idx2, 0] += -wx * (sec_x[idx2] - xa)
-            sec_f[idx2, 1] += 0.5 * wy * (sec_x[idx2] - xa) ** 2
-            sec_f[idx2, 2] += wy * (sec_x[idx2] - xa)
-            sec_f[idx2, 3] += -0.5 * wz * (sec_x[idx2] - xa) ** 2
-            sec_f[idx2, 4] += -wz * (sec_x[idx2] - xa)
-            # ------------------------------
-            sec_f[idx3, 0] += -wx * (xb - xa)
-            sec_f[idx3, 1] += wy * (xb - xa) * (sec_x[idx3] - 0.5 * (xb + xa))
-            sec_f[idx3, 2] += wy * (xb - xa)
-            sec_f[idx3, 3] += -wz * (xb - xa) * (sec_x[idx3] - 0.5 * (xb + xa))
-            sec_f[idx3, 4] += -wz * (xb - xa)
+    sec_f[..., 0] = -f[0]
+    sec_f[..., 1] = -f[5] + f[1] * sec_x
+    sec_f[..., 2] = f[1]
+    sec_f[..., 3] = -f[4] - f[2] * sec_x
+    sec_f[..., 4] = -f[2]
+    sec_f[..., 5] = -f[3]
+    if len(plan.load_beam_idx) == 0:
+        return sec_f
+    factors = plan.get_load_factors()[plan.load_pattern_idx][:, None]
+    wya, wyb, wza, wzb, wxa, wxb, xa, xb = [plan.load_data[:, [i]] for i in range(8)]
+    wx, wy, wz = wxa * factors, wya * factors, wza * factors
+    length = plan.lengths[plan.elastic_idx][plan.load_beam_idx][:, None]
+    x = sec_x[plan.load_beam_idx]
+    full = (xb > xa) & (np.abs(xb - xa - 1) < 1e-2)  # Full uniform load
+    point = xb < xa  # Point Load
+    partial = (xb > xa) & (np.abs(xb - xa - 1) > 1e-2)  # Partial uniform load
+    # Full uniform load
+    full_f = [-wx * x, 0.5 * wy * x ** 2, wy * x, -0.5 * wz * x * x, -wz * x]
+    # Point Load, the load values are stored in wya, wza and wxa
+    a = xa * length
+    after = x > a
+    point_f = [-wx * after, wy * (x - a) * after, wy * after, -wz * (x - a) * after, -wz * after]
+    # Partial uniform load
+    b = xb * length
+    inside = (x > a) & (x < b)
+    behind = x >= b
+    loaded = (x - a) * inside + (b - a) * behind
+    lever = 0.5 * (x - a) ** 2 * inside + (b - a) * (x - 0.5 * (b + a)) * behind
+    partial_f = [-wx * loaded, wy * lever, wy * loaded, -wz * lever, -wz * loaded]
+    delta_f = np.stack(
+        [np.where(full, f1, np.where(point, f2, np.where(partial, f3, 0.0)))
+         for f1, f2, f3 in zip(full_f, point_f, partial_f)],
+        axis=-1,
+    )
+    np.add.at(sec_f, (plan.load_beam_idx, slice(None), slice(0, 5)), delta_f)
     return sec_f
 
 
@@ -2,12 +2,13 @@ import openseespy.opensees as ops
 import xarray as xr
 import numpy as np
 
-from ._response_base import ResponseBase
+from ._response_base import ResponseBase, StepBuffer, _select_resp, _scale_resp
+from ._ele_resp_names import ELE_RESP_NAMES
 
 
 class LinkRespStepData(ResponseBase):
 
-    def __init__(self, ele_tags=None, model_update: bool = False, dtype: dict = None):
+    def __init__(self, ele_tags=None, model_update: bool = False, dtype: dict = None, max_steps: int = None):
         self.resp_names = ["basicDeformation", "basicForce"]
         self.resp_steps = None
         self.resp_steps_list = []  # for model update
@@ -20,6 +21,7 @@ class LinkRespStepData(ResponseBase):
         self.dtype = dict(int=np.int32, float=np.float32)
         if isinstance(dtype, dict):
             self.dtype.update(dtype)
+        self.max_steps = max_steps
 
         self.attrs = {
             "DOFs": "The DOFs are aligned with the local coordinate system. "
@@ -36,10 +38,11 @@ class LinkRespStepData(ResponseBase):
         self.resp_steps = None
         self.resp_steps_list = []
         for name in self.resp_names:
-            self.resp_steps_dict[name] = []
+            self.resp_steps_dict[name] = StepBuffer(self.max_steps)
         self.add_data_one_step(self.ele_tags)
         self.step_track = 0
-        self.times = [0.0]
+        self.times = StepBuffer(self.max_steps)
+        self.times.append(0.0)
 
     def reset(self):
         self.initialize()
@@ -75,7 +78,7 @@ class LinkRespStepData(ResponseBase):
     def _to_xarray(self):
         if self.model_update:
             self.resp_steps = xr.concat(self.resp_steps_list, dim="time", join="outer")
-            self.resp_steps.coords["time"] = self.times
+            self.resp_steps.coords["time"] = self.times.view()
         else:
             data_vars = {}
             for name, data_ in self.resp_steps_dict.items():
@@ -83,7 +86,7 @@ class LinkRespStepData(ResponseBase):
             self.resp_steps = xr.Dataset(
                     data_vars=data_vars,
                     coords={
-                        "time": self.times,
+                        "time": self.times.view(),
                         "eleTags": self.ele_tags,
                         "DOFs": self.DOFs,
                     },
@@ -115,30 +118,24 @@ class LinkRespStepData(ResponseBase):
         disp_factor = unit_factors["disp"]
 
         # ---------------------------------------------------------
-        resp_steps["basicForce"].loc[{"DOFs": ["UX", "UY", "UZ"]}] *= force_factor
-        resp_steps["basicForce"].loc[{"DOFs": ["RX", "RY", "RZ"]}] *= moment_factor
+        resp_steps = _scale_resp(resp_steps, "basicForce", force_factor, "DOFs", ["UX", "UY", "UZ"])
+        resp_steps = _scale_resp(resp_steps, "basicForce", moment_factor, "DOFs", ["RX", "RY", "RZ"])
         # ---------------------------------------------------------
-        resp_steps["basicDeformation"].loc[{"DOFs": ["UX", "UY", "UZ"]}] *= disp_factor
+        resp_steps = _scale_resp(resp_steps, "basicDeformation", disp_factor, "DOFs", ["UX", "UY", "UZ"])
 
         return resp_steps
 
     @staticmethod
-    def read_response(dt: xr.DataTree, resp_type: str = None, ele_tags=None, unit_factors: dict = None):
-        ds = LinkRespStepData.read_file(dt, unit_factors=unit_factors)
+    def read_response(
+            dt: xr.DataTree, resp_type: str = None, ele_tags=None, unit_factors: dict = None, time_range=None
+    ):
+        ds = dt["/LinkResponses"].to_dataset()
+        ds = _select_resp(ds, resp_type=resp_type, tag_dim="eleTags", tags=ele_tags, time_range=time_range)
+        if unit_factors is not None:
+            ds = LinkRespStepData._unit_transform(ds, unit_factors)
         if resp_type is None:
-            if ele_tags is None:
-                return ds
-            else:
-                return ds.sel(eleTags=ele_tags)
-        else:
-            if resp_type not in list(ds.keys()):
-                raise ValueError(
-                    f"resp_type {resp_type} not found in {list(ds.keys())}"
-                )
-            if ele_tags is not None:
-                return ds[resp_type].sel(eleTags=ele_tags)
-            else:
-                return ds[resp_type]
+            return ds
+        return ds[resp_type]
 
 
 def _get_link_resp(link_tags, dtype):
@@ -168,11 +165,7 @@ def _get_link_resp_by_type(etag, etypes):
     etag = int(etag)
     ntags = ops.eleNodes(etag)
     ndim = len(ops.nodeCoord(ntags[0]))
-    resp = []
-    for name in etypes:
-        resp = ops.eleResponse(etag, name)
-        if len(resp) > 0:
-            break
+    resp = ELE_RESP_NAMES.get_response(etag, etypes)
     if len(resp) == 0:
         resp = [0.0] * 6
     elif ndim == 2 and len(resp) == 3:
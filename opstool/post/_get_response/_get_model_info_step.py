@@ -1,8 +1,10 @@
+import numpy as np
 import xarray as xr
 import openseespy.opensees as ops
 
-from ._response_base import ResponseBase
-from ..model_data import GetFEMData
+from ._response_base import ResponseBase, _scale_resp
+from ._ele_resp_names import ELE_RESP_NAMES
+from ..model_data import _get_model_data_from_domain
 
 
 class ModelInfoStepData(ResponseBase):
@@ -10,6 +12,11 @@ class ModelInfoStepData(ResponseBase):
     def __init__(self, model_update: bool = False):
         self.model_update = model_update
         self.model_info_steps = dict()
+        self.model_info_data = dict()
+        # With model_update, a new version of the model information is only stored
+        # when the topology changes, each step records the index of its version.
+        self.version_index = None
+        self.signature = None
         # -----------------------------------------
         self.times = None
         self.step_track = 0
@@ -21,11 +28,14 @@ class ModelInfoStepData(ResponseBase):
 
     def initialize(self):
         self.times = [0.0]
+        ELE_RESP_NAMES.clear()
         # --------------------------------------------------------
-        model_info, _ = GetFEMData().get_model_info()
+        model_info, _ = _get_model_data_from_domain()
         # ------------------------------------------------------------
         for key, value in model_info.items():
             self.model_info_steps[key] = [value]
+        self.version_index = [0]
+        self.signature = _get_topology_signature() if self.model_update else None
         # ------------------------------------------------------------------
         self.init = True
         self.step_track = 0
@@ -35,19 +45,38 @@ class ModelInfoStepData(ResponseBase):
 
     def add_data_one_step(self):
         if self.model_update:
-            model_info, _ = GetFEMData().get_model_info()
-            for key, value in model_info.items():
-                self.model_info_steps[key].append(value)
+            signature = _get_topology_signature()
+            if signature != self.signature:
+                ELE_RESP_NAMES.clear()
+                model_info, _ = _get_model_data_from_domain()
+                for key, value in model_info.items():
+                    self.model_info_steps[key].append(value)
+                self.signature = signature
+            num_versions = len(self.model_info_steps["NodalData"])
+            self.version_index.append(num_versions - 1)
             self.times.append(ops.getTime())
         self.step_track += 1
 
     def _to_xarray(self):
+        dim = "version" if self.model_update else "time"
+        # The steps are kept as lists, so that the data can be saved more than once.
+        self.model_info_data = dict()
         for key, data in self.model_info_steps.items():
-            new_data = xr.concat(data, dim="time", join="outer")
-            new_data.coords["time"] = self.times
-            self.model_info_steps[key] = new_data
+            new_data = xr.concat(data, dim=dim, join="outer")
+            if self.model_update:
+                new_data.coords["version"] = np.arange(len(data))
+            else:
+                new_data.coords["time"] = self.times
+            self.model_info_data[key] = new_data
+        if self.model_update:
+            self.model_info_data["VersionIndex"] = xr.DataArray(
+                np.array(self.version_index, dtype=int),
+                coords={"time": self.times},
+                dims=("time",),
+                name="VersionIndex",
+            )
         model_update = 1 if self.model_update else 0
-        self.model_info_steps["ModelUpdate"] = xr.DataArray(
+        self.model_info_data["ModelUpdate"] = xr.DataArray(
             model_update, name="ModelUpdate"
         )
 
@@ -116,8 +145,7 @@ class ModelInfoStepData(ResponseBase):
 
     def save_file(self, dt: xr.DataTree):
         self._to_xarray()
-        model_info_steps = self.model_info_steps
-        for data in model_info_steps.values():
+        for data in self.model_info_data.values():
             dt[f"ModelInfo/{data.name}"] = xr.Dataset({data.name: data})
         return dt
 
@@ -128,6 +156,11 @@ class ModelInfoStepData(ResponseBase):
             model_info[key] = value[key]
         model_update = int(model_info["ModelUpdate"])
         model_update = True if model_update == 1 else False
+        if "VersionIndex" in model_info:
+            version_index = model_info.pop("VersionIndex")
+            for key, value in model_info.items():
+                if key != "ModelUpdate":
+                    model_info[key] = _expand_versions(value, version_index)
 
         if unit_factors:
             model_info = ModelInfoStepData._unit_transform(model_info, unit_factors)
@@ -138,21 +171,17 @@ class ModelInfoStepData(ResponseBase):
     def _unit_transform(model_info, unit_factors):
         disp_factor = unit_factors["disp"]
 
-        model_info["NodalData"] *= disp_factor
+        model_info = _scale_resp(model_info, "NodalData", disp_factor)
         model_info["NodalData"].attrs["minBoundSize"] *= disp_factor
         model_info["NodalData"].attrs["maxBoundSize"] *= disp_factor
         bounds = model_info["NodalData"].attrs["bounds"]
-        model_info["NodalData"].attrs["bounds"] = (data * disp_factor for data in bounds)
+        model_info["NodalData"].attrs["bounds"] = tuple(data * disp_factor for data in bounds)
 
         if "info" in model_info["FixedNodalData"].coords.keys():
-            model_info["FixedNodalData"].loc[
-                {"info": ["x", "y", "z"]}
-            ] *= disp_factor
+            model_info = _scale_resp(model_info, "FixedNodalData", disp_factor, "info", ["x", "y", "z"])
         if "info" in model_info["MPConstraintData"].coords.keys():
-            model_info["MPConstraintData"].loc[
-                {"info": ["xo", "yo", "zo"]}
-            ] *= disp_factor
-        model_info["eleCenters"] *= disp_factor
+            model_info = _scale_resp(model_info, "MPConstraintData", disp_factor, "info", ["xo", "yo", "zo"])
+        model_info = _scale_resp(model_info, "eleCenters", disp_factor)
 
         return model_info
 
@@ -170,5 +199,49 @@ class ModelInfoStepData(ResponseBase):
         model_update = int(dt["ModelInfo"]["ModelUpdate"]["ModelUpdate"])
         data = dt["ModelInfo"][data_type][data_type]
         if model_update == 1:
+            if "VersionIndex" in dt["ModelInfo"].children:
+                version_index = dt["ModelInfo"]["VersionIndex"]["VersionIndex"]
+                data = _expand_versions(data, version_index)
             return data
         return data.isel(time=0)
+
+
+def _get_topology_signature():
+    """A cheap signature of the model topology, nodal coordinates, loads and constraints,
+    used to detect whether the model information needs to be rebuilt.
+    """
+    node_tags = ops.getNodeTags()
+    fixed_nodes = ops.getFixedNodes()
+    signature = [
+        tuple(node_tags),
+        tuple(ops.getEleTags()),
+        tuple(tuple(ops.nodeCoord(tag)) for tag in node_tags),
+        tuple(fixed_nodes),
+        tuple(tuple(ops.getFixedDOFs(tag)) for tag in fixed_nodes),
+    ]
+    for tag in ops.getRetainedNodes():
+        for tag2 in ops.getConstrainedNodes(tag):
+            signature.append(
+                (tag, tag2, tuple(ops.getConstrainedDOFs(tag2, tag)), tuple(ops.getRetainedDOFs(tag, tag2)))
+            )
+    for pattern in ops.getPatterns():
+        signature.append(
+            (
+                pattern,
+                tuple(ops.getNodeLoadTags(pattern)),
+                tuple(ops.getNodeLoadData(pattern)),
+                tuple(ops.getEleLoadTags(pattern)),
+                tuple(ops.getEleLoadData(pattern)),
+            )
+        )
+    return tuple(signature)
+
+
+def _expand_versions(data: xr.DataArray, version_index: xr.DataArray):
+    """Reconstruct the model information at each step from the stored versions."""
+    if "version" not in data.dims:
+        return data
+    new_data = data.isel(version=version_index.values)
+    new_data = new_data.rename({"version": "time"})
+    new_data.coords["time"] = version_index.coords["time"].values
+    return new_data
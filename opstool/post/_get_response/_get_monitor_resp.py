@@ -0,0 +1,160 @@
+import numpy as np
+import xarray as xr
+import openseespy.opensees as ops
+
+from ._response_base import ResponseBase, StepBuffer, _select_resp, _scale_resp
+
+
+class MonitorRespStepData(ResponseBase):
+    """A small set of monitored quantities recorded at every analysis step,
+    which also decide whether a threshold-triggered full-field snapshot is taken.
+
+    Parameters
+    -----------
+    node_tags: Union[list, tuple]
+        The monitored node tags.
+        The drifts are computed between each pair of consecutive nodes.
+    dofs: Union[list, tuple], default: None
+        The monitored DOFs (1-based), if None, the first DOF is monitored.
+    disp_threshold: float, default: None
+        The step is triggered if the absolute displacement of any monitored DOF reaches this value.
+    drift_threshold: float, default: None
+        The step is triggered if the absolute drift of any pair of nodes reaches this value.
+    """
+
+    def __init__(
+            self,
+            node_tags,
+            dofs=None,
+            disp_threshold: float = None,
+            drift_threshold: float = None,
+            dtype: dict = None,
+            max_steps: int = None
+    ):
+        self.resp_names = ["disp", "drift", "triggered"]
+        self.node_tags = [int(tag) for tag in np.atleast_1d(node_tags)]
+        self.dofs = [int(dof) for dof in np.atleast_1d(dofs)] if dofs is not None else [1]
+        self.disp_threshold = disp_threshold
+        self.drift_threshold = drift_threshold
+        self.resp_steps = None
+        self.resp_steps_dict = dict()
+        self.times = []
+        self.step_track = 0
+
+        self.dtype = dict(int=np.int32, float=np.float32)
+        if isinstance(dtype, dict):
+            self.dtype.update(dtype)
+        self.max_steps = max_steps
+
+        self.DOFs = _get_dof_labels(self.node_tags[0], self.dofs)
+        coords = np.array([ops.nodeCoord(tag) for tag in self.node_tags], dtype=float)
+        self.heights = np.linalg.norm(np.diff(coords, axis=0), axis=1)
+        self.heights[self.heights == 0.0] = np.nan
+
+        self.initialize()
+
+    def initialize(self):
+        self.resp_steps = None
+        for name in self.resp_names:
+            self.resp_steps_dict[name] = StepBuffer(self.max_steps)
+        self.add_data_one_step()
+        self.times = StepBuffer(self.max_steps)
+        self.times.append(0.0)
+        self.step_track = 0
+
+    def reset(self):
+        self.initialize()
+
+    def add_data_one_step(self):
+        """Record the monitored quantities, and return whether the step is triggered."""
+        disp = np.array(
+            [[ops.nodeDisp(tag, dof) for dof in self.dofs] for tag in self.node_tags],
+            dtype=self.dtype["float"]
+        )
+        drift = np.diff(disp, axis=0) / self.heights[:, None]
+        drift = drift.astype(self.dtype["float"])
+        triggered = False
+        if self.disp_threshold is not None:
+            triggered = triggered or bool(np.any(np.abs(disp) >= self.disp_threshold))
+        if self.drift_threshold is not None:
+            triggered = triggered or bool(np.any(np.abs(drift) >= self.drift_threshold))
+
+        self.resp_steps_dict["disp"].append(disp)
+        self.resp_steps_dict["drift"].append(drift)
+        self.resp_steps_dict["triggered"].append(np.int8(triggered))
+        self.times.append(ops.getTime())
+        self.step_track += 1
+        return triggered
+
+    def _to_xarray(self):
+        data_vars = dict()
+        data_vars["disp"] = (["time", "nodeTags", "DOFs"], self.resp_steps_dict["disp"])
+        data_vars["drift"] = (["time", "nodePairs", "DOFs"], self.resp_steps_dict["drift"])
+        data_vars["triggered"] = (["time"], self.resp_steps_dict["triggered"])
+        attrs = {
+            "Notes": "The drift is the relative displacement of consecutive monitored nodes "
+                     "divided by their distance; triggered is 1 if a threshold is reached.",
+        }
+        if self.disp_threshold is not None:
+            attrs["dispThreshold"] = self.disp_threshold
+        if self.drift_threshold is not None:
+            attrs["driftThreshold"] = self.drift_threshold
+        self.resp_steps = xr.Dataset(
+            data_vars=data_vars,
+            coords={
+                "time": self.times.view(),
+                "nodeTags": self.node_tags,
+                "nodePairs": [f"{tagi}-{tagj}" for tagi, tagj in zip(self.node_tags[:-1], self.node_tags[1:])],
+                "DOFs": self.DOFs,
+            },
+            attrs=attrs,
+        )
+
+    def get_data(self):
+        return self.resp_steps
+
+    def get_track(self):
+        return self.step_track
+
+    def save_file(self, dt: xr.DataTree):
+        self._to_xarray()
+        dt["/MonitoredResponses"] = self.resp_steps
+        return dt
+
+    @staticmethod
+    def read_file(dt: xr.DataTree, unit_factors: dict = None):
+        resp_steps = dt["/MonitoredResponses"].to_dataset()
+        if unit_factors is not None:
+            resp_steps = MonitorRespStepData._unit_transform(resp_steps, unit_factors)
+        return resp_steps
+
+    @staticmethod
+    def _unit_transform(resp_steps, unit_factors):
+        disp_factor = unit_factors["disp"]
+
+        resp_steps = _scale_resp(resp_steps, "disp", disp_factor, "DOFs", ["UX", "UY", "UZ"])
+
+        return resp_steps
+
+    @staticmethod
+    def read_response(
+            dt: xr.DataTree, resp_type: str = None, node_tags=None, unit_factors: dict = None, time_range=None
+    ):
+        ds = dt["/MonitoredResponses"].to_dataset()
+        ds = _select_resp(ds, resp_type=resp_type, tag_dim="nodeTags", tags=node_tags, time_range=time_range)
+        if unit_factors is not None:
+            ds = MonitorRespStepData._unit_transform(ds, unit_factors)
+        if resp_type is None:
+            return ds
+        return ds[resp_type]
+
+
+def _get_dof_labels(node_tag, dofs):
+    ndm, ndf = ops.getNDM(node_tag)[0], ops.getNDF(node_tag)[0]
+    if ndm == 1:
+        labels = ["UX"]
+    elif ndm == 2 and ndf == 3:
+        labels = ["UX", "UY", "RZ"]
+    else:
+        labels = ["UX", "UY", "UZ", "RX", "RY", "RZ"]
+    return [labels[dof - 1] if dof <= len(labels) else f"DOF{dof}" for dof in dofs]
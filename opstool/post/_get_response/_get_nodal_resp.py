@@ -1,13 +1,15 @@
+from collections import defaultdict
+from types import SimpleNamespace
+
 import numpy as np
 import openseespy.opensees as ops
 import xarray as xr
-from tornado.gen import moment
 
-from ._response_base import ResponseBase
+from ._response_base import ResponseBase, StepBuffer, _select_resp, _scale_resp
 
 
 class NodalRespStepData(ResponseBase):
-    def __init__(self, node_tags=None, model_update: bool = False, dtype: dict = None):
+    def __init__(self, node_tags=None, model_update: bool = False, dtype: dict = None, max_steps: int = None):
         self.resp_names = [
             "disp",
             "vel",
@@ -24,10 +26,13 @@ class NodalRespStepData(ResponseBase):
         self.times = []
         self.step_track = 0
 
+        self.layout = None  # node set and DOF layout, rebuilt only when the model changes
+
         self.model_update = model_update
         self.dtype = dict(int=np.int32, float=np.float32)
         if isinstance(dtype, dict):
             self.dtype.update(dtype)
+        self.max_steps = max_steps
 
         self.attrs = {
             "UX": "Displacement in X direction",
@@ -41,21 +46,24 @@ class NodalRespStepData(ResponseBase):
         self.initialize()
 
     def initialize(self):
+        self.layout = None
         self.resp_steps = None
         self.resp_steps_list = []
         for name in self.resp_names:
-            self.resp_steps_dict[name] = []
+            self.resp_steps_dict[name] = StepBuffer(self.max_steps)
         self.add_data_one_step(self.node_tags)
-        self.times = [0.0]
+        self.times = StepBuffer(self.max_steps)
+        self.times.append(0.0)
         self.step_track = 0
 
     def reset(self):
         self.initialize()
 
     def add_data_one_step(self, node_tags):
-        # node_tags = ops.getNodeTags()
-        disp, vel, accel, pressure = _get_nodal_resp(node_tags, dtype=self.dtype)
-        reacts, reacts_inertia, rayleigh_forces = _get_nodal_react(node_tags, dtype=self.dtype)
+        if self.layout is None or (self.model_update and not self.layout.is_valid(node_tags)):
+            self.layout = NodalDOFLayout(node_tags)
+        disp, vel, accel, pressure = _get_nodal_resp(self.layout, dtype=self.dtype)
+        reacts, reacts_inertia, rayleigh_forces = _get_nodal_react(self.layout, dtype=self.dtype)
         if self.model_update:
             datas = [disp, vel, accel, reacts, reacts_inertia, rayleigh_forces]
             data_vars = {}
@@ -88,7 +96,7 @@ class NodalRespStepData(ResponseBase):
     def _to_xarray(self):
         if self.model_update:
             self.resp_steps = xr.concat(self.resp_steps_list, dim="time", join="outer")
-            self.resp_steps.coords["time"] = self.times
+            self.resp_steps.coords["time"] = self.times.view()
         else:
             data_vars = {}
             for name in self.resp_names[:-1]:
@@ -97,7 +105,7 @@ class NodalRespStepData(ResponseBase):
             self.resp_steps = xr.Dataset(
                 data_vars=data_vars,
                 coords={
-                    "time": self.times,
+                    "time": self.times.view(),
                     "nodeTags": self.node_tags,
                     "DOFs": ["UX", "UY", "UZ", "RX", "RY", "RZ"],
                 },
@@ -128,132 +136,134 @@ class NodalRespStepData(ResponseBase):
         moment_factor = unit_factors["moment"]
         stress_factor = unit_factors["stress"]
 
-        resp_steps["disp"].loc[{"DOFs": ["UX", "UY", "UZ"]}] *= disp_factor
-        resp_steps["vel"].loc[{"DOFs": ["UX", "UY", "UZ"]}] *= vel_factor
-        resp_steps["vel"].loc[{"DOFs": ["RX", "RY", "RZ"]}] *= angular_vel_fact
-        resp_steps["accel"].loc[{"DOFs": ["UX", "UY", "UZ"]}] *= accel_factor
-        resp_steps["accel"].loc[{"DOFs": ["RX", "RY", "RZ"]}] *= angular_accel_fact
+        trans_dofs, rot_dofs = ["UX", "UY", "UZ"], ["RX", "RY", "RZ"]
+        resp_steps = _scale_resp(resp_steps, "disp", disp_factor, "DOFs", trans_dofs)
+        resp_steps = _scale_resp(resp_steps, "vel", vel_factor, "DOFs", trans_dofs)
+        resp_steps = _scale_resp(resp_steps, "vel", angular_vel_fact, "DOFs", rot_dofs)
+        resp_steps = _scale_resp(resp_steps, "accel", accel_factor, "DOFs", trans_dofs)
+        resp_steps = _scale_resp(resp_steps, "accel", angular_accel_fact, "DOFs", rot_dofs)
 
-        resp_steps["reaction"].loc[{"DOFs": ["UX", "UY", "UZ"]}] *= force_factor
-        resp_steps["reaction"].loc[{"DOFs": ["RX", "RY", "RZ"]}] *= moment_factor
-        resp_steps["reactionIncInertia"].loc[{"DOFs": ["UX", "UY", "UZ"]}] *= force_factor
-        resp_steps["reactionIncInertia"].loc[{"DOFs": ["RX", "RY", "RZ"]}] *= moment_factor
-        resp_steps["rayleighForces"].loc[{"DOFs": ["UX", "UY", "UZ"]}] *= force_factor
-        resp_steps["rayleighForces"].loc[{"DOFs": ["RX", "RY", "RZ"]}] *= moment_factor
-        resp_steps["pressure"] *= stress_factor
+        for name in ["reaction", "reactionIncInertia", "rayleighForces"]:
+            resp_steps = _scale_resp(resp_steps, name, force_factor, "DOFs", trans_dofs)
+            resp_steps = _scale_resp(resp_steps, name, moment_factor, "DOFs", rot_dofs)
+        resp_steps = _scale_resp(resp_steps, "pressure", stress_factor)
 
         return resp_steps
 
     @staticmethod
-    def read_response(dt: xr.DataTree, resp_type: str = None, node_tags=None, unit_factors: dict = None):
-        ds = NodalRespStepData.read_file(dt, unit_factors=unit_factors)
+    def read_response(
+            dt: xr.DataTree, resp_type: str = None, node_tags=None, unit_factors: dict = None, time_range=None
+    ):
+        ds = dt["/NodalResponses"].to_dataset()
+        ds = _select_resp(ds, resp_type=resp_type, tag_dim="nodeTags", tags=node_tags, time_range=time_range)
+        if unit_factors is not None:
+            ds = NodalRespStepData._unit_transform(ds, unit_factors)
         if resp_type is None:
-            if node_tags is None:
-                return ds
+            return ds
+        return ds[resp_type]
+
+
+class NodalDOFLayout:
+    """The node set, NDM/NDF layout and DOF padding map of the current model state.
+
+    It is built once and reused at every step, so that the per-step extraction only
+    issues the response queries and fills preallocated arrays.
+
+    Parameters
+    -----------
+    node_tags: Union[list, tuple, np.ndarray]
+        The node tags to be extracted.
+    """
+
+    def __init__(self, node_tags):
+        self.node_tags = [int(tag) for tag in node_tags]
+        self.domain_node_tags = ops.getNodeTags()
+        self.num_nodes = len(self.node_tags)
+
+        existing_tags = set(self.domain_node_tags)
+        layouts = defaultdict(list)  # key: (ndm, ndf), value: row index
+        missing_rows = []
+        for i, tag in enumerate(self.node_tags):
+            if tag in existing_tags:
+                layouts[(ops.getNDM(tag)[0], ops.getNDF(tag)[0])].append(i)
             else:
-                return ds.sel(nodeTags=node_tags)
-        else:
-            if resp_type not in list(ds.keys()):
-                raise ValueError(
-                    f"resp_type {resp_type} not found in {list(ds.keys())}"
+                missing_rows.append(i)
+        self.missing_rows = np.array(missing_rows, dtype=int)
+        self.present_rows = np.array(
+            [i for i, tag in enumerate(self.node_tags) if tag in existing_tags], dtype=int
+        )
+        self.present_tags = [self.node_tags[i] for i in self.present_rows]
+
+        # Each group contains nodes with the same layout, padded by the same column map.
+        self.groups = []
+        for (ndm, ndf), rows in layouts.items():
+            self.groups.append(
+                SimpleNamespace(
+                    rows=np.array(rows, dtype=int),
+                    tags=[self.node_tags[i] for i in rows],
+                    resp_cols=_get_resp_dof_cols(ndm, ndf),
+                    react_cols=_get_react_dof_cols(ndm, ndf),
                 )
-            if node_tags is not None:
-                return ds[resp_type].sel(nodeTags=node_tags)
-            else:
-                return ds[resp_type]
-
-
-def _get_nodal_resp(node_tags, dtype: dict):
-    node_disp = []  # 6 data each row, Ux, Uy, Uz, Rx, Ry, Rz
-    node_vel = []  # 6 data each row, Ux, Uy, Uz, Rx, Ry, Rz
-    node_accel = []  # 6 data each row, Ux, Uy, Uz, Rx, Ry, Rz
-    node_pressure = []  # 1 data each row, P
-    all_node_tags = ops.getNodeTags()
-    for i, tag in enumerate(node_tags):
-        tag = int(tag)
-        if tag in all_node_tags:
-            coord = ops.nodeCoord(tag)
-            disp = ops.nodeDisp(tag)
-            vel = ops.nodeVel(tag)
-            accel = ops.nodeAccel(tag)
-            if len(coord) == 1:
-                disp.extend([0, 0, 0, 0, 0])
-                vel.extend([0, 0, 0, 0, 0])
-                accel.extend([0, 0, 0, 0, 0])
-            elif len(coord) == 2:
-                if len(disp) == 2:  # 2 ndim 2 dof
-                    disp.extend([0, 0, 0, 0])
-                    vel.extend([0, 0, 0, 0])
-                    accel.extend([0, 0, 0, 0])
-                elif len(disp) >= 3:  # 2 ndim 3 dof
-                    disp = [disp[0], disp[1], 0.0, 0.0, 0.0, disp[2]]
-                    vel = [vel[0], vel[1], 0.0, 0.0, 0.0, vel[2]]
-                    accel = [accel[0], accel[1], 0.0, 0.0, 0.0, accel[2]]
-            else:
-                if len(disp) == 3:  # 3 ndim 3 dof
-                    disp.extend([0, 0, 0])
-                    vel.extend([0, 0, 0])
-                    accel.extend([0, 0, 0])
-                elif len(disp) == 4:  # 3 ndim 4 dof
-                    disp = [disp[0], disp[1], disp[2], 0.0, 0.0, disp[3]]
-                    vel = [vel[0], vel[1], vel[2], 0.0, 0.0, vel[3]]
-                    accel = [accel[0], accel[1], accel[2], 0.0, 0.0, accel[3]]
-                elif len(disp) < 6:  # 3 ndim 6 dof
-                    disp.extend([0] * (6 - len(disp)))
-                    vel.extend([0] * (6 - len(vel)))
-                    accel.extend([0] * (6 - len(accel)))
-                elif len(disp) > 6:
-                    disp = disp[:6]
-                    vel = vel[:6]
-                    accel = accel[:6]
-        else:
-            disp = [np.nan, np.nan, np.nan, np.nan, np.nan, np.nan]
-            vel = [np.nan, np.nan, np.nan, np.nan, np.nan, np.nan]
-            accel = [np.nan, np.nan, np.nan, np.nan, np.nan, np.nan]
-        node_disp.append(disp)
-        node_vel.append(vel)
-        node_accel.append(accel)
-        node_pressure.append(ops.nodePressure(tag))
-    node_disp = np.array(node_disp, dtype=dtype["float"])
-    node_vel = np.array(node_vel, dtype=dtype["float"])
-    node_accel = np.array(node_accel, dtype=dtype["float"])
-    node_pressure = np.array(node_pressure, dtype=dtype["float"])
-    return node_disp, node_vel, node_accel, node_pressure
+            )
 
+    def is_valid(self, node_tags):
+        """Whether the layout is still valid for the given node tags and the current domain."""
+        if len(node_tags) != self.num_nodes:
+            return False
+        if ops.getNodeTags() != self.domain_node_tags:
+            return False
+        return [int(tag) for tag in node_tags] == self.node_tags
+
+    def fill(self, out, func, react: bool = False):
+        """Fill the ``(num_nodes, 6)`` array ``out`` with the responses returned by ``func(tag)``."""
+        out.fill(0.0)
+        out[self.missing_rows] = np.nan
+        for group in self.groups:
+            cols = group.react_cols if react else group.resp_cols
+            data = np.array([func(tag) for tag in group.tags], dtype=float)
+            out[group.rows[:, None], cols] = data[:, : len(cols)]
+        return out
+
+
+def _get_resp_dof_cols(ndm, ndf):
+    """The columns of the six padded DOFs that the raw nodal DOFs are placed in."""
+    if ndm == 2 and ndf >= 3:  # 2 ndim 3 dof
+        return np.array([0, 1, 5])
+    elif ndm == 3 and ndf == 4:  # 3 ndim 4 dof
+        return np.array([0, 1, 2, 5])
+    return np.arange(min(ndf, 6))
+
+
+def _get_react_dof_cols(ndm, ndf):
+    if ndm == 2 and ndf >= 3:
+        return np.array([0, 1, 5])
+    return np.arange(min(ndf, 6))
+
+
+def _get_nodal_resp(layout: NodalDOFLayout, dtype: dict):
+    num = layout.num_nodes
+    node_disp = np.empty((num, 6), dtype=dtype["float"])  # Ux, Uy, Uz, Rx, Ry, Rz
+    node_vel = np.empty((num, 6), dtype=dtype["float"])
+    node_accel = np.empty((num, 6), dtype=dtype["float"])
+    node_pressure = np.full(num, np.nan, dtype=dtype["float"])  # P
+    layout.fill(node_disp, ops.nodeDisp)
+    layout.fill(node_vel, ops.nodeVel)
+    layout.fill(node_accel, ops.nodeAccel)
+    node_pressure[layout.present_rows] = [ops.nodePressure(tag) for tag in layout.present_tags]
+    return node_disp, node_vel, node_accel, node_pressure
 
-def _get_nodal_react(node_tags, dtype: dict):
-    def get_react(tags):
-        forces = []  # 6 data each row, Ux, Uy, Uz, Rx, Ry, Rz
-        for tag in tags:
-            tag = int(tag)
-            if tag in ops.getNodeTags():
-                coord = ops.nodeCoord(tag)
-                fo = ops.nodeReaction(tag)
-                if len(coord) == 1:
-                    fo.extend([0.0, 0.0, 0.0, 0.0, 0.0])
-                elif len(coord) == 2:
-                    if len(fo) == 2:
-                        fo.extend([0.0, 0.0, 0.0, 0.0])
-                    elif len(fo) >= 3:
-                        fo = [fo[0], fo[1], 0.0, 0.0, 0.0, fo[2]]
-                else:
-                    if len(fo) == 3:
-                        fo.extend([0.0, 0.0, 0.0])
-                    elif len(fo) < 6:  # 3 ndim 6 dof
-                        fo.extend([0] * (6 - len(fo)))
-                    elif len(fo) > 6:
-                        fo = fo[:6]
-            else:
-                fo = [np.nan, np.nan, np.nan, np.nan, np.nan, np.nan]
-            forces.append(fo)
-        return forces
 
+def _get_nodal_react(layout: NodalDOFLayout, dtype: dict):
+    num = layout.num_nodes
+    reacts = np.empty((num, 6), dtype=dtype["float"])
+    reacts_inertia = np.empty((num, 6), dtype=dtype["float"])
+    rayleigh_forces = np.empty((num, 6), dtype=dtype["float"])
     ops.reactions()
-    reacts = np.array(get_react(node_tags), dtype=dtype["float"])
+    layout.fill(reacts, ops.nodeReaction, react=True)
     # rayleighForces
     ops.reactions("-rayleigh")
-    rayleigh_forces = np.array(get_react(node_tags), dtype=dtype["float"])
+    layout.fill(rayleigh_forces, ops.nodeReaction, react=True)
     # Include Inertia
     ops.reactions("-dynamic")
-    reacts_inertia = np.array(get_react(node_tags), dtype=dtype["float"])
+    layout.fill(reacts_inertia, ops.nodeReaction, react=True)
     return reacts, reacts_inertia, rayleigh_forces
@@ -2,7 +2,9 @@ import numpy as np
 import xarray as xr
 import openseespy.opensees as ops
 
-from ._response_base import ResponseBase, _expand_to_uniform_array
+from ._response_base import ResponseBase, StepBuffer, _select_resp, _scale_resp, _expand_to_uniform_array
+from ._stress_measures import MEASURES_2D, _calculate_measures_2D
+from ._ele_resp_names import ELE_RESP_NAMES, _probe_args
 
 
 # from ...utils import OPS_ELE_TAGS
@@ -23,7 +25,8 @@ class PlaneRespStepData(ResponseBase):
             ele_tags=None,
             compute_measures: bool = True,
             model_update: bool = False,
-            dtype: dict = None
+            dtype: dict = None,
+            max_steps: int = None
     ):
         self.resp_names = [
             "Stresses",
@@ -41,6 +44,7 @@ class PlaneRespStepData(ResponseBase):
         self.dtype = dict(int=np.int32, float=np.float32)
         if isinstance(dtype, dict):
             self.dtype.update(dtype)
+        self.max_steps = max_steps
 
         self.attrs = {
             "sigma11, sigma22, sigma12": "Normal stress and shear stress (strain) in the x-y plane.",
@@ -59,9 +63,10 @@ class PlaneRespStepData(ResponseBase):
         self.resp_steps = None
         self.resp_steps_list = []
         for name in self.resp_names:
-            self.resp_steps_dict[name] = []
+            self.resp_steps_dict[name] = StepBuffer(self.max_steps)
         self.add_data_one_step(self.ele_tags)
-        self.times = [0.0]
+        self.times = StepBuffer(self.max_steps)
+        self.times.append(0.0)
         self.step_track = 0
 
     def reset(self):
@@ -109,7 +114,7 @@ class PlaneRespStepData(ResponseBase):
     def _to_xarray(self):
         if self.model_update:
             self.resp_steps = xr.concat(self.resp_steps_list, dim="time", join="outer")
-            self.resp_steps.coords["time"] = self.times
+            self.resp_steps.coords["time"] = self.times.view()
         else:
             data_vars = dict()
             data_vars["Stresses"] = (
@@ -121,7 +126,7 @@ class PlaneRespStepData(ResponseBase):
             self.resp_steps = xr.Dataset(
                 data_vars=data_vars,
                 coords={
-                    "time": self.times,
+                    "time": self.times.view(),
                     "eleTags": self.ele_tags,
                     "GaussPoints": self.GaussPoints,
                     "stressDOFs": self.stressDOFs,
@@ -137,15 +142,15 @@ class PlaneRespStepData(ResponseBase):
         stresses = self.resp_steps["Stresses"]
         strains = self.resp_steps["Strains"]
 
-        stress_measures = _calculate_stresses_measures(stresses.data, dtype=self.dtype)
-        strain_measures = _calculate_stresses_measures(strains.data, dtype=self.dtype)
+        stress_measures = _calculate_measures_2D(stresses.data, dtype=self.dtype)
+        strain_measures = _calculate_measures_2D(strains.data, dtype=self.dtype)
 
         dims = ["time", "eleTags", "GaussPoints", "measures"]
         coords = {
             "time": stresses.coords["time"],
             "eleTags": stresses.coords["eleTags"],
             "GaussPoints": stresses.coords["GaussPoints"],
-            "measures": ["p1", "p2", "sigma_vm", "tau_max"],
+            "measures": MEASURES_2D,
         }
 
         self.resp_steps["stressMeasures"] = xr.DataArray(
@@ -176,69 +181,40 @@ class PlaneRespStepData(ResponseBase):
     def _unit_transform(resp_steps, unit_factors):
         stress_factor = unit_factors["stress"]
 
-        resp_steps["Stresses"].loc[{"stressDOFs": ["sigma11", "sigma22", "sigma12"]}] *= stress_factor
-        if "sigma33" in resp_steps["Stresses"].coords["stressDOFs"]:
-            resp_steps["Stresses"].loc[{"stressDOFs": ["sigma33"]}] *= stress_factor
-
-        resp_steps["stressMeasures"] *= stress_factor
+        resp_steps = _scale_resp(
+            resp_steps, "Stresses", stress_factor, "stressDOFs", ["sigma11", "sigma22", "sigma12", "sigma33"]
+        )
+        resp_steps = _scale_resp(resp_steps, "stressMeasures", stress_factor)
 
         return resp_steps
 
     @staticmethod
     def read_file(dt: xr.DataTree, unit_factors: dict = None):
         resp_steps = dt["/PlaneResponses"].to_dataset()
-        if unit_factors:
+        if unit_factors is not None:
             resp_steps = PlaneRespStepData._unit_transform(resp_steps, unit_factors)
         return resp_steps
 
     @staticmethod
-    def read_response(dt: xr.DataTree, resp_type: str = None, ele_tags=None, unit_factors: dict = None):
-        ds = PlaneRespStepData.read_file(dt, unit_factors=unit_factors)
+    def read_response(
+            dt: xr.DataTree, resp_type: str = None, ele_tags=None, unit_factors: dict = None, time_range=None
+    ):
+        ds = dt["/PlaneResponses"].to_dataset()
+        ds = _select_resp(ds, resp_type=resp_type, tag_dim="eleTags", tags=ele_tags, time_range=time_range)
+        if unit_factors is not None:
+            ds = PlaneRespStepData._unit_transform(ds, unit_factors)
         if resp_type is None:
-            if ele_tags is None:
-                return ds
-            else:
-                return ds.sel(eleTags=ele_tags)
-        else:
-            if resp_type not in list(ds.keys()):
-                raise ValueError(
-                    f"resp_type {resp_type} not found in {list(ds.keys())}"
-                )
-            if ele_tags is not None:
-                return ds[resp_type].sel(eleTags=ele_tags)
-            else:
-                return ds[resp_type]
+            return ds
+        return ds[resp_type]
 
 
 def _get_gauss_resp(ele_tags, dtype):
     all_stresses, all_strains = [], []
     for etag in ele_tags:
         etag = int(etag)
-        integr_point_stress = []
-        integr_point_strain = []
-        for i in range(100000000):  # Ugly but useful
-            # loop for integrPoint
-            stress_ = ops.eleResponse(etag, "material", f"{i + 1}", "stresses")
-            if len(stress_) == 0:
-                stress_ = ops.eleResponse(etag, "integrPoint", f"{i + 1}", "stresses")
-            stress_ = _reshape_stress(stress_)
-            strain_ = ops.eleResponse(etag, "material", f"{i + 1}", "strains")
-            if len(strain_) == 0:
-                strain_ = ops.eleResponse(etag, "integrPoint", f"{i + 1}", "strains")
-
-            if len(stress_) == 0 or len(strain_) == 0:
-                break
-            integr_point_stress.append(stress_)
-            integr_point_strain.append(strain_)
-        # Call material response directly
-        if len(integr_point_stress) == 0 or len(integr_point_strain) == 0:
-            stress = ops.eleResponse(etag, "stresses")
-            stress = _reshape_stress(stress)
-            strain = ops.eleResponse(etag, "strains")
-            if len(stress) > 0:
-                integr_point_stress.append(stress)
-            if len(strain) > 0:
-                integr_point_strain.append(strain)
+        stress_args, strain_args = ELE_RESP_NAMES.get_plan(etag, "gauss", _plan_gauss_resp)
+        integr_point_stress = [_reshape_stress(ops.eleResponse(etag, *args)) for args in stress_args]
+        integr_point_strain = [ops.eleResponse(etag, *args) for args in strain_args]
         # Finally, if void set to 0.0
         if len(integr_point_stress) == 0:
             integr_point_stress.append([np.nan, np.nan, np.nan])
@@ -251,6 +227,26 @@ def _get_gauss_resp(ele_tags, dtype):
     return stresses, strains
 
 
+def _plan_gauss_resp(etag):
+    """Discover the ``eleResponse`` arguments of the stresses and strains at each integration point."""
+    stress_args, strain_args = [], []
+    for i in range(100000000):  # Ugly but useful
+        # loop for integrPoint
+        stress_ = _probe_args(etag, [("material", f"{i + 1}", "stresses"), ("integrPoint", f"{i + 1}", "stresses")])
+        strain_ = _probe_args(etag, [("material", f"{i + 1}", "strains"), ("integrPoint", f"{i + 1}", "strains")])
+        if stress_ is None or strain_ is None:
+            break
+        stress_args.append(stress_)
+        strain_args.append(strain_)
+    # Call material response directly
+    if len(stress_args) == 0 or len(strain_args) == 0:
+        if len(ops.eleResponse(etag, "stresses")) > 0:
+            stress_args.append(("stresses",))
+        if len(ops.eleResponse(etag, "strains")) > 0:
+            strain_args.append(("strains",))
+    return stress_args, strain_args
+
+
 def _reshape_stress(stress):
     if len(stress) == 5:
         # σxx, σyy, σzz, σxy, ηr, where ηr is the ratio between the shear (deviatoric) stress and peak
@@ -261,35 +257,6 @@ def _reshape_stress(stress):
     return stress
 
 
-def _calculate_stresses_measures(stress_array, dtype):
-    """
-    Calculate various stresses from the stress values at Gaussian points.
-
-    Parameters:
-    stress_array (numpy.ndarray): A 4D array with shape (num_elements, num_gauss_points, num_stresses).
-
-    Returns:
-        dict: A dictionary containing the calculated stresses for each element.
-    """
-    # Extract individual stress components
-    sig11 = stress_array[..., 0]  # Normal stress in x-direction
-    sig22 = stress_array[..., 1]  # Normal stress in y-direction
-    sig12 = stress_array[..., 2]  # Normal stress in z-direction
-
-    # Calculate von Mises stress for each Gauss point
-    sig_vm = np.sqrt(sig11 ** 2 - sig11 * sig22 + sig22 ** 2 + 3 * sig12 ** 2)
-
-    # Calculate principal stresses (eigenvalues)
-    p1 = (sig11 + sig22) / 2 + np.sqrt(((sig11 - sig22) / 2) ** 2 + sig12 ** 2)
-    p2 = (sig11 + sig22) / 2 - np.sqrt(((sig11 - sig22) / 2) ** 2 + sig12 ** 2)
-
-    # Calculate maximum shear stress
-    tau_max = np.sqrt(((sig11 - sig22) / 2) ** 2 + sig12 ** 2)
-
-    data = np.stack([p1, p2, sig_vm, tau_max], axis=-1)
-
-    return data.astype(dtype["float"])
-
 # ----------------------------------------------------------------------------------------------
 #
 #
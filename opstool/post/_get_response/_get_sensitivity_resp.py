@@ -2,7 +2,7 @@ import numpy as np
 import openseespy.opensees as ops
 import xarray as xr
 
-from ._response_base import ResponseBase
+from ._response_base import ResponseBase, StepBuffer
 
 
 class SensitivityRespStepData(ResponseBase):
@@ -12,7 +12,8 @@ class SensitivityRespStepData(ResponseBase):
             ele_tags=None,
             sens_para_tags=None,
             model_update: bool = False,
-            dtype: dict = None
+            dtype: dict = None,
+            max_steps: int = None
     ):
         self.resp_names = [
             "disp",
@@ -35,6 +36,7 @@ class SensitivityRespStepData(ResponseBase):
         self.dtype = dict(int=np.int32, float=np.float32)
         if isinstance(dtype, dict):
             self.dtype.update(dtype)
+        self.max_steps = max_steps
 
         self.attrs = {
             "UX": "Displacement in X direction",
@@ -53,9 +55,10 @@ class SensitivityRespStepData(ResponseBase):
         self.resp_steps = None
         self.resp_steps_list = []
         for name in self.resp_names:
-            self.resp_steps_dict[name] = []
+            self.resp_steps_dict[name] = StepBuffer(self.max_steps)
         self.add_data_one_step(self.node_tags, self.sens_para_tags)
-        self.times = [0.0]
+        self.times = StepBuffer(self.max_steps)
+        self.times.append(0.0)
         self.step_track = 0
 
     def reset(self):
@@ -108,7 +111,7 @@ class SensitivityRespStepData(ResponseBase):
     def _to_xarray(self):
         if self.model_update:
             self.resp_steps = xr.concat(self.resp_steps_list, dim="time", join="outer")
-            self.resp_steps.coords["time"] = self.times
+            self.resp_steps.coords["time"] = self.times.view()
         else:
             data_vars = {}
             for name in ["disp", "vel", "accel"]:
@@ -2,7 +2,9 @@ import numpy as np
 import xarray as xr
 import openseespy.opensees as ops
 
-from ._response_base import ResponseBase, _expand_to_uniform_array
+from ._response_base import ResponseBase, StepBuffer, _select_resp, _scale_resp, _expand_to_uniform_array
+from ._stress_measures import MEASURES_3D, _calculate_measures_3D
+from ._ele_resp_names import ELE_RESP_NAMES
 
 
 # from ._response_extrapolation import (
@@ -15,7 +17,14 @@ from ._response_base import ResponseBase, _expand_to_uniform_array
 
 class ShellRespStepData(ResponseBase):
 
-    def __init__(self, ele_tags=None, model_update: bool = False, dtype: dict = None):
+    def __init__(
+            self,
+            ele_tags=None,
+            compute_measures: bool = True,
+            model_update: bool = False,
+            dtype: dict = None,
+            max_steps: int = None
+    ):
         self.resp_names = [
             "sectionForces",
             "sectionDeformations",
@@ -29,10 +38,12 @@ class ShellRespStepData(ResponseBase):
         self.ele_tags = ele_tags
         self.times = []
 
+        self.compute_measures = compute_measures
         self.model_update = model_update
         self.dtype = dict(int=np.int32, float=np.float32)
         if isinstance(dtype, dict):
             self.dtype.update(dtype)
+        self.max_steps = max_steps
 
         self.attrs = {
             "FXX,FYY,FXY": "Membrane (in-plane) forces or deformations.",
@@ -40,6 +51,11 @@ class ShellRespStepData(ResponseBase):
             "VXZ,VYZ": "Shear forces or deformations.",
             "sigma11, sigma22": "Normal stress (strain) along local x, y",
             "sigma12, sigma23, sigma13": "Shear stress (strain).",
+            "p1, p2, p3": "Principal stresses (strains) of the fiber layers, sigma33 is taken as zero.",
+            "sigma_vm": "Von Mises stress.",
+            "tau_max": "Maximum shear stress (strains).",
+            "sigma_oct": "Octahedral normal stress (strains).",
+            "tau_oct": "Octahedral shear stress (strains).",
         }
         self.GaussPoints = None
         self.secDOFs = ["FXX", "FYY", "FXY", "MXX", "MYY", "MXY", "VXZ", "VYZ"]
@@ -52,9 +68,10 @@ class ShellRespStepData(ResponseBase):
         self.resp_steps = None
         self.resp_steps_list = []
         for name in self.resp_names:
-            self.resp_steps_dict[name] = []
+            self.resp_steps_dict[name] = StepBuffer(self.max_steps)
         self.add_data_one_step(self.ele_tags)
-        self.times = [0.0]
+        self.times = StepBuffer(self.max_steps)
+        self.times.append(0.0)
         self.step_track = 0
 
     def reset(self):
@@ -98,7 +115,7 @@ class ShellRespStepData(ResponseBase):
     def _to_xarray(self):
         if self.model_update:
             self.resp_steps = xr.concat(self.resp_steps_list, dim="time", join="outer")
-            self.resp_steps.coords["time"] = self.times
+            self.resp_steps.coords["time"] = self.times.view()
         else:
             data_vars = dict()
             data_vars["sectionForces"] = (
@@ -116,7 +133,7 @@ class ShellRespStepData(ResponseBase):
             self.resp_steps = xr.Dataset(
                 data_vars=data_vars,
                 coords={
-                    "time": self.times,
+                    "time": self.times.view(),
                     "eleTags": self.ele_tags,
                     "GaussPoints": self.GaussPoints,
                     "secDOFs": self.secDOFs,
@@ -126,6 +143,40 @@ class ShellRespStepData(ResponseBase):
                 attrs=self.attrs,
             )
 
+        if self.compute_measures:
+            self._compute_measures_()
+
+    def _compute_measures_(self):
+        stresses = self.resp_steps["Stresses"]
+        strains = self.resp_steps["Strains"]
+
+        # sigma11, sigma22, sigma12, sigma23, sigma13 with sigma33 = 0
+        components = (0, 1, None, 2, 3, 4)
+        stress_measures = _calculate_measures_3D(stresses.data, dtype=self.dtype, components=components)
+        strain_measures = _calculate_measures_3D(strains.data, dtype=self.dtype, components=components)
+
+        dims = ["time", "eleTags", "GaussPoints", "fiberPoints", "measures"]
+        coords = {
+            "time": stresses.coords["time"],
+            "eleTags": stresses.coords["eleTags"],
+            "GaussPoints": stresses.coords["GaussPoints"],
+            "fiberPoints": stresses.coords["fiberPoints"],
+            "measures": MEASURES_3D,
+        }
+
+        self.resp_steps["stressMeasures"] = xr.DataArray(
+            stress_measures,
+            dims=dims,
+            coords=coords,
+            name="stressMeasures",
+        )
+        self.resp_steps["strainMeasures"] = xr.DataArray(
+            strain_measures,
+            dims=dims,
+            coords=coords,
+            name="strainMeasures",
+        )
+
     def get_data(self):
         return self.resp_steps
 
@@ -150,33 +201,28 @@ class ShellRespStepData(ResponseBase):
         moment_per_length_factor = unit_factors["moment_per_length"]
         stress_factor = unit_factors["stress"]
 
-        resp_steps["sectionForces"].loc[
-            {"secDOFs": ["FXX", "FYY", "FXY", "VXZ", "VYZ"]}
-        ] *= force_per_length_factor
-        resp_steps["sectionForces"].loc[
-            {"secDOFs": ["MXX", "MYY", "MXY"]}
-        ] *= moment_per_length_factor
-        resp_steps["Stresses"] *= stress_factor
+        resp_steps = _scale_resp(
+            resp_steps, "sectionForces", force_per_length_factor, "secDOFs", ["FXX", "FYY", "FXY", "VXZ", "VYZ"]
+        )
+        resp_steps = _scale_resp(
+            resp_steps, "sectionForces", moment_per_length_factor, "secDOFs", ["MXX", "MYY", "MXY"]
+        )
+        resp_steps = _scale_resp(resp_steps, "Stresses", stress_factor)
+        resp_steps = _scale_resp(resp_steps, "stressMeasures", stress_factor)
 
         return resp_steps
 
     @staticmethod
-    def read_response(dt: xr.DataTree, resp_type: str = None, ele_tags=None, unit_factors: dict = None):
-        ds = ShellRespStepData.read_file(dt, unit_factors=unit_factors)
+    def read_response(
+            dt: xr.DataTree, resp_type: str = None, ele_tags=None, unit_factors: dict = None, time_range=None
+    ):
+        ds = dt["/ShellResponses"].to_dataset()
+        ds = _select_resp(ds, resp_type=resp_type, tag_dim="eleTags", tags=ele_tags, time_range=time_range)
+        if unit_factors is not None:
+            ds = ShellRespStepData._unit_transform(ds, unit_factors)
         if resp_type is None:
-            if ele_tags is None:
-                return ds
-            else:
-                return ds.sel(eleTags=ele_tags)
-        else:
-            if resp_type not in list(ds.keys()):
-                raise ValueError(
-                    f"resp_type {resp_type} not found in {list(ds.keys())}"
-                )
-            if ele_tags is not None:
-                return ds[resp_type].sel(eleTags=ele_tags)
-            else:
-                return ds[resp_type]
+            return ds
+        return ds[resp_type]
 
 
 def _get_shell_resp_one_step(ele_tags, dtype):
@@ -190,15 +236,11 @@ def _get_shell_resp_one_step(ele_tags, dtype):
         sec_defos.append(np.reshape(defos, (-1, 8)))
         # stress and strains
         num_sec = int(len(forces) / 8)
+        layer_args = ELE_RESP_NAMES.get_plan(etag, "shell", _plan_shell_layers)
         sec_stress, sec_strain = [], []
-        for j in range(num_sec):
-            for k in range(100000000000000000):  # ugly but useful, loop for fiber layers
-                stress = ops.eleResponse(etag, "Material", f"{j + 1}", "fiber", f"{k + 1}", "stresses")
-                strain = ops.eleResponse(etag, "Material", f"{j + 1}", "fiber", f"{k + 1}", "strains")
-                if len(stress) == 0 or len(strain) == 0:
-                    break
-                sec_stress.extend(stress)
-                sec_strain.extend(strain)
+        for j, k in layer_args:
+            sec_stress.extend(ops.eleResponse(etag, "Material", j, "fiber", k, "stresses"))
+            sec_strain.extend(ops.eleResponse(etag, "Material", j, "fiber", k, "strains"))
         if len(sec_stress) == 0:
             sec_stress.extend([np.nan, np.nan, np.nan, np.nan, np.nan] * num_sec)
         if len(sec_strain) == 0:
@@ -213,6 +255,20 @@ def _get_shell_resp_one_step(ele_tags, dtype):
     strains = _expand_to_uniform_array(strains, dtype=dtype["float"])
     return sec_forces, sec_defos, stresses, strains
 
+
+def _plan_shell_layers(etag):
+    """Discover the (section, fiber layer) pairs of a shell element."""
+    num_sec = int(len(ops.eleResponse(etag, "stresses")) / 8)
+    layer_args = []
+    for j in range(num_sec):
+        for k in range(100000000000000000):  # ugly but useful, loop for fiber layers
+            stress = ops.eleResponse(etag, "Material", f"{j + 1}", "fiber", f"{k + 1}", "stresses")
+            strain = ops.eleResponse(etag, "Material", f"{j + 1}", "fiber", f"{k + 1}", "strains")
+            if len(stress) == 0 or len(strain) == 0:
+                break
+            layer_args.append((f"{j + 1}", f"{k + 1}"))
+    return layer_args
+
 # --------------------------------------------------------------------------
 # --------------------------------------------------------------------------
 # def _get_shell_resp(ele_tags):
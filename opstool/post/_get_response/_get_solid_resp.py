@@ -2,7 +2,9 @@ import numpy as np
 import openseespy.opensees as ops
 import xarray as xr
 
-from ._response_base import ResponseBase, _expand_to_uniform_array
+from ._response_base import ResponseBase, StepBuffer, _select_resp, _scale_resp, _expand_to_uniform_array
+from ._stress_measures import MEASURES_3D, _calculate_measures_3D
+from ._ele_resp_names import ELE_RESP_NAMES, _probe_args
 # from ...utils import OPS_ELE_TAGS
 
 class BrickRespStepData(ResponseBase):
@@ -12,7 +14,8 @@ class BrickRespStepData(ResponseBase):
             ele_tags=None,
             compute_measures: bool = True,
             model_update: bool = False,
-            dtype: dict = None
+            dtype: dict = None,
+            max_steps: int = None
     ):
         self.resp_names = [
             "Stresses",
@@ -30,6 +33,7 @@ class BrickRespStepData(ResponseBase):
         self.dtype = dict(int=np.int32, float=np.float32)
         if isinstance(dtype, dict):
             self.dtype.update(dtype)
+        self.max_steps = max_steps
 
         self.attrs = {
             "sigma11, sigma22, sigma33": "Normal stress (strain) along x, y, z.",
@@ -51,9 +55,10 @@ class BrickRespStepData(ResponseBase):
         self.resp_steps = None
         self.resp_steps_list = []
         for name in self.resp_names:
-            self.resp_steps_dict[name] = []
+            self.resp_steps_dict[name] = StepBuffer(self.max_steps)
         self.add_data_one_step(self.ele_tags)
-        self.times = [0.0]
+        self.times = StepBuffer(self.max_steps)
+        self.times.append(0.0)
         self.step_track = 0
 
     def reset(self):
@@ -97,7 +102,7 @@ class BrickRespStepData(ResponseBase):
     def _to_xarray(self):
         if self.model_update:
             self.resp_steps = xr.concat(self.resp_steps_list, dim="time", join="outer")
-            self.resp_steps.coords["time"] = self.times
+            self.resp_steps.coords["time"] = self.times.view()
         else:
             data_vars = dict()
             data_vars["Stresses"] = (
@@ -109,7 +114,7 @@ class BrickRespStepData(ResponseBase):
             self.resp_steps = xr.Dataset(
                 data_vars=data_vars,
                 coords={
-                    "time": self.times,
+                    "time": self.times.view(),
                     "eleTags": self.ele_tags,
                     "GaussPoints": self.GaussPoints,
                     "stressDOFs": self.stressDOFs,
@@ -125,15 +130,15 @@ class BrickRespStepData(ResponseBase):
         stresses = self.resp_steps["Stresses"]
         strains = self.resp_steps["Strains"]
 
-        stress_measures = _calculate_stresses_measures_4D(stresses.data, dtype=self.dtype)
-        strain_measures = _calculate_stresses_measures_4D(strains.data, dtype=self.dtype)
+        stress_measures = _calculate_measures_3D(stresses.data, dtype=self.dtype)
+        strain_measures = _calculate_measures_3D(strains.data, dtype=self.dtype)
 
         dims = ["time", "eleTags", "GaussPoints", "measures"]
         coords = {
             "time": stresses.coords["time"],
             "eleTags": stresses.coords["eleTags"],
             "GaussPoints": stresses.coords["GaussPoints"],
-            "measures": ["p1", "p2", "p3", "sigma_vm", "tau_max", "sigma_oct", "tau_oct"],
+            "measures": MEASURES_3D,
         }
 
         self.resp_steps["stressMeasures"] = xr.DataArray(
@@ -163,65 +168,42 @@ class BrickRespStepData(ResponseBase):
     @staticmethod
     def read_file(dt: xr.DataTree, unit_factors: dict = None):
         resp_steps = dt["/SolidResponses"].to_dataset()
+        if unit_factors is not None:
+            resp_steps = BrickRespStepData._unit_transform(resp_steps, unit_factors)
         return resp_steps
 
     @staticmethod
     def _unit_transform(resp_steps, unit_factors):
         stress_factor = unit_factors["stress"]
 
-        resp_steps["Stresses"].loc[
-            {"stressDOFs": ["sigma11", "sigma22", "sigma33", "sigma12", "sigma23", "sigma13"]}
-        ] *= stress_factor
-
-        resp_steps["stressMeasures"] *= stress_factor
+        resp_steps = _scale_resp(
+            resp_steps, "Stresses", stress_factor, "stressDOFs",
+            ["sigma11", "sigma22", "sigma33", "sigma12", "sigma23", "sigma13"]
+        )
+        resp_steps = _scale_resp(resp_steps, "stressMeasures", stress_factor)
 
         return resp_steps
 
     @staticmethod
-    def read_response(dt: xr.DataTree, resp_type: str = None, ele_tags=None, unit_factors: dict = None):
-        ds = BrickRespStepData.read_file(dt, unit_factors=unit_factors)
+    def read_response(
+            dt: xr.DataTree, resp_type: str = None, ele_tags=None, unit_factors: dict = None, time_range=None
+    ):
+        ds = dt["/SolidResponses"].to_dataset()
+        ds = _select_resp(ds, resp_type=resp_type, tag_dim="eleTags", tags=ele_tags, time_range=time_range)
+        if unit_factors is not None:
+            ds = BrickRespStepData._unit_transform(ds, unit_factors)
         if resp_type is None:
-            if ele_tags is None:
-                return ds
-            else:
-                return ds.sel(eleTags=ele_tags)
-        else:
-            if resp_type not in list(ds.keys()):
-                raise ValueError(
-                    f"resp_type {resp_type} not found in {list(ds.keys())}"
-                )
-            if ele_tags is not None:
-                return ds[resp_type].sel(eleTags=ele_tags)
-            else:
-                return ds[resp_type]
+            return ds
+        return ds[resp_type]
 
 
 def _get_gauss_resp(ele_tags, dtype: dict):
     all_stresses, all_strains = list(), list()
     for etag in ele_tags:
         etag = int(etag)
-        integr_point_stress = list()
-        integr_point_strain = list()
-        for i in range(100000000):  # Ugly but useful
-            # loop for integrPoint
-            stress_ = ops.eleResponse(etag, "material", f"{i+1}", "stresses")
-            if len(stress_) == 0:
-                stress_ = ops.eleResponse(etag, "integrPoint", f"{i+1}", "stresses")
-            strain_ = ops.eleResponse(etag, "material", f"{i+1}", "strains")
-            if len(strain_) == 0:
-                strain_ = ops.eleResponse(etag, "integrPoint", f"{i+1}", "strains")
-            if len(stress_) == 0 or len(strain_) == 0:
-                break
-            integr_point_stress.append(stress_)
-            integr_point_strain.append(strain_)
-        # Call material response directly
-        if len(integr_point_stress) == 0 or len(integr_point_strain) == 0:
-            stress = ops.eleResponse(etag, "stresses")
-            strain = ops.eleResponse(etag, "strains")
-            if len(stress) > 0:
-                integr_point_stress.append(stress)
-            if len(strain) > 0:
-                integr_point_strain.append(strain)
+        stress_args, strain_args = ELE_RESP_NAMES.get_plan(etag, "gauss", _plan_gauss_resp)
+        integr_point_stress = [ops.eleResponse(etag, *args) for args in stress_args]
+        integr_point_strain = [ops.eleResponse(etag, *args) for args in strain_args]
         # Finally, if void set to 0.0
         if len(integr_point_stress) == 0:
             integr_point_stress.append([np.nan, np.nan, np.nan, np.nan, np.nan, np.nan])
@@ -235,112 +217,21 @@ def _get_gauss_resp(ele_tags, dtype: dict):
     return stresses, strains
 
 
-def _calculate_stresses_measures_4D(stress_array, dtype):
-    """
-    Calculate various stresses from the stress values at Gaussian points.
-
-    Parameters:
-    stress_array (numpy.ndarray): A 4D array with shape (num_elements, num_gauss_points, num_stresses).
-
-    Returns:
-    dict: A dictionary containing the calculated stresses for each element.
-    """
-    # Extract individual stress components
-    sig11 = stress_array[..., 0]  # Normal stress in x-direction
-    sig22 = stress_array[..., 1]  # Normal stress in y-direction
-    sig33 = stress_array[..., 2]  # Normal stress in z-direction
-    sig12 = stress_array[..., 3]  # Shear stress in xy-plane
-    sig23 = stress_array[..., 4]  # Shear stress in yz-plane
-    sig13 = stress_array[..., 5]  # Shear stress in xz-plane
-
-    # Calculate von Mises stress for each Gauss point
-    sig_vm = np.sqrt(
-        0.5 * ((sig11 - sig22) ** 2 + (sig22 - sig33) ** 2 + (sig33 - sig11) ** 2)
-        + 3 * (sig12 ** 2 + sig13 ** 2 + sig23 ** 2)
-    )
-
-    # Calculate principal stresses
-    # Using the stress tensor to calculate eigenvalues
-    stress_tensor = _assemble_stress_tensor_4D(stress_array)
-    # Calculate principal stresses (eigenvalues)
-    principal_stresses = np.linalg.eigvalsh(stress_tensor)  # Returns sorted eigenvalues
-    p1 = principal_stresses[..., 2]  # Maximum principal stress
-    p2 = principal_stresses[..., 1]  # Intermediate principal stress
-    p3 = principal_stresses[..., 0]  # Minimum principal stress
-
-    # Calculate maximum shear stress
-    tau_max = np.abs(p1 - p3) / 2
-
-    # Calculate octahedral normal stress
-    sig_oct = (p1 + p2 + p3) / 3
-
-    # Calculate octahedral shear stress
-    tau_oct = 1 / 3 * np.sqrt((p1 - p2) ** 2 + (p2 - p3) ** 2 + (p3 - p1) ** 2)
-
-    data = np.stack([p1, p2, p3, sig_vm, tau_max, sig_oct, tau_oct], axis=-1)
-
-    return data.astype(dtype["float"])
-
-
-def _assemble_stress_tensor_3D(stress_array):
-    """
-    Assemble a 3D stress array into a 4D stress tensor array.
-    """
-    num_elements, num_gauss_points, _ = stress_array.shape
-    stress_tensor = np.full((num_elements, num_gauss_points, 3, 3), np.nan)
-    for i in range(num_elements):
-        for j in range(num_gauss_points):
-            sig11 = stress_array[i, j, 0]  # Normal stress in x-direction
-            sig22 = stress_array[i, j, 1]  # Normal stress in y-direction
-            sig33 = stress_array[i, j, 2]  # Normal stress in z-direction
-            tau12 = stress_array[i, j, 3]  # Shear stress in xy-plane
-            tau23 = stress_array[i, j, 4]  # Shear stress in yz-plane
-            tau13 = stress_array[i, j, 5]  # Shear stress in xz-plane
-            st = np.array(
-                [
-                    [sig11, tau12, tau13],
-                    [tau12, sig22, tau23],
-                    [tau13, tau23, sig33],
-                ]
-            )
-            stress_tensor[i, j, ...] = st
-    return np.nan_to_num(stress_tensor, nan=0.0)
-
-
-def _assemble_stress_tensor_4D(stress_array):
-    """
-    Assemble a 4D stress array [time, eleTags, GaussPoints, 6]
-    into a 5D stress tensor array [time, eleTags, GaussPoints, 3, 3].
-    Handles NaNs safely (returns 0.0 where data is missing).
-
-    Parameters:
-        stress_array (np.ndarray): shape (time, eleTags, GaussPoints, 6)
-
-    Returns:
-        np.ndarray: shape (time, eleTags, GaussPoints, 3, 3)
-    """
-    num_time, num_elements, num_gauss_points, _ = stress_array.shape
-    stress_tensor = np.full((num_time, num_elements, num_gauss_points, 3, 3), np.nan)
-
-    for t in range(num_time):
-        for i in range(num_elements):
-            for j in range(num_gauss_points):
-                sig11 = stress_array[t, i, j, 0]
-                sig22 = stress_array[t, i, j, 1]
-                sig33 = stress_array[t, i, j, 2]
-                tau12 = stress_array[t, i, j, 3]
-                tau23 = stress_array[t, i, j, 4]
-                tau13 = stress_array[t, i, j, 5]
-
-                if np.any(np.isnan([sig11, sig22, sig33, tau12, tau23, tau13])):
-                    continue  # skip invalid tensor
-
-                stress_tensor[t, i, j, ...] = np.array([
-                    [sig11, tau12, tau13],
-                    [tau12, sig22, tau23],
-                    [tau13, tau23, sig33]
-                ])
-
-    return np.nan_to_num(stress_tensor, nan=0.0)
-
-
+def _plan_gauss_resp(etag):
+    """Discover the ``eleResponse`` arguments of the stresses and strains at each integration point."""
+    stress_args, strain_args = list(), list()
+    for i in range(100000000):  # Ugly but useful
+        # loop for integrPoint
+        stress_ = _probe_args(etag, [("material", f"{i+1}", "stresses"), ("integrPoint", f"{i+1}", "stresses")])
+        strain_ = _probe_args(etag, [("material", f"{i+1}", "strains"), ("integrPoint", f"{i+1}", "strains")])
+        if stress_ is None or strain_ is None:
+            break
+        stress_args.append(stress_)
+        strain_args.append(strain_)
+    # Call material response directly
+    if len(stress_args) == 0 or len(strain_args) == 0:
+        if len(ops.eleResponse(etag, "stresses")) > 0:
+            stress_args.append(("stresses",))
+        if len(ops.eleResponse(etag, "strains")) > 0:
+            strain_args.append(("strains",))
+    return stress_args, strain_args
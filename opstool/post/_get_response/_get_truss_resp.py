@@ -2,12 +2,13 @@ import numpy as np
 import xarray as xr
 import openseespy.opensees as ops
 
-from ._response_base import ResponseBase
+from ._response_base import ResponseBase, StepBuffer, _select_resp, _scale_resp
+from ._ele_resp_names import ELE_RESP_NAMES
 
 
 class TrussRespStepData(ResponseBase):
 
-    def __init__(self, ele_tags=None, model_update: bool = False, dtype: dict = None):
+    def __init__(self, ele_tags=None, model_update: bool = False, dtype: dict = None, max_steps: int = None):
         self.resp_names = ["axialForce", "axialDefo", "Stress", "Strain"]
         self.resp_steps = None
         self.resp_steps_list = []  # for model update
@@ -20,6 +21,7 @@ class TrussRespStepData(ResponseBase):
         self.dtype = dict(int=np.int32, float=np.float32)
         if isinstance(dtype, dict):
             self.dtype.update(dtype)
+        self.max_steps = max_steps
 
         self.initialize()
 
@@ -27,9 +29,10 @@ class TrussRespStepData(ResponseBase):
         self.resp_steps = None
         self.resp_steps_list = []
         for name in self.resp_names:
-            self.resp_steps_dict[name] = []
+            self.resp_steps_dict[name] = StepBuffer(self.max_steps)
         self.add_data_one_step(self.ele_tags)
-        self.times = [0.0]
+        self.times = StepBuffer(self.max_steps)
+        self.times.append(0.0)
         self.step_track = 0
 
     def reset(self):
@@ -59,14 +62,14 @@ class TrussRespStepData(ResponseBase):
     def _to_xarray(self):
         if self.model_update:
             self.resp_steps = xr.concat(self.resp_steps_list, dim="time", join="outer")
-            self.resp_steps.coords["time"] = self.times
+            self.resp_steps.coords["time"] = self.times.view()
         else:
             data_vars = {}
             for name, data in self.resp_steps_dict.items():
                 data_vars[name] = (["time", "eleTags"], data)
             self.resp_steps = xr.Dataset(
                 data_vars=data_vars,
-                coords={"time": self.times, "eleTags": self.ele_tags},
+                coords={"time": self.times.view(), "eleTags": self.ele_tags},
             )
 
     def get_data(self):
@@ -93,29 +96,23 @@ class TrussRespStepData(ResponseBase):
         disp_factor = unit_factors["disp"]
         stress_factor = unit_factors["stress"]
 
-        resp_steps["axialForce"] *= force_factor
-        resp_steps["axialDefo"] *= disp_factor
-        resp_steps["Stress"] *= stress_factor
+        resp_steps = _scale_resp(resp_steps, "axialForce", force_factor)
+        resp_steps = _scale_resp(resp_steps, "axialDefo", disp_factor)
+        resp_steps = _scale_resp(resp_steps, "Stress", stress_factor)
 
         return resp_steps
 
     @staticmethod
-    def read_response(dt: xr.DataTree, resp_type: str = None, ele_tags=None, unit_factors: dict = None):
-        ds = TrussRespStepData.read_file(dt, unit_factors=unit_factors)
+    def read_response(
+            dt: xr.DataTree, resp_type: str = None, ele_tags=None, unit_factors: dict = None, time_range=None
+    ):
+        ds = dt["/TrussResponses"].to_dataset()
+        ds = _select_resp(ds, resp_type=resp_type, tag_dim="eleTags", tags=ele_tags, time_range=time_range)
+        if unit_factors is not None:
+            ds = TrussRespStepData._unit_transform(ds, unit_factors)
         if resp_type is None:
-            if ele_tags is None:
-                return ds
-            else:
-                return ds.sel(eleTags=ele_tags)
-        else:
-            if resp_type not in list(ds.keys()):
-                raise ValueError(
-                    f"resp_type {resp_type} not found in {list(ds.keys())}"
-                )
-            if ele_tags is not None:
-                return ds[resp_type].sel(eleTags=ele_tags)
-            else:
-                return ds[resp_type]
+            return ds
+        return ds[resp_type]
 
 
 def _get_truss_resp(truss_tags, dtype: dict):
@@ -129,9 +126,9 @@ def _get_truss_resp(truss_tags, dtype: dict):
         stress = ops.eleResponse(etag, "material", "1", "stress")
         stress = _reshape_resp(stress)
 
-        strain = ops.eleResponse(etag, "material", "1", "strain")
-        if len(strain) == 0:
-            strain = ops.eleResponse(etag, "section", "1", "deformation")
+        strain = ELE_RESP_NAMES.get_response(
+            etag, (("material", "1", "strain"), ("section", "1", "deformation"))
+        )
         strain = _reshape_resp(strain)
 
         forces.append(force)
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 import numpy as np
+import xarray as xr
 
 
 class ResponseBase(ABC):
@@ -32,6 +33,131 @@ class ResponseBase(ABC):
     def read_file(self, *args):
         """Read response data from a file."""
 
+    def clear_steps(self):
+        """Discard the buffered steps after they have been written to a file."""
+        self.resp_steps = None
+        self.resp_steps_list = []
+        for name in self.resp_steps_dict.keys():
+            self.resp_steps_dict[name].clear()
+        self.times.clear()
+
+
+class StepBuffer:
+    """A preallocated array to store the data of each analysis step.
+
+    The data of each step are written in place into a contiguous array,
+    whose capacity is doubled when it is full.
+    If ``max_steps`` is given, the buffer is a fixed-capacity ring buffer
+    that only keeps the last ``max_steps`` steps.
+
+    The buffer can be passed directly to NumPy and xarray,
+    which take a view of the stored steps without copying
+    (except for a ring buffer that has wrapped around).
+
+    Parameters
+    -----------
+    max_steps: int, default: None
+        The maximum number of steps to be kept, None means all steps are kept.
+    capacity: int, default: 64
+        The initial capacity of the buffer, ignored if ``max_steps`` is given.
+    """
+
+    def __init__(self, max_steps: int = None, capacity: int = 64):
+        if max_steps is not None and max_steps < 1:
+            raise ValueError("max_steps must be a positive integer!")
+        self.max_steps = max_steps
+        self.capacity = max_steps if max_steps is not None else max(int(capacity), 1)
+        self.data = None
+        self.num_steps = 0  # number of steps currently stored
+        self.start = 0  # position of the oldest step in the ring buffer
+
+    def __len__(self):
+        return self.num_steps
+
+    def __array__(self, dtype=None, copy=None):
+        data = self.view()
+        if dtype is not None:
+            data = data.astype(dtype, copy=False)
+        return data
+
+    def append(self, data):
+        data = np.asarray(data)
+        if self.data is None:
+            self.data = np.empty((self.capacity,) + data.shape, dtype=data.dtype)
+        elif data.shape != self.data.shape[1:]:
+            raise ValueError(
+                f"The shape {data.shape} of the step data does not match "
+                f"the shape {self.data.shape[1:]} of the previous steps!"
+            )
+        if self.max_steps is None:
+            if self.num_steps == self.capacity:
+                self._grow()
+            self.data[self.num_steps] = data
+            self.num_steps += 1
+        elif self.num_steps < self.capacity:
+            self.data[self.num_steps] = data
+            self.num_steps += 1
+        else:
+            self.data[self.start] = data
+            self.start = (self.start + 1) % self.capacity
+
+    def view(self):
+        """Return the stored steps in order, as an array of shape (num_steps, ...)."""
+        if self.data is None:
+            return np.empty((0,))
+        if self.start == 0:
+            return self.data[: self.num_steps]
+        return np.concatenate((self.data[self.start:], self.data[: self.start]), axis=0)
+
+    def clear(self):
+        self.num_steps = 0
+        self.start = 0
+
+    def _grow(self):
+        self.capacity *= 2
+        data = np.empty((self.capacity,) + self.data.shape[1:], dtype=self.data.dtype)
+        data[: self.num_steps] = self.data[: self.num_steps]
+        self.data = data
+
+
+def _select_resp(resp_steps: xr.Dataset, resp_type: str = None, tag_dim: str = None, tags=None, time_range=None):
+    """Select the responses to be read before any data is loaded,
+    so that only the needed hyperslabs are read from a lazily opened file.
+    """
+    if resp_type is not None:
+        if resp_type not in list(resp_steps.keys()):
+            raise ValueError(
+                f"resp_type {resp_type} not found in {list(resp_steps.keys())}"
+            )
+        resp_steps = resp_steps[[resp_type]]
+    if tags is not None:
+        resp_steps = resp_steps.sel({tag_dim: tags})
+    if time_range is not None:
+        resp_steps = resp_steps.sel(time=slice(*time_range))
+    return resp_steps
+
+
+def _scale_resp(resp_steps, name: str, factor: float, dim: str = None, labels: list = None):
+    """Multiply the response ``name`` by a unit factor,
+    only the entries labelled by ``labels`` along ``dim`` are scaled if ``dim`` is given.
+
+    A new array is assigned rather than modifying the data in place,
+    so lazily loaded (e.g., dask-backed) data remain lazy.
+    Responses that are not present are skipped.
+    """
+    if name not in resp_steps:
+        return resp_steps
+    data = resp_steps[name]
+    dtype = data.dtype if data.dtype.kind == "f" else float
+    if dim is None:
+        factor = np.asarray(factor, dtype=dtype)
+    else:
+        scale = np.where(np.isin(data.coords[dim].values, labels), factor, 1.0)
+        factor = xr.DataArray(scale.astype(dtype), coords={dim: data.coords[dim].values}, dims=(dim,))
+    with xr.set_options(keep_attrs=True):
+        resp_steps[name] = (data * factor).rename(data.name)
+    return resp_steps
+
 
 def _expand_to_uniform_array(array_list, dtype=None):
     """
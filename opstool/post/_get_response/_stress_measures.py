@@ -0,0 +1,109 @@
+"""
+Vectorized stress (strain) measures at integration points.
+
+The principal values of the symmetric 3x3 tensors are computed in closed form,
+and the leading (time) axis is processed in chunks to bound the memory of the temporaries.
+Points with any NaN component get NaN measures.
+"""
+
+import numpy as np
+
+MEASURES_2D = ["p1", "p2", "sigma_vm", "tau_max"]
+MEASURES_3D = ["p1", "p2", "p3", "sigma_vm", "tau_max", "sigma_oct", "tau_oct"]
+
+
+def _calculate_measures_2D(resp_array, dtype, components=(0, 1, 2), max_points: int = 2 ** 20):
+    """Calculate the in-plane measures ``p1, p2, sigma_vm, tau_max``.
+
+    Parameters
+    -----------
+    resp_array: np.ndarray
+        The stresses (strains) with the components along the last axis.
+    dtype: dict
+        The precision types, only ``dtype["float"]`` is used.
+    components: tuple, default: (0, 1, 2)
+        The indices of ``sigma11, sigma22, sigma12`` along the last axis.
+    max_points: int, default: 2 ** 20
+        The approximate maximum number of points processed at once,
+        the first (time) axis is split into chunks accordingly.
+
+    Returns
+    --------
+    np.ndarray, the measures along the last axis.
+    """
+    return _apply_in_chunks(_measures_2d, resp_array, components, len(MEASURES_2D), dtype, max_points)
+
+
+def _calculate_measures_3D(resp_array, dtype, components=(0, 1, 2, 3, 4, 5), max_points: int = 2 ** 20):
+    """Calculate the measures ``p1, p2, p3, sigma_vm, tau_max, sigma_oct, tau_oct``.
+
+    Parameters
+    -----------
+    resp_array: np.ndarray
+        The stresses (strains) with the components along the last axis.
+    dtype: dict
+        The precision types, only ``dtype["float"]`` is used.
+    components: tuple, default: (0, 1, 2, 3, 4, 5)
+        The indices of ``sigma11, sigma22, sigma33, sigma12, sigma23, sigma13`` along the last axis,
+        None for a component that is zero, e.g., ``sigma33`` in shell layers.
+    max_points: int, default: 2 ** 20
+        The approximate maximum number of points processed at once,
+        the first (time) axis is split into chunks accordingly.
+
+    Returns
+    --------
+    np.ndarray, the measures along the last axis.
+    """
+    return _apply_in_chunks(_measures_3d, resp_array, components, len(MEASURES_3D), dtype, max_points)
+
+
+def _apply_in_chunks(func, resp_array, components, num_measures, dtype, max_points):
+    resp_array = np.asarray(resp_array)
+    out = np.empty(resp_array.shape[:-1] + (num_measures,), dtype=dtype["float"])
+    if resp_array.ndim == 1:
+        out[...] = func(_split_components(resp_array, components))
+        return out
+    points_per_row = int(np.prod(resp_array.shape[1:-1]))
+    chunk_size = max(int(max_points) // max(points_per_row, 1), 1)
+    for start in range(0, resp_array.shape[0], chunk_size):
+        chunk = resp_array[start: start + chunk_size]
+        out[start: start + chunk_size] = func(_split_components(chunk, components))
+    return out
+
+
+def _split_components(chunk, components):
+    chunk = chunk.astype(np.float64)
+    zeros = np.zeros(chunk.shape[:-1])
+    return [zeros if idx is None else chunk[..., idx] for idx in components]
+
+
+def _measures_2d(comps):
+    sig11, sig22, sig12 = comps
+    center = (sig11 + sig22) / 2
+    radius = np.sqrt(((sig11 - sig22) / 2) ** 2 + sig12 ** 2)
+    sig_vm = np.sqrt(sig11 ** 2 - sig11 * sig22 + sig22 ** 2 + 3 * sig12 ** 2)
+    return np.stack([center + radius, center - radius, sig_vm, radius], axis=-1)
+
+
+def _measures_3d(comps):
+    sig11, sig22, sig33, sig12, sig23, sig13 = comps
+    sig_oct = (sig11 + sig22 + sig33) / 3
+    s11, s22, s33 = sig11 - sig_oct, sig22 - sig_oct, sig33 - sig_oct
+    # s:s = 2 * J2 of the deviatoric tensor
+    ss = s11 ** 2 + s22 ** 2 + s33 ** 2 + 2 * (sig12 ** 2 + sig23 ** 2 + sig13 ** 2)
+    det = (
+        s11 * s22 * s33 + 2 * sig12 * sig23 * sig13
+        - s11 * sig23 ** 2 - s22 * sig13 ** 2 - s33 * sig12 ** 2
+    )
+    # Trigonometric solution of the characteristic equation
+    p = np.sqrt(ss / 6)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.where(p > 0, det / (2 * p ** 3), 0.0)
+    phi = np.arccos(np.clip(r, -1.0, 1.0)) / 3
+    p1 = sig_oct + 2 * p * np.cos(phi)
+    p3 = sig_oct + 2 * p * np.cos(phi + 2 * np.pi / 3)
+    p2 = 3 * sig_oct - p1 - p3
+    sig_vm = np.sqrt(1.5 * ss)
+    tau_max = (p1 - p3) / 2
+    tau_oct = np.sqrt(ss / 3)
+    return np.stack([p1, p2, p3, sig_vm, tau_max, sig_oct, tau_oct], axis=-1)
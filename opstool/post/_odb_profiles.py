@@ -0,0 +1,97 @@
+"""
+Storage profiles of the output database (ODB).
+
+A profile chooses the codec, shuffle filter, chunk shape and lossy float quantization of each variable
+when the ODB is written to a NetCDF4 file.
+"""
+
+import math
+
+import netCDF4
+import numpy as np
+import xarray as xr
+
+ODB_PROFILES = {
+    # Lossless with the best compression ratio, for long-term storage.
+    "archive": dict(compression="zstd", complevel=9, shuffle=True, time_chunk=256, significant_digits=None),
+    # Light and fast compression, close to the uncompressed writing speed.
+    "fast-write": dict(compression="blosc_lz4", complevel=1, shuffle=True, time_chunk=1024, significant_digits=None),
+    # Responses quantized to 4 significant digits and chunked by step, so that each frame is read cheaply.
+    "visualization": dict(compression="zstd", complevel=3, shuffle=True, time_chunk=1, significant_digits=4),
+}
+
+MAX_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+def get_odb_encoding(dt: xr.DataTree, profile: str = None, zlib: bool = False):
+    """Build the per-variable encoding of an ODB data tree.
+
+    Parameters
+    -----------
+    dt: xr.DataTree
+        The data tree to be written.
+    profile: str, default: None
+        One of "archive", "fast-write" and "visualization".
+    zlib: bool, default: False
+        If True and ``profile`` is None, all variables are compressed by zlib with ``complevel=5``.
+
+    Returns
+    --------
+    dict or None, keyed by the group paths, then by the variable names.
+    """
+    if profile is None:
+        if not zlib:
+            return None
+        options = dict(compression="zlib", complevel=5, shuffle=False, time_chunk=None, significant_digits=None)
+    else:
+        if profile not in ODB_PROFILES:
+            raise ValueError(f"Unsupported storage profile {profile}, should be one of {list(ODB_PROFILES)}!")
+        options = ODB_PROFILES[profile]
+    compression = _get_available_compression(options["compression"])
+
+    encoding = dict()
+    for node in dt.subtree:
+        if not node.has_data:
+            continue
+        # The model information, e.g., the nodal coordinates, is never quantized.
+        lossy = not node.path.startswith("/ModelInfo")
+        node_encoding = dict()
+        for name, var in node.data_vars.items():
+            if var.ndim == 0 or 0 in var.shape or var.dtype.kind not in "biuf":
+                continue
+            var_encoding = dict(
+                compression=compression,
+                complevel=options["complevel"],
+                shuffle=options["shuffle"],
+                chunksizes=_get_chunksizes(var, options["time_chunk"]),
+            )
+            if lossy and options["significant_digits"] is not None and var.dtype.kind == "f":
+                var_encoding["significant_digits"] = options["significant_digits"]
+                var_encoding["quantize_mode"] = "GranularBitRound"
+            node_encoding[name] = var_encoding
+        encoding[node.path] = node_encoding
+    return encoding
+
+
+def _get_available_compression(compression: str):
+    if compression == "zstd" and not netCDF4.__has_zstandard_support__:
+        return "zlib"
+    if compression.startswith("blosc") and not netCDF4.__has_blosc_support__:
+        return "zlib"
+    return compression
+
+
+def _get_chunksizes(var: xr.DataArray, time_chunk: int = None):
+    """Chunk along the time axis by ``time_chunk`` steps, and split the largest entity axis
+    (e.g., nodes or elements) until a chunk fits in ``MAX_CHUNK_BYTES``."""
+    chunks = [
+        min(time_chunk, size) if dim == "time" and time_chunk is not None else size
+        for dim, size in zip(var.dims, var.shape)
+    ]
+    axes = [i for i, dim in enumerate(var.dims) if dim != "time"]
+    while len(axes) > 0 and np.prod(chunks) * var.dtype.itemsize > MAX_CHUNK_BYTES:
+        axis = max(axes, key=lambda i: chunks[i])
+        if chunks[axis] == 1:
+            break
+        chunks[axis] = math.ceil(chunks[axis] / 2)
+    return tuple(int(chunk) for chunk in chunks)
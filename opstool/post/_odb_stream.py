@@ -0,0 +1,112 @@
+"""
+Streaming writer for the output database (ODB).
+
+The response data are written to a NetCDF4 file with an unlimited ``time`` dimension,
+so that the steps buffered in memory can be flushed to disk during the analysis.
+"""
+
+import os
+import numpy as np
+import xarray as xr
+import netCDF4
+
+
+class ODBStreamWriter:
+    """Append response groups of an ODB to a NetCDF4 file chunk by chunk.
+
+    Parameters
+    -----------
+    filename: str
+        The output file name.
+    save_every: int
+        The number of steps in each chunk, also used as the chunk size along the time dimension.
+    """
+
+    def __init__(self, filename: str, save_every: int):
+        self.filename = filename
+        self.save_every = int(save_every)
+        if self.save_every < 1:
+            raise ValueError("save_every must be a positive integer!")
+        self.num_chunks = 0
+        self.written_groups = set()
+
+    def reset(self):
+        self.num_chunks = 0
+        self.written_groups = set()
+
+    def is_started(self):
+        return self.num_chunks > 0
+
+    def write(self, dt: xr.DataTree):
+        """Write a chunk of steps, the first chunk creates the file.
+
+        Parameters
+        -----------
+        dt: xr.DataTree
+            The data tree holding the buffered steps of each response group.
+        """
+        if not self.is_started():
+            self._create(dt)
+        else:
+            self._append(dt)
+        self.num_chunks += 1
+
+    def write_static(self, dt: xr.DataTree):
+        """Write groups that do not change during the analysis, e.g., the model information.
+        Must be called after the first chunk has been written.
+        """
+        dt.to_netcdf(self.filename, mode="a", engine="netcdf4")
+
+    def _create(self, dt: xr.DataTree):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+        unlimited_dims, encoding = dict(), dict()
+        for node in dt.subtree:
+            if not node.has_data or "time" not in node.dims:
+                continue
+            unlimited_dims[node.path] = ["time"]
+            encoding[node.path] = self._get_time_chunk_encoding(node.to_dataset())
+        dt.to_netcdf(
+            self.filename, mode="w", engine="netcdf4",
+            unlimited_dims=unlimited_dims, encoding=encoding
+        )
+        self.written_groups = {node.path for node in dt.subtree if node.has_data}
+
+    def _append(self, dt: xr.DataTree):
+        with netCDF4.Dataset(self.filename, mode="a") as nc:
+            for node in dt.subtree:
+                if not node.has_data:
+                    continue
+                if node.path not in self.written_groups:
+                    raise RuntimeError(
+                        f"Group {node.path} does not exist in {self.filename}, "
+                        "the responses to be saved can not change during the analysis!"
+                    )
+                if "time" not in node.dims:
+                    continue
+                grp = nc[node.path]
+                start = grp.dimensions["time"].size
+                stop = start + node.sizes["time"]
+                for name, var in node.variables.items():
+                    if "time" not in var.dims:
+                        continue
+                    if tuple(grp.variables[name].dimensions) != tuple(var.dims):
+                        raise RuntimeError(
+                            f"The dimensions of {node.path}/{name} changed during the analysis!"
+                        )
+                    index = tuple(
+                        slice(start, stop) if dim == "time" else slice(None) for dim in var.dims
+                    )
+                    grp.variables[name][index] = np.asarray(var.values)
+
+    def _get_time_chunk_encoding(self, ds: xr.Dataset):
+        encoding = dict()
+        for name, var in ds.variables.items():
+            if "time" not in var.dims or var.dtype.kind not in "biuf" or 0 in var.shape:
+                continue
+            chunksizes = [
+                self.save_every if dim == "time" else int(size)
+                for dim, size in zip(var.dims, var.shape)
+            ]
+            encoding[name] = {"chunksizes": tuple(chunksizes)}
+        return encoding
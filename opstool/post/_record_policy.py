@@ -0,0 +1,63 @@
+"""
+Recording policies deciding at which analysis steps the full response fields are recorded.
+"""
+
+import openseespy.opensees as ops
+
+
+class RecordPolicy:
+    """Decide whether the full response fields are recorded at the current step.
+
+    A step is recorded if any of the active policies fires.
+    If no policy is active, every step is recorded.
+
+    Parameters
+    -----------
+    every: int, default: None
+        Record every ``every`` steps.
+    interval: float, default: None
+        Record when the analysis time has advanced by at least ``interval`` since the last recorded step.
+    triggered: bool, default: False
+        Whether a threshold-triggered policy is active,
+        the trigger state of each step is passed to :meth:`should_record`.
+    """
+
+    def __init__(self, every: int = None, interval: float = None, triggered: bool = False):
+        if every is not None and int(every) < 1:
+            raise ValueError("record_every must be a positive integer!")
+        if interval is not None and interval <= 0:
+            raise ValueError("record_interval must be positive!")
+        self.every = int(every) if every is not None else None
+        self.interval = interval
+        self.triggered = triggered
+        self.step = 0
+        self.last_time = 0.0
+        self.reset()
+
+    def reset(self):
+        self.step = 0
+        self.last_time = ops.getTime()
+
+    def is_active(self):
+        return self.every is not None or self.interval is not None or self.triggered
+
+    def should_record(self, triggered: bool = False):
+        """Advance one step and return whether the full fields are recorded at this step.
+
+        Parameters
+        -----------
+        triggered: bool, default: False
+            Whether a threshold is reached at this step.
+        """
+        self.step += 1
+        if not self.is_active():
+            return True
+        time = ops.getTime()
+        record = triggered
+        if self.every is not None and self.step % self.every == 0:
+            record = True
+        if self.interval is not None and time - self.last_time >= self.interval * (1 - 1e-10):
+            record = True
+        if record:
+            self.last_time = time
+        return record
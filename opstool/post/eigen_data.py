@@ -5,7 +5,7 @@ from typing import Union
 import openseespy.opensees as ops
 
 from ..utils import CONSTANTS, get_random_color
-from .model_data import GetFEMData
+from .model_data import _get_model_data_from_domain
 
 RESULTS_DIR = CONSTANTS.get_output_dir()
 CONSOLE = CONSTANTS.get_console()
@@ -138,7 +138,7 @@ def save_eigen_data(
     """
     output_filename = RESULTS_DIR + "/" + f"{EIGEN_FILE_NAME}-{odb_tag}.nc"
     # -----------------------------------------------------------------
-    model_info, _ = GetFEMData().get_model_info()
+    model_info, _ = _get_model_data_from_domain()
     modal_props, eigen_vectors = _get_eigen_info(mode_tag, solver)
     eigen_data = dict()
     for key in model_info.keys():
@@ -2,8 +2,13 @@
 This file contains functions to get data from the current domain of OpenSeesPy
 """
 
+import hashlib
 import os
+import time
+from collections import OrderedDict
+import netCDF4
 import numpy as np
+import openseespy.opensees as ops
 import xarray as xr
 from typing import Union
 
@@ -15,6 +20,10 @@ CONSOLE = CONSTANTS.get_console()
 PKG_PREFIX = CONSTANTS.get_pkg_prefix()
 MODEL_FILE_NAME = CONSTANTS.get_model_filename()
 
+# key: ("domain", fingerprint) or ("file", filename, mtime), value: (model_info, cells)
+_MODEL_DATA_CACHE = OrderedDict()
+_MODEL_DATA_CACHE_SIZE = 8
+
 class GetFEMData(FEMData):
 
     def __init__(self):
@@ -421,13 +430,22 @@ class GetFEMData(FEMData):
         )
 
     def get_model_info(self):
+        start = time.perf_counter()
         nodal_data = self.get_nodal_data()
         node_fixed_data = self.get_node_fixed_data()
+        self.timings["nodes"] = time.perf_counter() - start
+        start = time.perf_counter()
         nodal_load_data = self.get_nodal_load_data()
         ele_load_data = self.get_ele_load_data()
         mp_constraint_data = self.get_mp_constraint_data()
+        self.timings["loadsAndConstraints"] = time.perf_counter() - start
 
+        start = time.perf_counter()
         ele_data = self.get_ele_data()
+        # the stages of _make_ele_info are recorded separately
+        self.timings["eleData"] = time.perf_counter() - start - sum(
+            self.timings[key] for key in ("eleQuery", "eleGroups", "eleCells")
+        )
 
         # ----------------------------------------------------------------
         # update and save the model info
@@ -445,6 +463,107 @@ class GetFEMData(FEMData):
 
         return self.MODEL_INFO, self.ELE_CELLS
 
+    def print_timings(self):
+        """Print the time spent in each stage of the last :meth:`get_model_info` call."""
+        total = sum(self.timings.values())
+        lines = [f"{PKG_PREFIX} Model data built in {total:.3f} s:"]
+        for stage, seconds in self.timings.items():
+            lines.append(f"    {stage:<20s}{seconds:>10.4f} s")
+        CONSOLE.print("\n".join(lines))
+
+
+def get_model_fingerprint() -> str:
+    """Get the fingerprint of the model state in the current domain.
+
+    It is a hash of the numbers and tags of nodes and elements, the nodal coordinates,
+    the element classes and connectivity, the local axes of the two-node elements,
+    the fixities, the multipoint constraints and the load patterns.
+    The same fingerprint means the model data need not be rebuilt.
+
+    Returns
+    --------
+    str, the hex digest.
+    """
+    hasher = hashlib.sha1()
+
+    def update(values, dtype=np.float64):
+        hasher.update(np.asarray(values, dtype=dtype).tobytes())
+        hasher.update(b"|")
+
+    node_tags, ele_tags = ops.getNodeTags(), ops.getEleTags()
+    update([len(node_tags), len(ele_tags)], np.int64)
+    update(node_tags, np.int64)
+    coords = [ops.nodeCoord(tag) for tag in node_tags]
+    update([len(coord) for coord in coords], np.int64)
+    update([value for coord in coords for value in coord])
+    update(ele_tags, np.int64)
+    class_tags = [ops.getEleClassTags(tag) for tag in ele_tags]
+    class_tags = [tag if isinstance(tag, int) else tag[0] for tag in class_tags]
+    update(class_tags, np.int64)
+    ele_nodes = [ops.eleNodes(tag) for tag in ele_tags]
+    update([len(nodes) for nodes in ele_nodes], np.int64)
+    update([tag for nodes in ele_nodes for tag in nodes], np.int64)
+    # the orientation of beams and links, e.g., a changed vecxz of the geometric transformation
+    positions = [i for i, nodes in enumerate(ele_nodes) if len(nodes) == 2]
+    update(FEMData._get_local_axes([ele_tags[i] for i in positions], [class_tags[i] for i in positions]))
+    fixed_nodes = ops.getFixedNodes()
+    update(fixed_nodes, np.int64)
+    update([dof for tag in fixed_nodes for dof in [-1] + list(ops.getFixedDOFs(tag))], np.int64)
+    for tag in ops.getRetainedNodes():
+        constrained_nodes = ops.getConstrainedNodes(tag)
+        update([tag] + list(constrained_nodes), np.int64)
+        for tag2 in constrained_nodes:
+            update(ops.getConstrainedDOFs(tag2, tag), np.int64)
+            update(ops.getRetainedDOFs(tag, tag2), np.int64)
+    for pattern in ops.getPatterns():
+        update([pattern], np.int64)
+        update(ops.getNodeLoadTags(pattern), np.int64)
+        update(ops.getNodeLoadData(pattern))
+        update(ops.getEleLoadTags(pattern), np.int64)
+        update(ops.getEleLoadClassTags(pattern), np.int64)
+        update(ops.getEleLoadData(pattern))
+    return hasher.hexdigest()
+
+
+def _get_cached_model_data(key):
+    if key not in _MODEL_DATA_CACHE:
+        return None
+    _MODEL_DATA_CACHE.move_to_end(key)
+    return _copy_model_data(*_MODEL_DATA_CACHE[key])
+
+
+def _copy_model_data(model_info, cells):
+    # the callers get copies of the DataArrays, so that their changes do not reach the cached snapshot
+    return {name: data.copy() for name, data in model_info.items()}, {name: data.copy() for name, data in cells.items()}
+
+
+def _set_cached_model_data(key, model_info, cells):
+    _MODEL_DATA_CACHE[key] = _copy_model_data(model_info, cells)
+    _MODEL_DATA_CACHE.move_to_end(key)
+    while len(_MODEL_DATA_CACHE) > _MODEL_DATA_CACHE_SIZE:
+        _MODEL_DATA_CACHE.popitem(last=False)
+
+
+def _get_model_data_from_domain(fingerprint: str = None):
+    """Get the model data of the current domain, the snapshot is reused if the fingerprint is unchanged."""
+    if fingerprint is None:
+        fingerprint = get_model_fingerprint()
+    data = _get_cached_model_data(("domain", fingerprint))
+    if data is None:
+        data = GetFEMData().get_model_info()
+        _set_cached_model_data(("domain", fingerprint), *data)
+    return data
+
+
+def _read_fingerprint(filename: str):
+    if not os.path.exists(filename):
+        return None
+    try:
+        with netCDF4.Dataset(filename, "r") as ds:
+            return getattr(ds, "fingerprint", None)
+    except OSError:
+        return None
+
 
 def save_model_data(
         odb_tag: Union[str, int] = 1,
@@ -456,14 +575,24 @@ def save_model_data(
        as the data structure, it is saved in
        `netCDF <https://docs.xarray.dev/en/stable/user-guide/io.html>`_ format.
 
+    .. Note::
+       The fingerprint of the model state (see :func:`get_model_fingerprint`) is stored in the file,
+       if the file already holds the data of the same model state, it is not rewritten.
+
     Parameters
     ----------
     odb_tag: Union[str, int], default = 1
         Output database tag, the data will be saved in ``ModelData-{odb_tag}.nc``.
     """
     output_filename = RESULTS_DIR + "/" + f"{MODEL_FILE_NAME}-{odb_tag}.nc"
-    model_data = GetFEMData()
-    model_info, cells = model_data.get_model_info()
+    fingerprint = get_model_fingerprint()
+    color = get_random_color()
+    if _read_fingerprint(output_filename) == fingerprint:
+        CONSOLE.print(
+            f"{PKG_PREFIX} Model data in [bold {color}]{output_filename}[/] is up to date!"
+        )
+        return
+    model_info, cells = _get_model_data_from_domain(fingerprint)
     model_data = dict()
     for key in model_info.keys():
         model_data[f"ModelInfo/{key}"] = xr.Dataset({key: model_info[key]})
@@ -473,9 +602,9 @@ def save_model_data(
     else:
         model_data["Cells"] = xr.Dataset()
     dt = xr.DataTree.from_dict(model_data, name=f"{MODEL_FILE_NAME}")
+    dt.attrs["fingerprint"] = fingerprint
     dt.to_netcdf(output_filename, mode="w", engine="netcdf4")
     # /////////////////////////////////////
-    color = get_random_color()
     CONSOLE.print(
         f"{PKG_PREFIX} Model data has been saved to [bold {color}]{output_filename}[/]!"
     )
@@ -487,12 +616,18 @@ def load_model_data(
 ) -> tuple[dict[str, xr.DataArray], dict[str, xr.DataArray]]:
     """Get the model data from the saved file.
 
+    .. Note::
+       The model data are cached in memory, keyed by the fingerprint of the model state
+       (see :func:`get_model_fingerprint`) or by the file and its modification time,
+       so repeated calls on the same model return the existing snapshot.
+
     Parameters
     ----------
     odb_tag: Union[str, int], default = 1
         Output database tag, the data that have been saved in ``ModelData-{odb_tag}.nc``.
+        If None, the model data are got from the current domain.
     resave: bool, default=True
-        Resave the model data.
+        Resave the model data, it is skipped if the saved file is up to date.
 
     Returns
     --------
@@ -500,8 +635,7 @@ def load_model_data(
     cells: dict[xarray.DataArray]
     """
     if odb_tag is None:
-        model_data = GetFEMData()
-        model_info, cells = model_data.get_model_info()
+        model_info, cells = _get_model_data_from_domain()
     else:
         filename = f"{RESULTS_DIR}/" + f"{MODEL_FILE_NAME}-{odb_tag}.nc"
         if not os.path.exists(filename):
@@ -513,12 +647,17 @@ def load_model_data(
             CONSOLE.print(
                 f"{PKG_PREFIX} Loading model data from [bold {color}]{filename}[/] ..."
             )
+        key = ("file", os.path.abspath(filename), os.stat(filename).st_mtime_ns)
+        data = _get_cached_model_data(key)
+        if data is not None:
+            return data
         model_info, cells = dict(), dict()
         with xr.open_datatree(filename, engine="netcdf4").load() as dt:
-            for key, value in dt["ModelInfo"].items():
-                model_info[key] = value[key]
-            for key, value in dt["Cells"].items():
-                cells[key] = value[key]
+            for key_, value in dt["ModelInfo"].items():
+                model_info[key_] = value[key_]
+            for key_, value in dt["Cells"].items():
+                cells[key_] = value[key_]
+        _set_cached_model_data(key, model_info, cells)
     return model_info, cells
 
 #
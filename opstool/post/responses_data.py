@@ -1,3 +1,6 @@
+import importlib.util
+from contextlib import contextmanager
+import warnings
 from typing import Union
 from types import SimpleNamespace
 
@@ -16,11 +19,15 @@ from ._get_response import (
     PlaneRespStepData,
     BrickRespStepData,
     ContactRespStepData,
-    SensitivityRespStepData
+    SensitivityRespStepData,
+    MonitorRespStepData
 )
 from .eigen_data import save_eigen_data
 from .model_data import save_model_data
 from ._unit_postprocess import get_post_unit_multiplier, get_post_unit_symbol
+from ._odb_stream import ODBStreamWriter
+from ._record_policy import RecordPolicy
+from ._odb_profiles import get_odb_encoding
 
 from ..utils import get_random_color, CONSTANTS
 
@@ -62,6 +69,20 @@ POST_ARGS = SimpleNamespace(
     unit_symbols = None
 )
 
+# The options of one ODB run, which are reset to these defaults in each CreateODB instead of kept in POST_ARGS.
+ODB_RUN_ARGS = dict(
+    save_every=None,
+    keep_last_steps=None,
+    record_every=None,
+    record_interval=None,
+    monitor_node_tags=None,
+    monitor_dofs=None,
+    trigger_disp=None,
+    trigger_drift=None,
+    num_shards=None,
+    shard_index=0,
+)
+
 
 class CreateODB:
     """Create an output database (ODB) to save response data.
@@ -79,15 +100,68 @@ class CreateODB:
             keep this parameter set to **False**.
             Enabling model updates unnecessarily can increase memory usage and slow down performance.
             If some nodes or elements are deleted during the analysis, you should set this parameter to `True`.
+            The model data are only rebuilt in the steps where the nodes, elements, loads or constraints change,
+            and each distinct version is saved once together with the version index of each step.
     kwargs: Other post-processing parameters, optional:
         * elastic_frame_sec_points: int, default: 7
             The number of elastic frame elements section points.
             A larger number may result in a larger file size.
         * compute_mechanical_measures: bool, default: True
-            Whether to compute mechanical measures for ``solid and planar elements``,
+            Whether to compute mechanical measures for ``solid, planar and shell elements``,
             including principal stresses, principal strains, von Mises stresses, etc.
         * dtype: dict, default: dict(int=np.int32, float=np.float32)
             Set integer and floating point precision types.
+        * save_every: int, default: None
+            If not None, the responses are streamed to the file ``RespStepData-{odb_tag}.nc``
+            every ``save_every`` steps during the analysis,
+            and the buffered steps are released from memory after each write.
+            Peak memory is then bounded by ``save_every`` steps, no matter how long the analysis is.
+            The file can be read in the same way as the non-streamed one.
+
+            .. Note::
+                Streaming is only available when ``model_update=False``.
+                The file is written without compression, i.e., the ``zlib`` and ``profile`` arguments of
+                :meth:`save_response` are ignored.
+        * keep_last_steps: int, default: None
+            If not None, only the last ``keep_last_steps`` steps are kept in a fixed-capacity ring buffer
+            and saved to the file, which is useful when only the final state of a long analysis is wanted.
+            By default, all steps are kept.
+
+            .. Note::
+                Only available when ``model_update=False`` and ``save_every=None``.
+        * Recording policies, by default, the full responses are recorded at every step:
+            * record_every: int, default: None
+                Record the full responses every ``record_every`` steps.
+            * record_interval: float, default: None
+                Record the full responses when the analysis time has advanced by
+                at least ``record_interval`` since the last recorded step.
+            * monitor_node_tags: Union[list, tuple, int], default: None
+                Node tags whose displacements are monitored and recorded at every step,
+                in the group read by :func:`opstool.post.get_monitored_responses`.
+                The drifts between each pair of consecutive nodes are also recorded,
+                i.e., the relative displacements divided by the distances between the nodes.
+                These nodes should not be removed during the analysis.
+            * monitor_dofs: Union[list, tuple, int], default: None
+                The monitored DOFs (1-based), if None, the first DOF is monitored.
+            * trigger_disp: float, default: None
+                Record the full responses when the absolute displacement of any monitored DOF reaches this value.
+            * trigger_drift: float, default: None
+                Record the full responses when the absolute drift of any pair of monitored nodes reaches this value.
+
+            .. Note::
+                A step is recorded if any of the policies fires, and the initial state is always recorded.
+                The threshold policies require ``monitor_node_tags``.
+        * Sharding, for the same model and analysis run in several processes:
+            * num_shards: int, default: None
+                If not None, the element responses are split into ``num_shards`` shards by element tags,
+                i.e., the elements whose ``tag % num_shards == shard_index`` are saved by this ODB.
+            * shard_index: int, default: 0
+                The shard saved by this ODB.
+                Only the shard 0 saves the nodal, fiber section and sensitivity responses.
+
+            .. Note::
+                Each shard should use a different ``odb_tag``, and the partial ODBs are merged
+                into one by :func:`opstool.post.merge_odbs` after all analyses are finished.
         * Whether to save the responses:
             * save_nodal_resp: bool, default: True
                 Whether to save nodal responses.
@@ -155,9 +229,13 @@ class CreateODB:
         self._odb_tag = odb_tag
         self._model_update = model_update
 
+        run_args = dict(ODB_RUN_ARGS)
         for key, value in kwargs.items():
-            if key not in list(vars(POST_ARGS).keys()):
-                raise KeyError(f"Incorrect parameter {key}, should be one of {list(vars(POST_ARGS).keys())}!")
+            if key in run_args:
+                run_args[key] = value
+            elif key not in list(vars(POST_ARGS).keys()):
+                keys = list(vars(POST_ARGS).keys()) + list(run_args.keys())
+                raise KeyError(f"Incorrect parameter {key}, should be one of {keys}!")
             else:
                 setattr(POST_ARGS, key, value)
 
@@ -183,6 +261,37 @@ class CreateODB:
         self._contact_tags = POST_ARGS.contact_tags
         self._sensitivity_para_tags = POST_ARGS.sensitivity_para_tags
 
+        self._num_shards = run_args["num_shards"]
+        self._shard_index = run_args["shard_index"]
+        if self._num_shards is not None:
+            self._num_shards = int(self._num_shards)
+            self._shard_index = int(self._shard_index)
+            if self._num_shards < 1 or not 0 <= self._shard_index < self._num_shards:
+                raise ValueError("num_shards must be a positive integer and 0 <= shard_index < num_shards!")
+            if self._shard_index > 0:
+                self._save_nodal_resp = False
+                self._save_fiber_sec_resp = False
+                self._save_sensitivity_resp = False
+
+        self._stream_writer = None
+        self._num_buffered_steps = 0
+        if run_args["save_every"] is not None:
+            if self._model_update:
+                warnings.warn(
+                    "save_every is not supported when model_update=True, "
+                    "all responses will be saved at the end of the analysis!"
+                )
+            else:
+                filename = f"{RESULTS_DIR}/" + f"{RESP_FILE_NAME}-{self._odb_tag}.nc"
+                self._stream_writer = ODBStreamWriter(filename, save_every=run_args["save_every"])
+        self._max_steps = run_args["keep_last_steps"]
+        if self._max_steps is not None and (self._model_update or self._stream_writer is not None):
+            warnings.warn(
+                "keep_last_steps is not supported when model_update=True or save_every is set, "
+                "all steps will be saved!"
+            )
+            self._max_steps = None
+
         if self._node_tags is not None:
             self._node_tags = [int(tag) for tag in np.atleast_1d(self._node_tags)]
         if self._frame_tags is not None:
@@ -208,6 +317,24 @@ class CreateODB:
         if self._sensitivity_para_tags is not None:
             self._sensitivity_para_tags = [int(tag) for tag in np.atleast_1d(self._sensitivity_para_tags)]
 
+        self._record_policy = RecordPolicy(
+            every=run_args["record_every"],
+            interval=run_args["record_interval"],
+            triggered=run_args["trigger_disp"] is not None or run_args["trigger_drift"] is not None
+        )
+        if self._record_policy.triggered and run_args["monitor_node_tags"] is None:
+            raise ValueError("monitor_node_tags must be given when trigger_disp or trigger_drift is set!")
+        self._MonitorResp = None
+        if run_args["monitor_node_tags"] is not None:
+            self._MonitorResp = MonitorRespStepData(
+                run_args["monitor_node_tags"],
+                dofs=run_args["monitor_dofs"],
+                disp_threshold=run_args["trigger_disp"],
+                drift_threshold=run_args["trigger_drift"],
+                dtype=POST_ARGS.dtype,
+                max_steps=self._max_steps
+            )
+
         self._ModelInfo = None
         self._NodalResp = None
         self._FrameResp = None
@@ -221,6 +348,7 @@ class CreateODB:
         self._SensitivityResp = None
 
         self._set_resp()
+        self._num_buffered_steps = 1
 
     def _set_resp(self):
         self._set_model_info()
@@ -235,11 +363,17 @@ class CreateODB:
         self._set_contact_resp()
         self._set_sensitivity_resp()
 
+    def _get_shard_tags(self, ele_tags):
+        if self._num_shards is None:
+            return ele_tags
+        return [tag for tag in ele_tags if int(tag) % self._num_shards == self._shard_index]
+
     def _get_resp(self):
         output = [
             self._ModelInfo, self._NodalResp, self._FrameResp, self._TrussResp,
             self._LinkResp, self._ShellResp, self._FiberSecResp,
-            self._PlaneResp, self._BrickResp, self._ContactResp, self._SensitivityResp
+            self._PlaneResp, self._BrickResp, self._ContactResp, self._SensitivityResp,
+            self._MonitorResp
         ]
         return output
 
@@ -259,7 +393,8 @@ class CreateODB:
                 self._NodalResp = NodalRespStepData(
                     node_tags,
                     model_update=self._model_update,
-                    dtype=POST_ARGS.dtype
+                    dtype=POST_ARGS.dtype,
+                    max_steps=self._max_steps
                 )
             else:
                 self._NodalResp.add_data_one_step(node_tags)
@@ -269,6 +404,7 @@ class CreateODB:
             frame_tags = self._frame_tags
         else:
             frame_tags = self._ModelInfo.get_current_frame_tags()
+        frame_tags = self._get_shard_tags(frame_tags)
         frame_load_data = self._ModelInfo.get_current_frame_load_data()
         if len(frame_tags) > 0 and self._save_frame_resp:
             if self._FrameResp is None:
@@ -277,7 +413,8 @@ class CreateODB:
                     frame_load_data,
                     elastic_frame_sec_points=POST_ARGS.elastic_frame_sec_points,
                     model_update=self._model_update,
-                    dtype=POST_ARGS.dtype
+                    dtype=POST_ARGS.dtype,
+                    max_steps=self._max_steps
                 )
             else:
                 self._FrameResp.add_data_one_step(frame_tags, frame_load_data)
@@ -287,12 +424,14 @@ class CreateODB:
             truss_tags = self._truss_tags
         else:
             truss_tags = self._ModelInfo.get_current_truss_tags()
+        truss_tags = self._get_shard_tags(truss_tags)
         if len(truss_tags) > 0 and self._save_truss_resp:
             if self._TrussResp is None:
                 self._TrussResp = TrussRespStepData(
                     truss_tags,
                     model_update=self._model_update,
-                    dtype=POST_ARGS.dtype
+                    dtype=POST_ARGS.dtype,
+                    max_steps=self._max_steps
                 )
             else:
                 self._TrussResp.add_data_one_step(truss_tags)
@@ -302,12 +441,14 @@ class CreateODB:
             link_tags = self._link_tags
         else:
             link_tags = self._ModelInfo.get_current_link_tags()
+        link_tags = self._get_shard_tags(link_tags)
         if len(link_tags) > 0 and self._save_link_resp:
             if self._LinkResp is None:
                 self._LinkResp = LinkRespStepData(
                     link_tags,
                     model_update=self._model_update,
-                    dtype=POST_ARGS.dtype
+                    dtype=POST_ARGS.dtype,
+                    max_steps=self._max_steps
                 )
             else:
                 self._LinkResp.add_data_one_step(link_tags)
@@ -317,12 +458,15 @@ class CreateODB:
             shell_tags = self._shell_tags
         else:
             shell_tags = self._ModelInfo.get_current_shell_tags()
+        shell_tags = self._get_shard_tags(shell_tags)
         if len(shell_tags) > 0 and self._save_shell_resp:
             if self._ShellResp is None:
                 self._ShellResp = ShellRespStepData(
                     shell_tags,
+                    compute_measures=POST_ARGS.compute_mechanical_measures,
                     model_update=self._model_update,
-                    dtype=POST_ARGS.dtype
+                    dtype=POST_ARGS.dtype,
+                    max_steps=self._max_steps
                 )
             else:
                 self._ShellResp.add_data_one_step(shell_tags)
@@ -332,7 +476,8 @@ class CreateODB:
             if self._FiberSecResp is None:
                 self._FiberSecResp = FiberSecRespStepData(
                     self._fiber_ele_tags,
-                    dtype=POST_ARGS.dtype
+                    dtype=POST_ARGS.dtype,
+                    max_steps=self._max_steps
                 )
             else:
                 self._FiberSecResp.add_data_one_step()
@@ -342,13 +487,15 @@ class CreateODB:
             plane_tags = self._plane_tags
         else:
             plane_tags = self._ModelInfo.get_current_plane_tags()
+        plane_tags = self._get_shard_tags(plane_tags)
         if len(plane_tags) > 0 and self._save_plane_resp:
             if self._PlaneResp is None:
                 self._PlaneResp = PlaneRespStepData(
                     plane_tags,
                     compute_measures=POST_ARGS.compute_mechanical_measures,
                     model_update=self._model_update,
-                    dtype=POST_ARGS.dtype
+                    dtype=POST_ARGS.dtype,
+                    max_steps=self._max_steps
                 )
             else:
                 self._PlaneResp.add_data_one_step(plane_tags)
@@ -358,13 +505,15 @@ class CreateODB:
             brick_tags = self._brick_tags
         else:
             brick_tags = self._ModelInfo.get_current_brick_tags()
+        brick_tags = self._get_shard_tags(brick_tags)
         if len(brick_tags) > 0 and self._save_brick_resp:
             if self._BrickResp is None:
                 self._BrickResp = BrickRespStepData(
                     brick_tags,
                     compute_measures=POST_ARGS.compute_mechanical_measures,
                     model_update=self._model_update,
-                    dtype=POST_ARGS.dtype
+                    dtype=POST_ARGS.dtype,
+                    max_steps=self._max_steps
                 )
             else:
                 self._BrickResp.add_data_one_step(brick_tags)
@@ -374,12 +523,14 @@ class CreateODB:
             contact_tags = self._contact_tags
         else:
             contact_tags = self._ModelInfo.get_current_contact_tags()
+        contact_tags = self._get_shard_tags(contact_tags)
         if len(contact_tags) > 0 and self._save_contact_resp:
             if self._ContactResp is None:
                 self._ContactResp = ContactRespStepData(
                     contact_tags,
                     model_update=self._model_update,
-                    dtype=POST_ARGS.dtype
+                    dtype=POST_ARGS.dtype,
+                    max_steps=self._max_steps
                 )
             else:
                 self._ContactResp.add_data_one_step(contact_tags)
@@ -400,7 +551,8 @@ class CreateODB:
                     ele_tags=None,
                     sens_para_tags=sens_para_tags,
                     model_update=self._model_update,
-                    dtype=POST_ARGS.dtype
+                    dtype=POST_ARGS.dtype,
+                    max_steps=self._max_steps
                 )
             else:
                 self._SensitivityResp.add_data_one_step(node_tags=node_tags, sens_para_tags=sens_para_tags)
@@ -411,6 +563,29 @@ class CreateODB:
         for resp in self._get_resp():
             if resp is not None:
                 resp.reset()
+        self._num_buffered_steps = 1
+        self._record_policy.reset()
+        if self._stream_writer is not None:
+            self._stream_writer.reset()
+
+    def _flush_steps(self):
+        """Write the buffered steps to the file and release them from memory."""
+        buffered_resp = [resp for resp in self._get_resp()[1:] if resp is not None and len(resp.times) > 0]
+        if len(buffered_resp) == 0:
+            return
+        with xr.DataTree(name=f"{RESP_FILE_NAME}") as dt:
+            for resp in buffered_resp:
+                resp.save_file(dt)
+            is_started = self._stream_writer.is_started()
+            self._stream_writer.write(dt)
+        if not is_started:
+            # The model info does not change without model update, written only once.
+            with xr.DataTree(name=f"{RESP_FILE_NAME}") as dt:
+                self._ModelInfo.save_file(dt)
+                self._stream_writer.write_static(dt)
+        for resp in buffered_resp:
+            resp.clear_steps()
+        self._num_buffered_steps = 0
 
     def fetch_response_step(self, print_info: bool = False):
         """Extract response data for the current analysis step.
@@ -420,7 +595,17 @@ class CreateODB:
         print_info: bool, optional
             print information, by default, False
         """
+        triggered = False
+        if self._MonitorResp is not None:
+            triggered = self._MonitorResp.add_data_one_step()
+        if not self._record_policy.should_record(triggered):
+            return
+
         self._set_resp()
+        self._num_buffered_steps += 1
+        if self._stream_writer is not None:
+            if self._num_buffered_steps >= self._stream_writer.save_every:
+                self._flush_steps()
 
         if print_info:
             time = ops.getTime()
@@ -429,49 +614,45 @@ class CreateODB:
                 f"{PKG_PREFIX} The responses data at time [bold {color}]{time:.4f}[/] has been fetched!"
             )
 
-    def save_response(self, zlib: bool = False):
+    def save_response(self, zlib: bool = False, profile: str = None):
         """
         Save all response data to a file name ``RespStepData-{odb_tag}.nc``.
 
         Parameters
         -----------
         zlib: bool, optional, default: False
-            If True, the data is saved compressed,
+            If True, the data is saved compressed by zlib,
             which is useful when your result files are expected to be large,
             especially if model updating is turned on.
+        profile: str, optional, default: None
+            The storage profile, which chooses the codec, shuffle filter,
+            chunks and float precision of each variable, overriding ``zlib``.
+            Optional: "archive", "fast-write" and "visualization".
+
+            * "archive": lossless ``zstd`` compression with a high level, for long-term storage.
+            * "fast-write": light ``blosc_lz4`` compression, close to the uncompressed writing speed.
+            * "visualization": responses quantized to 4 significant digits and chunked by step,
+              so that each step is read cheaply. The model information is never quantized.
+
+            .. Note::
+                The codecs fall back to zlib if the netCDF4 library is built without them.
+                Both ``zlib`` and ``profile`` are ignored when the responses are streamed by ``save_every``.
         """
         filename = f"{RESULTS_DIR}/" + f"{RESP_FILE_NAME}-{self._odb_tag}.nc"
+        if self._stream_writer is not None:
+            self._flush_steps()
+            color = get_random_color()
+            CONSOLE.print(
+                f"{PKG_PREFIX} All responses data with _odb_tag = {self._odb_tag} "
+                f"streamed in [bold {color}]{filename}[/]!"
+            )
+            return
         with xr.DataTree(name=f"{RESP_FILE_NAME}") as dt:
             for resp in self._get_resp():
                 if resp is not None:
                     resp.save_file(dt)
 
-            if zlib:
-                encoding = {}
-                for path, node in dt.items():
-                    if path == "ModelInfo":
-                        for key, value in node.items():
-                            encoding[f"/{path}/{key}"] = {
-                                key: {
-                                    "_FillValue": -9999,
-                                    "zlib": True,
-                                    "complevel": 5,
-                                    "dtype": "float32"
-                                }
-                            }
-                    else:
-                        for key, value in node.items():
-                            encoding[f"/{path}"] = {
-                                key: {
-                                    "_FillValue": -9999,
-                                    "zlib": True,
-                                    "complevel": 5,
-                                    "dtype": "float32"
-                                }
-                            }
-            else:
-                encoding = None
-
+            encoding = get_odb_encoding(dt, profile=profile, zlib=zlib)
             dt.to_netcdf(filename, mode="w", engine="netcdf4", encoding=encoding)
 
         color = get_random_color()
@@ -503,6 +684,57 @@ class CreateODB:
         save_model_data(odb_tag=self._odb_tag)
 
 
+def merge_odbs(odb_tags: Union[list, tuple], odb_tag: Union[int, str]):
+    """Merge the partial ODBs saved by the shards of :class:`opstool.post.CreateODB` into one ODB,
+    see the ``num_shards`` and ``shard_index`` parameters of :class:`opstool.post.CreateODB`.
+
+    The element responses of all shards are concatenated along the element tags, sorted by tags,
+    and the other data, such as the model information and nodal responses, are taken from the first ODB
+    that contains them.
+
+    Parameters
+    -----------
+    odb_tags: Union[list, tuple]
+        The tags of the partial ODBs.
+    odb_tag: Union[int, str]
+        The tag of the merged ODB, which is saved in ``RespStepData-{odb_tag}.nc``.
+    """
+    datasets = dict()
+    for tag in odb_tags:
+        with _open_odb(f"{RESULTS_DIR}/" + f"{RESP_FILE_NAME}-{tag}.nc") as dt:
+            for node in dt.subtree:
+                if node.has_data:
+                    datasets.setdefault(node.path, []).append(_restore_array_attrs(node.to_dataset().load()))
+    filename = f"{RESULTS_DIR}/" + f"{RESP_FILE_NAME}-{odb_tag}.nc"
+    with xr.DataTree(name=f"{RESP_FILE_NAME}") as dt:
+        for path, data in datasets.items():
+            if path.startswith("/ModelInfo") or "eleTags" not in data[0].dims or len(data) == 1:
+                dt[path] = data[0]
+                continue
+            times = data[0]["time"].values
+            if any(not np.array_equal(ds["time"].values, times) for ds in data[1:]):
+                raise ValueError(f"The time steps of {path} differ between the ODBs, which can not be merged!")
+            ds = xr.concat(
+                data, dim="eleTags", data_vars="minimal", coords="minimal", compat="override", join="outer"
+            )
+            dt[path] = ds.sortby("eleTags")
+        dt.to_netcdf(filename, mode="w", engine="netcdf4")
+
+    color = get_random_color()
+    CONSOLE.print(
+        f"{PKG_PREFIX} All responses data with _odb_tag = {odb_tag} merged in [bold {color}]{filename}[/]!"
+    )
+
+
+def _restore_array_attrs(ds: xr.Dataset):
+    # Attributes such as the nodal bounds are saved as tuples but read back as arrays.
+    for attrs in [ds.attrs] + [var.attrs for var in ds.variables.values()]:
+        for key, value in attrs.items():
+            if isinstance(value, np.ndarray):
+                attrs[key] = tuple(value.tolist())
+    return ds
+
+
 def loadODB(
         obd_tag,
         resp_type: str = "Nodal",
@@ -514,11 +746,12 @@ def loadODB(
     Relevant to a response type.
     """
     filename = f"{RESULTS_DIR}/" + f"{RESP_FILE_NAME}-{obd_tag}.nc"
-    with xr.open_datatree(filename, engine="netcdf4").load() as dt:
+    with _open_odb(filename) as dt:
         color = get_random_color()
         CONSOLE.print(
             f"{PKG_PREFIX} Loading response data from [bold {color}]{filename}[/] ..."
         )
+        dt["ModelInfo"].load()
         model_info_steps, model_update = ModelInfoStepData.read_file(dt, unit_factors=POST_ARGS.unit_factors)
         if resp_type.lower() == "nodal":
             resp_step = NodalRespStepData.read_file(dt, unit_factors=POST_ARGS.unit_factors)
@@ -542,6 +775,7 @@ def loadODB(
             resp_step = SensitivityRespStepData.read_file(dt)
         else:
             raise ValueError(f"Unsupported response type {resp_type}!")
+        resp_step = resp_step.load()
 
     return model_info_steps, model_update, resp_step
 
@@ -589,8 +823,8 @@ def get_model_data(
         raise ValueError(f"Data type {data_type} not found.")
     if from_responses:
         filename = f"{RESULTS_DIR}/" + f"{RESP_FILE_NAME}-{odb_tag}.nc"
-        with xr.open_datatree(filename, engine="netcdf4").load() as dt:
-            data = ModelInfoStepData.read_data(dt, data_type)
+        with _open_odb(filename) as dt:
+            data = ModelInfoStepData.read_data(dt, data_type).load()
     else:
         filename = f"{RESULTS_DIR}/" + f"{MODEL_FILE_NAME}-{odb_tag}.nc"
         with xr.open_datatree(filename, engine="netcdf4").load() as dt:
@@ -606,6 +840,8 @@ def get_nodal_responses(
         odb_tag: int,
         resp_type: str = None,
         node_tags: Union[list, tuple, int] = None,
+        time_range: tuple = None,
+        lazy: bool = False,
         print_info: bool = True,
 ) -> xr.Dataset:
     """Read nodal responses data from a file.
@@ -641,6 +877,14 @@ def get_nodal_responses(
             If some nodes are deleted during the analysis,
             their response data will be filled with `numpy.nan`.
 
+    time_range: tuple, default: None
+        The time window ``(start, end)`` to be read, both ends are included.
+        ``None`` at either end means an open bound. If None, return all time steps.
+    lazy: bool, default: False
+        If True, the data are not loaded into memory,
+        only the selected hyperslabs are read from the file when the data are accessed or computed.
+        The arrays are chunked and dask-backed if `dask <https://www.dask.org/>`_ is installed.
+        Unit transforms are also applied lazily.
     print_info: bool, default: True
         Whether to print information
 
@@ -656,7 +900,8 @@ def get_nodal_responses(
 
     """
     filename = f"{RESULTS_DIR}/" + f"{RESP_FILE_NAME}-{odb_tag}.nc"
-    with xr.open_datatree(filename, engine="netcdf4").load() as dt:
+    dt = _open_odb(filename, lazy=lazy)
+    with _close_if_not_lazy(dt, lazy):
         if print_info:
             color = get_random_color()
             if resp_type is None:
@@ -672,8 +917,11 @@ def get_nodal_responses(
             dt,
             resp_type=resp_type,
             node_tags=node_tags,
-            unit_factors=POST_ARGS.unit_factors
+            unit_factors=POST_ARGS.unit_factors,
+            time_range=time_range
         )
+        if not lazy:
+            nodal_resp = nodal_resp.load()
     return nodal_resp
 
 
@@ -682,6 +930,8 @@ def get_element_responses(
         ele_type: str,
         resp_type: str = None,
         ele_tags: Union[list, tuple, int] = None,
+        time_range: tuple = None,
+        lazy: bool = False,
         print_info: bool = True,
 ) -> xr.Dataset:
     """Read nodal responses data from a file.
@@ -747,6 +997,14 @@ def get_element_responses(
             If some elements are deleted during the analysis,
             their response data will be filled with `numpy.nan`.
 
+    time_range: tuple, default: None
+        The time window ``(start, end)`` to be read, both ends are included.
+        ``None`` at either end means an open bound. If None, return all time steps.
+    lazy: bool, default: False
+        If True, the data are not loaded into memory,
+        only the selected hyperslabs are read from the file when the data are accessed or computed.
+        The arrays are chunked and dask-backed if `dask <https://www.dask.org/>`_ is installed.
+        Unit transforms are also applied lazily.
     print_info: bool, default: True
         Whether to print information.
 
@@ -761,7 +1019,8 @@ def get_element_responses(
         You can further index or process the data.
     """
     filename = f"{RESULTS_DIR}/" + f"{RESP_FILE_NAME}-{odb_tag}.nc"
-    with xr.open_datatree(filename, engine="netcdf4").load() as dt:
+    dt = _open_odb(filename, lazy=lazy)
+    with _close_if_not_lazy(dt, lazy):
         if print_info:
             color = get_random_color()
             if resp_type is None:
@@ -775,40 +1034,51 @@ def get_element_responses(
 
         if ele_type.lower() == "frame":
             ele_resp = FrameRespStepData.read_response(
-                dt, resp_type=resp_type, ele_tags=ele_tags, unit_factors=POST_ARGS.unit_factors
+                dt, resp_type=resp_type, ele_tags=ele_tags,
+                unit_factors=POST_ARGS.unit_factors, time_range=time_range
             )
         elif ele_type.lower() == "fibersection":
             ele_resp = FiberSecRespStepData.read_response(
-                dt, resp_type=resp_type, ele_tags=ele_tags, unit_factors=POST_ARGS.unit_factors
+                dt, resp_type=resp_type, ele_tags=ele_tags,
+                unit_factors=POST_ARGS.unit_factors, time_range=time_range
             )
         elif ele_type.lower() == "truss":
             ele_resp = TrussRespStepData.read_response(
-                dt, resp_type=resp_type, ele_tags=ele_tags, unit_factors=POST_ARGS.unit_factors
+                dt, resp_type=resp_type, ele_tags=ele_tags,
+                unit_factors=POST_ARGS.unit_factors, time_range=time_range
             )
         elif ele_type.lower() == "link":
             ele_resp = LinkRespStepData.read_response(
-                dt, resp_type=resp_type, ele_tags=ele_tags, unit_factors=POST_ARGS.unit_factors
+                dt, resp_type=resp_type, ele_tags=ele_tags,
+                unit_factors=POST_ARGS.unit_factors, time_range=time_range
             )
         elif ele_type.lower() == "shell":
             ele_resp = ShellRespStepData.read_response(
-                dt, resp_type=resp_type, ele_tags=ele_tags, unit_factors=POST_ARGS.unit_factors
+                dt, resp_type=resp_type, ele_tags=ele_tags,
+                unit_factors=POST_ARGS.unit_factors, time_range=time_range
             )
         elif ele_type.lower() == "plane":
             ele_resp = PlaneRespStepData.read_response(
-                dt, resp_type=resp_type, ele_tags=ele_tags, unit_factors=POST_ARGS.unit_factors
+                dt, resp_type=resp_type, ele_tags=ele_tags,
+                unit_factors=POST_ARGS.unit_factors, time_range=time_range
             )
         elif ele_type.lower() in ["brick", "solid"]:
             ele_resp = BrickRespStepData.read_response(
-                dt, resp_type=resp_type, ele_tags=ele_tags, unit_factors=POST_ARGS.unit_factors
+                dt, resp_type=resp_type, ele_tags=ele_tags,
+                unit_factors=POST_ARGS.unit_factors, time_range=time_range
             )
         elif ele_type.lower() == "contact":
             ele_resp = ContactRespStepData.read_response(
-                dt, resp_type=resp_type, ele_tags=ele_tags, unit_factors=POST_ARGS.unit_factors)
+                dt, resp_type=resp_type, ele_tags=ele_tags,
+                unit_factors=POST_ARGS.unit_factors, time_range=time_range
+            )
         else:
             raise ValueError(
                 f"Unsupported element type {ele_type}, "
                 "must in [Frame, Truss, Link, Shell, Plane, Solid, Contact]!"
             )
+        if not lazy:
+            ele_resp = ele_resp.load()
 
     return ele_resp
 
@@ -844,7 +1114,7 @@ def get_sensitivity_responses(
         Sensitivity responses' data.
     """
     filename = f"{RESULTS_DIR}/" + f"{RESP_FILE_NAME}-{odb_tag}.nc"
-    with xr.open_datatree(filename, engine="netcdf4").load() as dt:
+    with _open_odb(filename) as dt:
         if print_info:
             color = get_random_color()
             if resp_type is None:
@@ -856,7 +1126,55 @@ def get_sensitivity_responses(
                     f"{PKG_PREFIX} Loading {resp_type} response data from [bold {color}]{filename}[/] ..."
                 )
 
-        resp = SensitivityRespStepData.read_response(dt, resp_type=resp_type)
+        resp = SensitivityRespStepData.read_response(dt, resp_type=resp_type).load()
+
+    return resp
+
+
+def get_monitored_responses(
+        odb_tag: int,
+        resp_type: str = None,
+        node_tags: Union[list, tuple, int] = None,
+        print_info: bool = True,
+) -> xr.Dataset:
+    """Read the monitored responses recorded at every step from a file,
+    see the ``monitor_node_tags`` argument of :class:`CreateODB`.
+
+    Parameters
+    ------------
+    odb_tag: Union[int, str], default: one
+        Tag of output databases (ODB) to be read.
+    resp_type: str, default: None
+        Type of response to be read.
+        Optional:
+
+        * "disp" - Displacement of the monitored DOFs.
+        * "drift" - Drift between each pair of consecutive monitored nodes.
+        * "triggered" - 1 if a threshold is reached at the step, otherwise 0.
+        * If None, return all responses.
+
+    node_tags: Union[list, tuple, int], default: None
+        Node tags to be read, if None, return all monitored nodes.
+    print_info: bool, default: True
+        Whether to print information.
+
+    Returns
+    ---------
+    MonitorResp: `xarray.Dataset <https://docs.xarray.dev/en/stable/generated/xarray.Dataset.html>`_
+        Monitored responses' data.
+    """
+    filename = f"{RESULTS_DIR}/" + f"{RESP_FILE_NAME}-{odb_tag}.nc"
+    with _open_odb(filename) as dt:
+        if print_info:
+            color = get_random_color()
+            CONSOLE.print(
+                f"{PKG_PREFIX} Loading monitored response data from [bold {color}]{filename}[/] ..."
+            )
+        if "MonitoredResponses" not in dt.children:
+            raise ValueError(f"No monitored responses in {filename}, please set monitor_node_tags in CreateODB!")
+        resp = MonitorRespStepData.read_response(
+            dt, resp_type=resp_type, node_tags=node_tags, unit_factors=POST_ARGS.unit_factors
+        ).load()
 
     return resp
 
@@ -939,4 +1257,21 @@ def _parse_unit_factors(analysis_unit_system, post_unit_system):
             post_force=post_units_["force"],
             post_time=post_units_["time"],
         )
-    return unit_factors, unit_syms
\ No newline at end of file
+    return unit_factors, unit_syms
+
+
+def _open_odb(filename: str, lazy: bool = False):
+    """Open an ODB file without reading the data, which are read from disk on demand.
+    If ``lazy`` and dask is available, the arrays are dask-backed with the chunks on disk.
+    """
+    chunks = {} if lazy and importlib.util.find_spec("dask") is not None else None
+    return xr.open_datatree(filename, engine="netcdf4", chunks=chunks)
+
+
+@contextmanager
+def _close_if_not_lazy(dt: xr.DataTree, lazy: bool):
+    try:
+        yield dt
+    finally:
+        if not lazy:
+            dt.close()
@@ -3,6 +3,7 @@ from ._plot_fiber_sec import vis_fiber_sec_real
 from .sec_mesh import FiberSecMesh
 from .sec_mesh import create_material, create_polygon_patch, create_circle_patch, create_patch_from_dxf
 from .sec_mesh import create_polygon_points, create_circle_points, offset, line_offset, poly_offset, set_patch_material
+from .var_sec_mesh import var_line_string, mesh_var_sections
 
 SecMesh = FiberSecMesh
 
@@ -10,6 +11,7 @@ __all__ = [
     "section", "fiber", "patch", "layer", "plot_fiber_sec_cmds", "vis_fiber_sec_real",
     "FiberSecMesh", "SecMesh", "create_material", "create_polygon_patch", "create_circle_patch",
     "create_patch_from_dxf", "create_polygon_points",
-    "create_circle_points", "offset", "line_offset", "poly_offset", "set_patch_material"
+    "create_circle_points", "offset", "line_offset", "poly_offset", "set_patch_material",
+    "var_line_string", "mesh_var_sections"
 ]
  
\ No newline at end of file
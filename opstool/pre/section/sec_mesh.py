@@ -2,9 +2,15 @@
 SecMesh: A module to mesh the cross-section with triangular fibers
 """
 
+import hashlib
+import json
+import os
+import time
+
 import matplotlib.pyplot as plt
 import numpy as np
 import openseespy.opensees as ops
+from importlib.metadata import version
 from typing import Union
 from matplotlib.collections import PatchCollection
 from sectionproperties.analysis.section import Section
@@ -16,6 +22,9 @@ from ...utils import CONSTANTS, get_random_color, get_random_color_rich
 CONSOLE = CONSTANTS.CONSOLE
 PKG_PREFIX = CONSTANTS.PKG_PREFIX
 
+# * the results of the sectionproperties analyses, keyed by the hash of the geometries, materials and mesh sizes
+_SEC_PROPS_CACHE = dict()
+
 
 def create_polygon_points(
     start: Union[list[float, float], tuple[float, float]] = (0., 0.),
@@ -382,6 +391,20 @@ class FiberSecMesh:
 
         self.is_centring = False
 
+        # * wall time of the last meshing steps
+        self.mesh_timing = dict()
+
+        # * property cache, see set_props_cache_dir
+        self.props_cache_dir = None
+        self._props_key = None
+        # affine maps (3x3) from the frame of the cached props to the current fibers and to self.section
+        self._props_frame = np.eye(3)
+        self._section_frame = np.eye(3)
+        # analyses already run on self.section
+        self._section_solved = set()
+        # Eref of the last sec_props and frame_sec_props
+        self._props_eref = dict()
+
     def add_patch_group(
             self,
             patches: Union[dict[Geometry], list[Geometry], tuple[Geometry], Geometry]
@@ -579,10 +602,17 @@ class FiberSecMesh:
     def _to_mesh_section(self):
         if self.section_geom is None:
             self._to_geometry()
+        start = time.perf_counter()
         mesh_obj = self.section_geom.create_mesh(mesh_sizes=self.section_mesh_sizes)
         self.mesh_obj = mesh_obj.mesh
+        self.mesh_timing["triangulate"] = time.perf_counter() - start
+        start = time.perf_counter()
         self.section = Section(self.section_geom, time_info=False)
+        self._section_solved = set()
+        self.mesh_timing["section"] = time.perf_counter() - start
+        start = time.perf_counter()
         self._get_mesh_data()
+        self.mesh_timing["fibers"] = time.perf_counter() - start
 
     def mesh(self):
         """Mesh the section.
@@ -599,56 +629,49 @@ class FiberSecMesh:
                 area = geom.calculate_area()
                 self.mesh_size_map[name] = np.sqrt(2 * area / 100)
         self._to_mesh_section()
+        self._set_props_key()
         txt = get_random_color_rich(self.sec_name)
         CONSOLE.print(f"{PKG_PREFIX}The section {txt} has been successfully meshed!")
 
     def _get_mesh_data(self):
         # * mesh data
-        vertices = self.mesh_obj["vertices"]
+        vertices = np.asarray(self.mesh_obj["vertices"])
         self.points = np.array(vertices)
         triangles = self.mesh_obj["triangles"][:, :3]
-        triangle_attributes = self.mesh_obj["triangle_attributes"]
-        attributes = np.unique(triangle_attributes)
-        attributes = np.atleast_1d(attributes)
-        for name in self.geom_group_map.keys():
-            self.fiber_cells_map[name] = []
-        for name, attri in zip(self.geom_names, attributes):
-            idx = triangle_attributes == attri
-            self.fiber_cells_map[name].append(triangles[idx[:, 0]])
-        for name in self.geom_group_map.keys():
-            self.fiber_cells_map[name] = np.vstack(self.fiber_cells_map[name])
-        # * fiber data
-        iys, izs = [], []
-        for name, faces in self.fiber_cells_map.items():
-            areas = []
-            centers = []
-            for face in faces:
-                idx1, idx2, idx3 = face
-                coord1, coord2, coord3 = vertices[idx1], vertices[idx2], vertices[idx3]
-                xyo = (coord1 + coord2 + coord3) / 3
-                centers.append(xyo)
-                x1, y1 = coord1[:2]
-                x2, y2 = coord2[:2]
-                x3, y3 = coord3[:2]
-                area_ = 0.5 * np.abs(
-                    x2 * y3 + x1 * y2 + x3 * y1 - x3 * y2 - x2 * y1 - x1 * y3
-                )
-                areas.append(area_)
-                iys.append(area_ * xyo[1] ** 2)
-                izs.append(area_ * xyo[0] ** 2)
-            self.fiber_areas_map[name] = np.array(areas)
-            self.fiber_centers_map[name] = np.array(centers)
-        centers = []
-        areas = []
-        for name in self.fiber_cells_map.keys():
-            centers.append(self.fiber_centers_map[name])
-            areas.append(self.fiber_areas_map[name])
-        centers = np.vstack(centers)
-        areas = np.hstack(areas)
+        triangle_attributes = np.asarray(self.mesh_obj["triangle_attributes"])[:, 0]
+        attributes = np.atleast_1d(np.unique(triangle_attributes))
+        # * group the triangles by the patch name, in the order of the attributes in each group
+        names = list(self.geom_group_map.keys())
+        attri_groups = np.array([names.index(name) for name, _ in zip(self.geom_names, attributes)])
+        attri_idx = np.searchsorted(attributes, triangle_attributes)
+        keep = attri_idx < len(attri_groups)
+        groups = np.full(len(triangles), len(names))
+        groups[keep] = attri_groups[attri_idx[keep]]
+        order = np.argsort(groups * len(attributes) + attri_idx, kind="stable")
+        splits = np.cumsum(np.bincount(groups, minlength=len(names) + 1))[:-1]
+        # * fiber data, all triangles in one pass
+        coords = vertices[triangles[order]]
+        x1, y1 = coords[:, 0, 0], coords[:, 0, 1]
+        x2, y2 = coords[:, 1, 0], coords[:, 1, 1]
+        x3, y3 = coords[:, 2, 0], coords[:, 2, 1]
+        centers = (coords[:, 0] + coords[:, 1] + coords[:, 2]) / 3
+        areas = 0.5 * np.abs(x2 * y3 + x1 * y2 + x3 * y1 - x3 * y2 - x2 * y1 - x1 * y3)
+        for name, cells, centers_, areas_ in zip(
+            names,
+            np.split(triangles[order], splits),
+            np.split(centers, splits),
+            np.split(areas, splits),
+        ):
+            self.fiber_cells_map[name] = cells
+            self.fiber_centers_map[name] = centers_
+            self.fiber_areas_map[name] = areas_
+        # the triangles not belonging to any patch are not fibers
+        num_fibers = splits[-1]
+        centers, areas = centers[:num_fibers], areas[:num_fibers]
         self.geom_area = np.sum(areas)
         self.centroid = areas @ centers / self.geom_area
-        self.Iy = np.sum(iys)
-        self.Iz = np.sum(izs)
+        self.Iy = areas @ centers[:, 1] ** 2
+        self.Iz = areas @ centers[:, 0] ** 2
 
     def get_fiber_data(self):
         """Return fiber data.
@@ -670,6 +693,196 @@ class FiberSecMesh:
     #     self.section = section
     #     self._get_mesh_data()
 
+    def get_mesh_timing(self):
+        """Return the wall time in seconds of the last meshing steps.
+
+        Returns
+        -------
+        dict
+            With keys ``"triangulate"`` (the triangular mesh),
+            ``"section"`` (the `Section` object of sectionproperties)
+            and ``"fibers"`` (the fiber centers and areas from the triangles).
+        """
+        return self.mesh_timing
+
+    def set_props_cache_dir(self, cache_dir: str = None):
+        """Set a directory to store the section properties on disk.
+
+        The results of ``sectionproperties`` are cached in memory, keyed by a hash of the geometries,
+        materials and mesh sizes, so that the same section is solved only once in a session.
+        If a directory is set, the results are also stored in it as JSON files,
+        and can be reused by other sessions.
+
+        .. Note::
+            The warping analysis, which is the most expensive one, runs only when the shear areas
+            are first requested, e.g., by :py:meth:`get_sec_props`.
+            After :py:meth:`rotate` and :py:meth:`centring`, the section properties are
+            transformed analytically from the cached centroidal ones instead of solved again.
+
+        Parameters
+        ------------
+        cache_dir : str, default=None
+            The directory of the cache files. If None, the results are only cached in memory.
+
+        Returns
+        ----------
+        instance
+        """
+        self.props_cache_dir = cache_dir
+        return self
+
+    def _set_props_key(self):
+        # the props are cached in the frame of the section geometry shifted by its lower left corner,
+        # so that the translated sections share the same key
+        geoms = self.section_geom.geoms if isinstance(self.section_geom, CompoundGeometry) else [self.section_geom]
+        mesh_sizes = np.atleast_1d(self.section_mesh_sizes)
+        bounds = np.array([geom.geom.bounds for geom in geoms])
+        xmin, ymin = bounds[:, 0].min(), bounds[:, 1].min()
+        scale = max(bounds[:, 2].max() - xmin, bounds[:, 3].max() - ymin)
+        sha = hashlib.sha256(f"sectionproperties {version('sectionproperties')}".encode())
+        sha.update(np.array([scale]).tobytes())
+        for geom, mesh_size in zip(geoms, mesh_sizes):
+            mat = geom.material
+            sha.update(
+                np.array(
+                    [mesh_size, mat == DEFAULT_MATERIAL, mat.elastic_modulus, mat.poissons_ratio, mat.density],
+                    dtype=float,
+                ).tobytes()
+            )
+            for ring in [geom.geom.exterior, *geom.geom.interiors]:
+                coords = (np.asarray(ring.coords) - [xmin, ymin]) / scale
+                # + 0.0 turns -0.0 into 0.0
+                sha.update((np.round(coords, 10) + 0.0).tobytes() + b"|")
+        self._props_key = sha.hexdigest()
+        self._props_frame = np.array([[1.0, 0.0, xmin], [0.0, 1.0, ymin], [0.0, 0.0, 1.0]])
+        self._section_frame = self._props_frame.copy()
+
+    def _solve_section(self, analysis: str):
+        # run the sectionproperties analysis on self.section, "geometric", "frame" or "warping", if not yet
+        if analysis == "warping":
+            self._solve_section("geometric")
+        if analysis not in self._section_solved:
+            if analysis == "geometric":
+                self.section.calculate_geometric_properties()
+            elif analysis == "frame":
+                self.section.calculate_frame_properties(solver_type="direct")
+            else:
+                self.section.calculate_warping_properties()
+            self._section_solved.add(analysis)
+
+    def _get_cached_props(self, analysis: str):
+        # the results of an analysis in the frame of the cache, solved only if not cached
+        if self._props_key is None:
+            self._set_props_key()
+        cache = _SEC_PROPS_CACHE.setdefault(self._props_key, dict())
+        path = None
+        if self.props_cache_dir is not None:
+            path = os.path.join(self.props_cache_dir, f"{self._props_key}.json")
+            if analysis not in cache and os.path.exists(path):
+                with open(path) as f:
+                    cache.update(json.load(f))
+        # the torsion constant of the warping analysis is the same as the frame analysis
+        if analysis == "frame" and "warping" in cache:
+            analysis = "warping"
+        if analysis not in cache:
+            self._solve_section(analysis)
+            cache[analysis] = self._extract_props(analysis)
+            if path is not None:
+                os.makedirs(self.props_cache_dir, exist_ok=True)
+                with open(path, "w") as f:
+                    json.dump(cache, f)
+        return cache[analysis]
+
+    def _extract_props(self, analysis: str):
+        # the results of self.section transformed to the frame of the cache
+        props = self.section.section_props
+        inv_frame = np.linalg.inv(self._section_frame)
+        rot = inv_frame[:2, :2]
+        if analysis == "geometric":
+            cx, cy = rot @ [props.cx, props.cy] + inv_frame[:2, 2]
+            inertia = rot @ np.array([[props.iyy_c, props.ixy_c], [props.ixy_c, props.ixx_c]]) @ rot.T
+            return dict(
+                area=props.area,
+                ea=props.ea,
+                mass=props.mass,
+                cx=cx,
+                cy=cy,
+                ixx=inertia[1, 1],
+                iyy=inertia[0, 0],
+                ixy=inertia[0, 1],
+            )
+        elif analysis == "frame":
+            return dict(j=props.j)
+        else:
+            # the shear flexibility, 1 / As, is a tensor
+            flex = np.array([[1 / props.a_sx, 1 / props.a_sxy], [1 / props.a_sxy, 1 / props.a_sy]])
+            flex = rot @ flex @ rot.T
+            return dict(j=props.j, fsx=flex[0, 0], fsy=flex[1, 1], fsxy=flex[0, 1])
+
+    def _get_current_props(self, Eref: float = 1.0, warping: bool = False):
+        # the section props in the current frame, from the cached ones
+        geo = self._get_cached_props("geometric")
+        tor = self._get_cached_props("warping" if warping else "frame")
+        rot = self._props_frame[:2, :2]
+        cx, cy = rot @ [geo["cx"], geo["cy"]] + self._props_frame[:2, 2]
+        inertia = rot @ np.array([[geo["iyy"], geo["ixy"]], [geo["ixy"], geo["ixx"]]]) @ rot.T
+        ixx_c, iyy_c, ixy_c = inertia[1, 1], inertia[0, 0], inertia[0, 1]
+        # principal bending axis angle, as sectionproperties
+        delta = (((ixx_c - iyy_c) / 2) ** 2 + ixy_c**2) ** 0.5
+        i11_c = (ixx_c + iyy_c) / 2 + delta
+        if abs(ixx_c - i11_c) < 1e-12 * i11_c:
+            phi = 0.0
+        else:
+            phi = np.arctan2(ixx_c - i11_c, ixy_c) * 180 / np.pi
+        if self.section.is_composite():
+            eref = Eref
+            area, mass = geo["ea"] / Eref, geo["mass"]
+        else:
+            eref = 1.0
+            area = mass = geo["area"]
+        # elastic section moduli with respect to the extreme nodes
+        xmax, ymax = np.max(self.points[:, :2], axis=0)
+        xmin, ymin = np.min(self.points[:, :2], axis=0)
+        props = dict(
+            A=area,
+            centroid=(0.0, 0.0) if self.is_centring else (cx, cy),
+            Iy=ixx_c / eref,
+            Iz=iyy_c / eref,
+            Iyz=ixy_c / eref,
+            Wyt=ixx_c / eref / abs(ymax - cy),
+            Wyb=ixx_c / eref / abs(ymin - cy),
+            Wzt=iyy_c / eref / abs(xmax - cx),
+            Wzb=iyy_c / eref / abs(xmin - cx),
+            J=tor["j"] / eref,
+            phi=phi,
+            mass=mass,
+            rho_rebar=self.get_rebars_area() / self.geom_area,
+        )
+        if warping:
+            flex = rot @ np.array([[tor["fsx"], tor["fsxy"]], [tor["fsxy"], tor["fsy"]]]) @ rot.T
+            props["Asy"] = 1 / flex[0, 0] / eref
+            props["Asz"] = 1 / flex[1, 1] / eref
+        return props
+
+    def _update_props(self, frame):
+        # apply an affine map of the fibers to the cached props
+        self._props_frame = frame @ self._props_frame
+        if "sec" in self._props_eref:
+            self._run_sec_props(self._props_eref["sec"])
+        if "frame" in self._props_eref:
+            self.get_frame_props(self._props_eref["frame"])
+
+    @property
+    def section(self):
+        # the Section of a mesh mapped by mesh_var_sections is created when it is first needed
+        if self._section is None and self.section_geom is not None and self.section_geom.mesh is not None:
+            self._section = Section(self.section_geom, time_info=False)
+        return self._section
+
+    @section.setter
+    def section(self, section):
+        self._section = section
+
     def get_section(self):
         """Return the section object.
 
@@ -957,48 +1170,13 @@ class FiberSecMesh:
         return [ztop, zbot, yright, yleft]
 
     def _run_sec_props(self, Eref: float = 1.0):
-        self.section.calculate_geometric_properties()
-        self.section.calculate_warping_properties()
-        cx, cy = (0.0, 0.0) if self.is_centring else self.section.get_c()
-        phi = self.section.get_phi()  # Principal bending axis angle
-        if self.section.is_composite():
-            ixx_c, iyy_c, ixy_c = self.section.get_eic(Eref)
-            # Elastic section moduli about the centroidal axis with respect to the top and bottom fibers
-            zxx_plus, zxx_minus, zyy_plus, zyy_minus = self.section.get_ez(Eref)
-            # Shear area for loading about the centroidal axis
-            area_sx, area_sy = self.section.get_eas(Eref)
-            self.area = self.section.get_ea(Eref)
-            # St. Venant torsion constant
-            self.J = self.section.get_ej(Eref)
-            mass = self.section.get_mass()
-        else:
-            ixx_c, iyy_c, ixy_c = self.section.get_ic()
-            zxx_plus, zxx_minus, zyy_plus, zyy_minus = self.section.get_z()
-            area_sx, area_sy = self.section.get_as()
-            self.area = self.section.get_area()
-            self.J = self.section.get_j()
-            mass = self.area
-        self.Iy = ixx_c
-        self.Iz = iyy_c
-        rho_rebar = self.get_rebars_area() / self.geom_area
-        sec_props = dict(
-            A=self.area,
-            Asy=area_sx,
-            Asz=area_sy,
-            centroid=(cx, cy),
-            Iy=ixx_c,
-            Iz=iyy_c,
-            Iyz=ixy_c,
-            Wyt=zxx_plus,
-            Wyb=zxx_minus,
-            Wzt=zyy_plus,
-            Wzb=zyy_minus,
-            J=self.J,
-            phi=phi,
-            mass=mass,
-            rho_rebar=rho_rebar,
-        )
-        self.sec_props = sec_props
+        sec_props = self._get_current_props(Eref, warping=True)
+        self.area, self.J = sec_props["A"], sec_props["J"]
+        self.Iy, self.Iz = sec_props["Iy"], sec_props["Iz"]
+        keys = ["A", "Asy", "Asz", "centroid", "Iy", "Iz", "Iyz", "Wyt", "Wyb", "Wzt", "Wzb", "J", "phi", "mass",
+                "rho_rebar"]
+        self.sec_props = {key: sec_props[key] for key in keys}
+        self._props_eref["sec"] = Eref
 
     def get_sec_props(
         self,
@@ -1163,42 +1341,12 @@ class FiberSecMesh:
             the y-axis refers to the abscissa,
             and the z-axis refers to the ordinate direction.
         """
-        # self.section.calculate_geometric_properties()
-        (area, ixx_c, iyy_c, ixy_c, j, phi) = self.section.calculate_frame_properties(
-            solver_type="direct"
-        )
-        cx, cy = (0.0, 0.0) if self.is_centring else self.section.get_c()
-        # self.section.section_props.calculate_centroidal_properties(self.points)
-        if self.section.is_composite():
-            self.section.calculate_geometric_properties()
-            zxx_plus, zxx_minus, zyy_plus, zyy_minus = self.section.get_ez(Eref)
-            Eeff = self.section.get_e_eff()
-            self.area = area * Eeff / Eref
-            self.Iy = ixx_c / Eref
-            self.Iz = iyy_c / Eref
-            self.J = j / Eref
-        else:
-            self.section.calculate_geometric_properties()
-            zxx_plus, zxx_minus, zyy_plus, zyy_minus = self.section.get_z()
-            self.area = area
-            self.Iy = ixx_c
-            self.Iz = iyy_c
-            self.J = j
-        rho_rebar = self.get_rebars_area() / self.geom_area
-        sec_props = dict(
-            A=self.area,
-            centroid=(cx, cy),
-            Iy=self.Iy,
-            Iz=self.Iz,
-            Iyz=ixy_c,
-            Wyt=zxx_plus,
-            Wyb=zxx_minus,
-            Wzt=zyy_plus,
-            Wzb=zyy_minus,
-            J=self.J,
-            phi=phi,
-            rho_rebar=rho_rebar,
-        )
+        frame_props = self._get_current_props(Eref)
+        self.area, self.J = frame_props["A"], frame_props["J"]
+        self.Iy, self.Iz = frame_props["Iy"], frame_props["Iz"]
+        keys = ["A", "centroid", "Iy", "Iz", "Iyz", "Wyt", "Wyb", "Wzt", "Wzb", "J", "phi", "rho_rebar"]
+        sec_props = {key: frame_props[key] for key in keys}
+        self._props_eref["frame"] = Eref
         if display_results:
             syms = [
                 "A",
@@ -1262,6 +1410,7 @@ class FiberSecMesh:
         """
         if not self.sec_props:
             self._run_sec_props(Eref)
+        self._solve_section("warping")
         self.section.display_results(fmt=fmt)
 
     @staticmethod
@@ -1440,10 +1589,8 @@ class FiberSecMesh:
         plot_stress = plot_stress.lower()
         if (not self.frame_sec_props) and (not self.sec_props):
             _ = self.get_frame_props()
-        if self.section.section_props.omega is None and (
-            Vy != 0 or Vz != 0 or Mxx != 0
-        ):
-            _ = self.get_sec_props()
+        # the warping analysis is only needed for the shear and torsion stresses
+        self._solve_section("warping" if (Vy != 0 or Vz != 0 or Mxx != 0) else "geometric")
         stress_post = self.section.calculate_stress(
             n=N, vx=Vy, vy=Vz, mxx=Myy, myy=Mzz, mzz=Mxx
         )
@@ -1529,7 +1676,9 @@ class FiberSecMesh:
             self.geom_group_map[name] = new_geom
         self._centering_section_geometry()
         self.is_centring = True
+        shift = np.array([[1.0, 0.0, -self.centroid[0]], [0.0, 1.0, -self.centroid[1]], [0.0, 0.0, 1.0]])
         self.centroid = np.array([0.0, 0.0])
+        self._update_props(shift)
 
     def rotate(
             self,
@@ -1549,9 +1698,9 @@ class FiberSecMesh:
             Defaults to "center".
         remesh : bool, default=False
             If True, will remesh the section.
-            So the cross-section properties will be updated.
-            If False, Only the existing mesh will be rotated,
-            and the cross-section properties will not be updated
+            If False, Only the existing mesh will be rotated.
+            In both cases, the cross-section properties are rotated analytically
+            from the cached ones, without solving them again.
 
         Returns
         ---------
@@ -1584,6 +1733,14 @@ class FiberSecMesh:
             self._to_mesh_section()
             txt = get_random_color_rich(self.sec_name)
             CONSOLE.print(f"{PKG_PREFIX}The section {txt} has been successfully remeshed!")
+        # the affine map of sec_rotation
+        cos, sin = np.cos(theta / 180 * np.pi), np.sin(theta / 180 * np.pi)
+        rotation = np.array(
+            [[cos, sin, xo - cos * xo - sin * yo], [-sin, cos, yo + sin * xo - cos * yo], [0.0, 0.0, 1.0]]
+        )
+        if remesh:
+            self._section_frame = rotation @ self._props_frame
+        self._update_props(rotation)
         # rebar
         for i, data in enumerate(self.rebar_data):
             rebar_xy = self.rebar_data[i]["rebar_xy"]
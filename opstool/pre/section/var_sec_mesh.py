@@ -1,11 +1,20 @@
+import multiprocessing
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pyvista as pv
+from matplotlib.tri import Triangulation
+from sectionproperties.pre.geometry import CompoundGeometry, Geometry
+from sectionproperties.pre.pre import create_mesh
+from shapely import LineString, Polygon
 
-# from sectionproperties.pre.geometry import Geometry
-from shapely import LineString
+from ...utils import CONSTANTS, get_random_color_rich
+from .sec_mesh import FiberSecMesh, _SEC_PROPS_CACHE
 
-pv.set_plot_theme("document")
+CONSOLE = CONSTANTS.CONSOLE
+PKG_PREFIX = CONSTANTS.PKG_PREFIX
 
 
 def var_line_string(
@@ -122,6 +131,7 @@ def vis_var_sec(
         If True, display bound outline.
     """
     _, _, cum_coord = _get_path_len(path, n_sec, loc_sec)
+    pv.set_plot_theme("document")
     plotter = pv.Plotter(notebook=on_notebook)
     cum_coord = np.array(cum_coord, dtype=np.float32)
     point_plot1 = pv.PolyData(cum_coord)
@@ -156,7 +166,7 @@ def vis_var_sec(
             :, 1
         ].reshape((-1, 1)) @ np.reshape(vecz, (1, 3))
         points += center0
-        for name, faces in sec_mesh.cells_map.items():
+        for name, faces in sec_mesh.fiber_cells_map.items():
             faces = np.insert(faces, 0, values=3, axis=1)
             face_plot = _generate_mesh(points, faces, kind="face")
             plotter.add_mesh(
@@ -187,6 +197,235 @@ def vis_var_sec(
     plotter.show(title="opstool")
 
 
+def mesh_var_sections(
+    sec_mesh_i: FiberSecMesh,
+    sec_mesh_j: FiberSecMesh,
+    path: list,
+    n_sec: float = 2,
+    loc_sec: list | None = None,
+    y_degree: int = 1,
+    y_sym_plane: str = "j-0",
+    z_degree: int = 2,
+    z_sym_plane: str = "j-0",
+    sec_props: str | None = None,
+    Eref: float = 1.0,
+    num_workers: int = 1,
+    mp_context: str = None,
+):
+    """Mesh a variable section at all stations along a member in one call.
+
+    The section at end i is meshed only once.
+    Its triangulation is mapped to each station by moving the mesh vertices,
+    which are interpolated between the ends along `path` as :func:`var_line_string` does,
+    instead of re-triangulating the section at each station.
+
+    Parameters
+    ----------
+    sec_mesh_i : FiberSecMesh
+        The section at end i, with patches, mesh sizes, OpenSees matTags and rebars.
+        It is meshed if not yet.
+    sec_mesh_j : FiberSecMesh
+        The section at end j, with the patches and rebars corresponding to `sec_mesh_i`,
+        i.e., the same patch names, the same number of outline and hole points in the same order,
+        and the same number of rebars. It does not need to be meshed.
+    path : list
+        Coordinate path of section normal,
+        such as [(x1, y1, z1), (x2, y2, z2), ... , (xn, yn, zn)].
+    n_sec : float, optional
+        The number of sections within each line segment between two coords in Arg `path`,
+        by default 2.
+    loc_sec : list or 1D numpy array, optional, default=None
+        The section position of each element in the range 0-1.
+        If not None, it overwrites n_sec.
+        If None, it will be evenly divided according to Arg *n_sec*.
+    y_degree : int, optional
+        The polynomial order of the y-axis dimension variation of the section,
+        1=linear, 2=parabolic, by default 1.
+    y_sym_plane : str, optional, by default "j-0"
+        When `y_degree`=2, specify the position of the symmetry plane, where the derivative is 0.
+        See :func:`var_line_string`.
+    z_degree : int, optional
+        The polynomial order of the z-axis dimension variation of the section,
+        1=linear, 2=parabolic, by default 2.
+    z_sym_plane : str, optional, by default "j-0"
+        When `z_degree`=2, specify the position of the symmetry plane, where the derivative is 0.
+        See :func:`var_line_string`.
+    sec_props : str, default=None
+        The section properties solved for each station,
+        "frame" (:py:meth:`FiberSecMesh.get_frame_props`) or "sec" (:py:meth:`FiberSecMesh.get_sec_props`).
+        If None, they are solved when first requested.
+    Eref: float, default=1.0
+        Reference modulus of elasticity of the section properties of composite sections.
+    num_workers: int, default=1
+        The number of worker processes to solve the section properties.
+        If 1, they are solved in the current process. If None, the number of CPUs.
+    mp_context: str, default=None
+        The start method of the worker processes, "fork", "spawn" or "forkserver".
+        If None, the default method of the platform.
+
+    Returns
+    --------
+    list[FiberSecMesh]
+        The section of each station, in the order of :func:`var_line_string`,
+        which can be output by :py:meth:`FiberSecMesh.to_opspy_cmds`.
+
+    .. Note::
+        The vertices are mapped piecewise linearly on a triangulation of the outline points of end i,
+        so the outlines of each station are exactly those of :func:`var_line_string`.
+        A ValueError is raised if the ends are so different that a mapped triangle is inverted,
+        in which case the member should be split.
+    """
+    if sec_mesh_i.mesh_obj is None:
+        sec_mesh_i.mesh()
+    if sec_mesh_j.section_geom is None:
+        sec_mesh_j.mesh_size_map = {**sec_mesh_i.mesh_size_map, **sec_mesh_j.mesh_size_map}
+        sec_mesh_j._to_geometry()
+    geom_i, geom_j = sec_mesh_i.section_geom, sec_mesh_j.section_geom
+    geoms_i = geom_i.geoms if isinstance(geom_i, CompoundGeometry) else [geom_i]
+    geoms_j = geom_j.geoms if isinstance(geom_j, CompoundGeometry) else [geom_j]
+    if sec_mesh_i.geom_names != sec_mesh_j.geom_names:
+        raise ValueError("The patches of sec_mesh_i and sec_mesh_j must have the same names in the same order!")
+    # * the outline points of each patch at both ends
+    rings_i, rings_j, point_map = [], [], dict()
+    for gi, gj in zip(geoms_i, geoms_j):
+        ri = [np.asarray(ring.coords) for ring in [gi.geom.exterior, *gi.geom.interiors]]
+        rj = [np.asarray(ring.coords) for ring in [gj.geom.exterior, *gj.geom.interiors]]
+        if [len(ring) for ring in ri] != [len(ring) for ring in rj]:
+            raise ValueError("The outlines and holes of sec_mesh_i and sec_mesh_j must have the same number of points!")
+        for pi, pj in zip(np.vstack(ri), np.vstack(rj)):
+            point_map.setdefault(tuple(pi), pj)
+        rings_i.append(ri)
+        rings_j.append(rj)
+    # * the piecewise linear map on the triangulation of the outline points of end i
+    points_i = np.array(geom_i.points, dtype=float)
+    points_j = np.array([point_map[tuple(point)] for point in geom_i.points], dtype=float)
+    coarse = create_mesh(
+        points=geom_i.points,
+        facets=geom_i.facets,
+        holes=geom_i.holes,
+        control_points=geom_i.control_points,
+        mesh_sizes=[0.0] * len(geom_i.control_points),
+        min_angle=0.0,
+        coarse=True,
+    )
+    coarse_triangles = np.asarray(coarse["triangles"])[:, :3]
+    if np.any(coarse_triangles >= len(points_i)):
+        raise ValueError("The outlines of sec_mesh_i can not be triangulated without new points!")
+    vertices = np.asarray(sec_mesh_i.points, dtype=float)
+    vertices_j = vertices + _map_points(vertices, points_i, points_j - points_i, coarse_triangles)
+    triangles = np.asarray(sec_mesh_i.mesh_obj["triangles"])
+    # the nodes 3, 4, 5 of the quadratic triangles are at the middle of the edges 1-2, 2-0, 0-1
+    mid_nodes = triangles[:, 3:].ravel()
+    mid_ends = triangles[:, [1, 2, 2, 0, 0, 1]].reshape(-1, 2)
+    sign_i = np.sign(_triangle_areas(vertices, triangles))
+
+    # * stations
+    length, cum_length, _ = _get_path_len(path, n_sec, loc_sec)
+    cum_length = np.asarray(cum_length, dtype=float)
+    hy = _get_coord(0, 0.0, length, 1.0, cum_length, degree=y_degree, sym_plane=y_sym_plane)
+    hz = _get_coord(0, 0.0, length, 1.0, cum_length, degree=z_degree, sym_plane=z_sym_plane)
+    factors = np.column_stack([hy, hz])
+    if len(sec_mesh_i.rebar_data) != len(sec_mesh_j.rebar_data) or any(
+        np.shape(di["rebar_xy"]) != np.shape(dj["rebar_xy"])
+        for di, dj in zip(sec_mesh_i.rebar_data, sec_mesh_j.rebar_data)
+    ):
+        raise ValueError("The rebars of sec_mesh_i and sec_mesh_j must have the same number!")
+
+    sec_meshes = []
+    for k, (factor, x) in enumerate(zip(factors, cum_length)):
+        sec_mesh = FiberSecMesh(sec_name=f"{sec_mesh_i.sec_name}-{k + 1}")
+        # * mesh
+        points = vertices + (vertices_j - vertices) * factor
+        points[mid_nodes] = points[mid_ends].mean(axis=1)
+        if np.any(np.sign(_triangle_areas(points, triangles)) != sign_i):
+            raise ValueError(f"The mapped mesh of station {k + 1} has inverted triangles, please split the member!")
+        sec_mesh.mesh_obj = {**sec_mesh_i.mesh_obj, "vertices": points}
+        # * patches
+        geoms, group_geoms = [], dict()
+        for gi, ri, rj, name in zip(geoms_i, rings_i, rings_j, sec_mesh_i.geom_names):
+            rings = [pi + (pj - pi) * factor for pi, pj in zip(ri, rj)]
+            geom = Geometry(geom=Polygon(rings[0], rings[1:]), material=gi.material)
+            geoms.append(geom)
+            group_geoms.setdefault(name, []).append(geom)
+        for name, geoms_ in group_geoms.items():
+            sec_mesh.geom_group_map[name] = geoms_[0] if len(geoms_) == 1 else CompoundGeometry(geoms_)
+        sec_mesh.geom_names = list(sec_mesh_i.geom_names)
+        sec_mesh.section_geom = geoms[0] if len(geoms) == 1 else CompoundGeometry(geoms)
+        sec_mesh.section_geom.mesh = sec_mesh.mesh_obj
+        sec_mesh.section_mesh_sizes = sec_mesh_i.section_mesh_sizes
+        sec_mesh.mesh_size_map = dict(sec_mesh_i.mesh_size_map)
+        sec_mesh.mat_ops_map = dict(sec_mesh_i.mat_ops_map)
+        sec_mesh.color_map = dict(sec_mesh_i.color_map)
+        sec_mesh._get_mesh_data()
+        sec_mesh._set_props_key()
+        # * rebars
+        for di, dj in zip(sec_mesh_i.rebar_data, sec_mesh_j.rebar_data):
+            rebar_xy = np.asarray(di["rebar_xy"], dtype=float)
+            sec_mesh.rebar_data.append(
+                dict(
+                    di,
+                    rebar_xy=rebar_xy + (np.asarray(dj["rebar_xy"]) - rebar_xy) * factor,
+                    dia=di["dia"] + (dj["dia"] - di["dia"]) * x / length,
+                )
+            )
+        sec_meshes.append(sec_mesh)
+
+    # * section props
+    if sec_props is not None:
+        if sec_props not in ("frame", "sec"):
+            raise ValueError(f"sec_props={sec_props} must be None, 'frame' or 'sec'!")
+        analysis = "frame" if sec_props == "frame" else "warping"
+        num_workers = os.cpu_count() if num_workers is None else max(int(num_workers), 1)
+        if num_workers > 1:
+            ctx = multiprocessing.get_context(mp_context)
+            with ProcessPoolExecutor(max_workers=num_workers, mp_context=ctx) as executor:
+                for key, cache in executor.map(_solve_var_sec, sec_meshes, [analysis] * len(sec_meshes)):
+                    _SEC_PROPS_CACHE.setdefault(key, dict()).update(cache)
+        for sec_mesh in sec_meshes:
+            if sec_props == "frame":
+                sec_mesh.get_frame_props(Eref)
+            else:
+                sec_mesh.get_sec_props(Eref)
+    txt = get_random_color_rich(sec_mesh_i.sec_name)
+    CONSOLE.print(f"{PKG_PREFIX}{len(sec_meshes)} stations of the section {txt} have been successfully meshed!")
+    return sec_meshes
+
+
+def _solve_var_sec(sec_mesh, analysis):
+    sec_mesh._get_cached_props("geometric")
+    sec_mesh._get_cached_props(analysis)
+    return sec_mesh._props_key, _SEC_PROPS_CACHE[sec_mesh._props_key]
+
+
+def _map_points(points, nodes, values, triangles):
+    """
+    Interpolate the nodal values at the points linearly on the triangles.
+    """
+    tri = Triangulation(nodes[:, 0], nodes[:, 1], triangles)
+    idx = tri.get_trifinder()(points[:, 0], points[:, 1])
+    # the points on the outlines may be missed by the round-off, take the triangle of the nearest barycentric coords
+    missed = np.flatnonzero(idx < 0)
+    if len(missed) > 0:
+        bary = _barycentric(points[missed, None], nodes[triangles][None])
+        idx[missed] = np.argmax(bary.min(axis=-1), axis=1)
+    bary = _barycentric(points, nodes[triangles[idx]])
+    return np.einsum("ij,ijk->ik", bary, values[triangles[idx]])
+
+
+def _barycentric(points, corners):
+    (x1, y1), (x2, y2), (x3, y3) = [np.moveaxis(corners[..., i, :], -1, 0) for i in range(3)]
+    x, y = np.moveaxis(points, -1, 0)
+    det = (y2 - y3) * (x1 - x3) + (x3 - x2) * (y1 - y3)
+    l1 = ((y2 - y3) * (x - x3) + (x3 - x2) * (y - y3)) / det
+    l2 = ((y3 - y1) * (x - x3) + (x1 - x3) * (y - y3)) / det
+    return np.stack([l1, l2, 1 - l1 - l2], axis=-1)
+
+
+def _triangle_areas(points, triangles):
+    (x1, y1), (x2, y2), (x3, y3) = [points[triangles[:, i]].T for i in range(3)]
+    return 0.5 * ((x2 - x1) * (y3 - y1) - (x3 - x1) * (y2 - y1))
+
+
 def _get_path_len(path, n_sec, loc=None):
     n = len(path)
     if loc is not None:
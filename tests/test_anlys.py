@@ -0,0 +1,368 @@
+import time
+import warnings
+
+import numpy as np
+import pytest
+import openseespy.opensees as ops
+import opstool as opst
+from opstool.anlys._smart_analyze import AlgorithmSelector, StepController
+from opstool.anlys._smart_checkpoint import DomainCheckpoint
+
+
+def _build_sdof(fy=1.0):
+    ops.wipe()
+    ops.model("basic", "-ndm", 1, "-ndf", 1)
+    ops.node(1, 0.0)
+    ops.node(2, 0.0)
+    ops.fix(1, 1)
+    ops.mass(2, 1.0)
+    ops.uniaxialMaterial("Steel02", 1, fy, 40.0, 0.02, 18.0, 0.925, 0.15)
+    ops.element("zeroLength", 1, 1, 2, "-mat", 1, "-dir", 1)
+    t = np.arange(0, 4, 0.02)
+    ops.timeSeries("Path", 1, "-dt", 0.02, "-values", *(3.0 * np.sin(2 * np.pi * t)))
+    ops.pattern("UniformExcitation", 1, 1, "-accel", 1)
+    ops.constraints("Plain")
+    ops.numberer("Plain")
+    ops.system("BandGeneral")
+    ops.integrator("Newmark", 0.5, 0.25)
+    return len(t)
+
+
+def _run_transient(**kwargs):
+    npts = _build_sdof()
+    analysis = opst.anlys.SmartAnalyze(analysis_type="Transient", **kwargs)
+    for _ in analysis.transient_split(npts):
+        assert analysis.TransientAnalyze(0.02) == 0
+    analysis.close()
+    return analysis
+
+
+def test_step_controller():
+    controller = StepController(relaxation=0.5, grow_factor=2.0, grow_after=2, target_iter=3)
+    assert controller.get_step(-1.0) == -1.0
+    step = controller.on_failure(-1.0)
+    assert step == -0.5
+    assert controller.on_success(step, num_iter=2, max_step=-1.0) == -0.5
+    assert controller.get_step(-1.0) == -0.5
+    assert controller.on_success(step, num_iter=2, max_step=-1.0) == -1.0
+    assert controller.on_success(-0.25, num_iter=8, max_step=-1.0) == -0.25
+    assert controller.num_smooth == 0
+    # a step clipped to the remaining part does not shrink the stable step
+    controller.on_success(-0.1, num_iter=8, max_step=-1.0, clipped=True)
+    assert controller.get_step(-1.0) == -0.25
+
+
+def test_adaptive_step():
+    _run_transient(adaptiveStep=False)
+    disp = ops.nodeDisp(2, 1)
+    _run_transient(adaptiveStep=True)
+    assert np.isclose(ops.getTime(), 4.0)
+    np.testing.assert_allclose(ops.nodeDisp(2, 1), disp)
+
+
+def test_adaptive_step_clipped():
+    _build_sdof()
+    analysis = opst.anlys.SmartAnalyze(analysis_type="Transient", adaptiveStep=True, telemetry=True, stepGrowAfter=100)
+    analysis.step_controller.stable_step = 0.015
+    for _ in range(3):
+        assert analysis.TransientAnalyze(0.02) == 0
+    analysis.close()
+    # 0.015 + 0.005 in each call, the clipped 0.005 is not remembered
+    records = analysis.telemetry.to_numpy()
+    assert len(records) == 6
+    np.testing.assert_array_equal(np.bincount(records["step"])[1:], [2, 2, 2])
+    np.testing.assert_allclose(ops.getTime(), 0.06)
+
+
+def test_adaptive_step_failure(monkeypatch):
+    _build_sdof()
+    analysis = opst.anlys.SmartAnalyze(analysis_type="Transient", adaptiveStep=True, stepGrowAfter=100)
+    analysis.step_controller.stable_step = 0.005
+    analyze_one_step, steps = analysis._analyze_one_step, []
+
+    def _analyze_one_step(step, verbose):
+        steps.append(step)
+        # the second sub-step fails
+        return -1 if len(steps) == 2 else analyze_one_step(step, verbose)
+
+    monkeypatch.setattr(analysis, "_analyze_one_step", _analyze_one_step)
+    assert analysis.TransientAnalyze(0.02) == 0
+    analysis.close()
+    # a failure only shrinks the step, the remaining step is not tried
+    np.testing.assert_allclose(steps[:3], [0.005, 0.005, 0.0025])
+    assert max(steps[2:]) <= 0.0025 + 1e-12
+    np.testing.assert_allclose(ops.getTime(), 0.02)
+
+
+def test_telemetry(tmp_path):
+    analysis = _run_transient(telemetry=True, algoTypes=[10, 40])
+    records = analysis.telemetry.to_numpy()
+    assert len(records) == 200
+    assert np.all(records["ok"] == 0) and np.all(records["algorithm"] == 10)
+    np.testing.assert_allclose(records["time"][-1], 4.0)
+    ds = analysis.telemetry.to_xarray()
+    assert ds.sizes["attempt"] == 200
+    summary = analysis.telemetry.summary(print_table=False)
+    assert summary["strategy"]["initial"]["attempts"] == 200
+    analysis.telemetry.save(tmp_path / "telemetry.npy")
+    loaded = opst.anlys.SmartAnalyzeTelemetry.load(tmp_path / "telemetry.npy")
+    np.testing.assert_array_equal(loaded.to_numpy(), records)
+
+
+def test_log_buffer():
+    ops.wipe()
+    ops.model("basic", "-ndm", 1, "-ndf", 1)
+    ops.node(1, 0.0)
+    ops.node(2, 0.0)
+    ops.fix(1, 1)
+    ops.uniaxialMaterial("Elastic", 1, 0.0)
+    ops.element("zeroLength", 1, 1, 2, "-mat", 1, "-dir", 1)
+    ops.timeSeries("Linear", 1)
+    ops.pattern("Plain", 1, 1)
+    ops.load(2, 1.0)
+    ops.constraints("Plain")
+    ops.numberer("Plain")
+    ops.system("BandGeneral")
+    ops.integrator("Newmark", 0.5, 0.25)
+    analysis = opst.anlys.SmartAnalyze(logMode="buffer", logBufferSize=3, algoTypes=[10], minStep=0.01)
+    assert analysis.TransientAnalyze(0.1) < 0
+    messages = analysis.output.get_messages()
+    assert len(messages) == 3 and "analyze failed" in messages[-1]
+    analysis.close()
+    assert not analysis.output.active
+
+
+def test_algorithm_selector():
+    selector = AlgorithmSelector([10, 40, 20, 30], window=4, promote_steps=2)
+    assert selector.get_fallbacks() == [40, 20, 30]
+    selector.add_attempt(10, -1, 5.0)
+    selector.add_attempt(40, -1, 1.0)
+    selector.add_attempt(20, 0, 3.0)
+    assert selector.get_fallbacks() == [20, 30, 40]
+    selector.on_rescue(20)
+    assert selector.primary == 20
+    assert selector.get_fallbacks() == [30, 10, 40]
+    for _ in range(3):
+        selector.on_step()
+    assert selector.primary == 10
+    for _ in range(4):
+        selector.add_attempt(40, 0, 1.0)
+    assert selector.get_fallbacks()[0] == 40
+
+
+def test_learn_algo_types():
+    analysis = _run_transient(tryAlterAlgoTypes=True, learnAlgoTypes=True, algoTypes=[10, 40])
+    assert analysis.algo_selector.primary == 10
+    assert len(analysis.algo_selector.records[10]) == 50
+
+
+def test_checkpoint_resume(tmp_path):
+    _run_transient(checkpointEvery=50)
+    disp = ops.nodeDisp(2, 1)
+    _run_transient()
+    np.testing.assert_allclose(ops.nodeDisp(2, 1), disp)
+
+    # the resumed run is exact for an elastic model
+    npts = _build_sdof(fy=1e6)
+    analysis = opst.anlys.SmartAnalyze(checkpointEvery=50)
+    for _ in analysis.transient_split(npts):
+        analysis.TransientAnalyze(0.02)
+    analysis.close()
+    disp = ops.nodeDisp(2, 1)
+
+    npts = _build_sdof(fy=1e6)
+    analysis = opst.anlys.SmartAnalyze(checkpointEvery=50, checkpointDir=str(tmp_path))
+    for _ in analysis.transient_split(npts)[:120]:  # crashed at step 120
+        analysis.TransientAnalyze(0.02)
+    analysis.close()
+
+    npts = _build_sdof(fy=1e6)
+    analysis = opst.anlys.SmartAnalyze(checkpointEvery=50, checkpointDir=str(tmp_path))
+    segs = analysis.transient_split(npts)
+    with pytest.warns(UserWarning, match="path-independent"):
+        start = analysis.resume()
+    assert start == 100 and np.isclose(ops.getTime(), 2.0)
+    for _ in segs[start:]:
+        assert analysis.TransientAnalyze(0.02) == 0
+    analysis.close()
+    np.testing.assert_allclose(ops.nodeDisp(2, 1), disp, rtol=1e-8)
+
+def _run_rollback(mode, fy, monkeypatch=None, fail_call=8):
+    npts = _build_sdof(fy=fy)
+    analysis = opst.anlys.SmartAnalyze(checkpointEvery=5, checkpointMode=mode, telemetry=True)
+    if monkeypatch is not None:
+        # every strategy fails at the call ``fail_call``, except the replay from the checkpoint
+        analyze_one_step = analysis._analyze_one_step
+
+        def _analyze_one_step(step, verbose):
+            if analysis.current_args["calls"] == fail_call and analysis.current_args["strategy"] != "rollback":
+                return -1
+            return analyze_one_step(step, verbose)
+
+        monkeypatch.setattr(analysis, "_analyze_one_step", _analyze_one_step)
+    for _ in analysis.transient_split(npts)[:20]:
+        assert analysis.TransientAnalyze(0.02) == 0
+    analysis.close()
+    return analysis, ops.nodeDisp(2, 1)
+
+
+def test_checkpoint_rollback(monkeypatch):
+    # the database mode rolls back the material states, the nodal mode is exact for the elastic model
+    for mode, fy in (("database", 1.0), ("nodal", 1e6)):
+        _, disp = _run_rollback(mode, fy)
+        with warnings.catch_warnings(record=True) as records:
+            warnings.simplefilter("always")
+            analysis, disp2 = _run_rollback(mode, fy, monkeypatch)
+        assert (len(records) > 0) == (mode == "nodal")
+        assert np.isclose(ops.getTime(), 0.4)
+        # the steps since the checkpoint are replayed by smaller sub-steps
+        np.testing.assert_allclose(disp2, disp, rtol=1e-3)
+        summary = analysis.telemetry.summary(print_table=False)["strategy"]
+        # the steps 6 and 7 since the checkpoint at the step 5 and the failed step 8, at least two sub-steps each
+        assert summary["rollback"]["attempts"] >= 6
+        monkeypatch.undo()
+
+    # the nodal rollback of a yielding model is flagged
+    with pytest.warns(UserWarning, match="path-independent"):
+        _run_rollback("nodal", 1.0, monkeypatch)
+    monkeypatch.undo()
+
+    # the nodal mode is used if the database commands fail
+    def save(tag):
+        raise RuntimeError("sendSelf is not implemented")
+
+    monkeypatch.setattr(ops, "save", save)
+    with pytest.warns(UserWarning, match="database commands failed"):
+        analysis, _ = _run_rollback("database", 1e6)
+    assert analysis.checkpoint.mode == "nodal"
+
+
+def test_checkpoint_in_memory():
+    _build_sdof()
+    ops.test("NormDispIncr", 1e-10, 10)
+    ops.algorithm("Newton")
+    ops.analysis("Transient")
+    ops.analyze(10, 0.02)
+    checkpoint = DomainCheckpoint(every=10, mode="nodal")
+    checkpoint.save(progress=10)
+    disp, vel = ops.nodeDisp(2, 1), ops.nodeVel(2, 1)
+    ops.analyze(5, 0.02)
+    with pytest.warns(UserWarning, match="path-independent"):
+        assert checkpoint.restore()["progress"] == 10
+    assert np.isclose(ops.getTime(), 0.2)
+    assert ops.nodeDisp(2, 1) == disp and ops.nodeVel(2, 1) == vel
+
+
+def _build_sdof_model():
+    ops.wipe()
+    ops.model("basic", "-ndm", 1, "-ndf", 1)
+    ops.node(1, 0.0)
+    ops.node(2, 0.0)
+    ops.fix(1, 1)
+    ops.mass(2, 1.0)
+    ops.uniaxialMaterial("Steel02", 1, 1.0, 40.0, 0.02, 18.0, 0.925, 0.15)
+    ops.element("zeroLength", 1, 1, 2, "-mat", 1, "-dir", 1)
+
+
+def _build_slow_model():
+    _build_sdof_model()
+    time.sleep(30)
+
+
+def test_run_ground_motions():
+    t = np.arange(0, 2, 0.02)
+    records = {"sine": (0.02, np.sin(2 * np.pi * t)), "cosine": (0.02, np.cos(2 * np.pi * t))}
+    report = opst.anlys.run_ground_motions(
+        _build_sdof_model, records, scale_factors=[1.0, 3.0, 1.0000001], num_workers=2, verbose=False
+    )
+    assert report["odbTag"].tolist() == ["sine-1", "sine-3", "sine-1-2", "cosine-1", "cosine-3", "cosine-1-5"]
+    assert (report["status"] == "ok").all()
+    assert (report["numSteps"] == len(t)).all()
+    np.testing.assert_allclose(report["endTime"], 2.0)
+    disp = opst.post.get_nodal_responses(odb_tag="sine-3", resp_type="disp", print_info=False)
+    assert disp.sizes["time"] == len(t) + 1
+
+    report = opst.anlys.run_ground_motions(
+        _build_slow_model, {"sine": records["sine"]}, num_workers=1, timeout=1.0, verbose=False
+    )
+    assert report["status"].tolist() == ["timeout"]
+
+
+def _build_rc_section():
+    ops.model("basic", "-ndm", 3, "-ndf", 6)
+    ops.uniaxialMaterial("Concrete01", 1, -30.0, -0.002, -6.0, -0.0033)
+    ops.uniaxialMaterial("Steel01", 2, 400.0, 2.0e5, 0.01)
+    ops.section("Fiber", 1, "-GJ", 1e10)
+    ops.patch("rect", 1, 8, 8, -0.25, -0.25, 0.25, 0.25)
+    ops.layer("straight", 2, 3, 5e-4, -0.2, -0.2, -0.2, 0.2)
+    ops.layer("straight", 2, 3, 5e-4, 0.2, -0.2, 0.2, 0.2)
+
+
+def test_moment_curvature_sweep():
+    sweep = opst.anlys.MomentCurvatureSweep(_build_rc_section, 1, [-2.0, 0.0], axes=["y", "z"])
+    data = sweep.analyze(max_phi=0.05, incr_phi=1e-3, num_workers=2)
+    assert dict(data["FiberData"].sizes) == dict(secTag=1, P=2, axis=2, step=51, fiber=70, property=6)
+    assert (data["numSteps"].sel(P=-2.0) < 51).all()  # stopped by the peak drop
+    assert (data["status"] == "ok").all()
+
+    ops.wipe()
+    _build_rc_section()
+    mc = opst.anlys.MomentCurvature(1, axial_force=-2.0)
+    mc.analyze(axis="y", max_phi=0.05, incr_phi=1e-3)
+    case = dict(secTag=1, P=-2.0, axis="y")
+    steps = slice(0, len(mc.M) - 1)
+    np.testing.assert_allclose(data["M"].sel(**case, step=steps), mc.M)
+    np.testing.assert_allclose(data["FiberData"].sel(**case, step=steps), mc.FiberData)
+    assert np.isnan(data["M"].sel(**case, step=len(mc.M)))
+    assert sweep.get_interaction_diagram()["M"].sel(**case) == np.max(mc.M)
+    limit = sweep.get_limit_state(matTag=[1, 2], threshold=[-0.0033, 0.01])
+    assert (limit["phi"].sel(**case), limit["M"].sel(**case)) == mc.get_limit_state(
+        matTag=[1, 2], threshold=[-0.0033, 0.01]
+    )
+
+
+def test_fiber_moment_curvature():
+    outlines = [[0, 0], [1.0, 0], [1.0, 0.6], [0, 0.6]]
+    coverlines = opst.pre.section.offset(outlines, d=0.05)
+    sec_mesh = opst.pre.section.FiberSecMesh()
+    sec_mesh.add_patch_group(
+        {
+            "cover": opst.pre.section.create_polygon_patch(outlines, holes=[coverlines]),
+            "core": opst.pre.section.create_polygon_patch(coverlines),
+        }
+    )
+    sec_mesh.set_mesh_size({"cover": 0.1, "core": 0.1})
+    sec_mesh.set_ops_mat_tag({"cover": 1, "core": 2})
+    sec_mesh.mesh()
+    sec_mesh.add_rebar_line(points=opst.pre.section.offset(coverlines, d=0.02), dia=0.025, gap=0.1, ops_mat_tag=3)
+    sec_mesh.centring()
+    ops.wipe()
+    ops.model("basic", "-ndm", 3, "-ndf", 6)
+    ops.uniaxialMaterial("Concrete01", 1, -30.0, -0.002, -15.0, -0.005)
+    ops.uniaxialMaterial("Concrete04", 2, -40.0, -0.004, -0.02, 30000.0)
+    ops.uniaxialMaterial("Steel01", 3, 400.0, 2.0e5, 0.02)
+    sec_mesh.to_opspy_cmds(secTag=1, GJ=1e6)
+    laws = {
+        1: opst.anlys.KentParkConcreteLaw(-30.0, -0.002, -15.0, -0.005),
+        2: opst.anlys.ManderConcreteLaw(-40.0, -0.004, 30000.0, -0.02),
+        3: opst.anlys.BilinearSteelLaw(400.0, 2.0e5, 0.02),
+    }
+    mc = opst.anlys.MomentCurvature(1, axial_force=-3.0)
+    mc.analyze(axis="z", max_phi=0.04, incr_phi=5e-4)
+    fmc = opst.anlys.FiberMomentCurvature(sec_mesh, laws, axial_force=-3.0)
+    fmc.analyze(axis="z", max_phi=0.04, incr_phi=5e-4)
+    np.testing.assert_allclose(fmc.phi, mc.phi, atol=1e-12)
+    np.testing.assert_allclose(fmc.M, mc.M, rtol=1e-6)
+    np.testing.assert_allclose(fmc.FiberData, mc.FiberData, atol=1e-6)
+
+    data = fmc.sweep([-3.0, 0.0], axis="z", max_phi=0.04, incr_phi=5e-4)
+    np.testing.assert_allclose(data["M"].sel(P=-3.0), fmc.M, rtol=1e-6)
+
+    # the axial loads past the balance point stop earlier, the others go on
+    data = fmc.sweep(np.linspace(-20.0, 0.0, 11), axis="z", max_phi=0.04, incr_phi=5e-4)
+    assert data["numSteps"].sel(P=-20.0) < data["numSteps"].sel(P=0.0)
+    for p in (-20.0, -12.0):
+        fmc = opst.anlys.FiberMomentCurvature(sec_mesh, laws, axial_force=p)
+        fmc.analyze(axis="z", max_phi=0.04, incr_phi=5e-4)
+        assert data["numSteps"].sel(P=p) == len(fmc.M)
+        np.testing.assert_allclose(data["M"].sel(P=p)[: len(fmc.M)], fmc.M, rtol=1e-6)
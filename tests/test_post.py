@@ -0,0 +1,382 @@
+import numpy as np
+import openseespy.opensees as ops
+import opstool as opst
+import xarray as xr
+from opstool.post._get_response._get_fiber_sec_resp import _get_fiber_sec_data, _get_fiber_sec_resp
+from opstool.post._get_response._stress_measures import _calculate_measures_3D
+from opstool.post.model_data import GetFEMData
+
+def _run_static_analysis(odb_tag, num_steps=6, profile=None, **kwargs):
+    opst.load_ops_examples("Frame3D")
+    ops.wipeAnalysis()
+    ops.timeSeries("Linear", 999)
+    ops.pattern("Plain", 999, 999)
+    fixed_nodes = ops.getFixedNodes()
+    for tag in ops.getNodeTags()[::7]:
+        if tag not in fixed_nodes:
+            ops.load(tag, 0.0, 0.0, -1.0, 0.0, 0.0, 0.0)
+    ops.system("UmfPack")
+    ops.numberer("RCM")
+    ops.constraints("Transformation")
+    ops.test("NormDispIncr", 1e-6, 20)
+    ops.algorithm("Newton")
+    ops.integrator("LoadControl", 0.01)
+    ops.analysis("Static")
+    odb = opst.post.CreateODB(odb_tag=odb_tag, **kwargs)
+    for _ in range(num_steps):
+        ops.analyze(1)
+        odb.fetch_response_step()
+    odb.save_response(profile=profile)
+
+
+def test_odb_run_options():
+    opst.load_ops_examples("Frame3D")
+    opst.post.CreateODB(odb_tag="test-options-a", keep_last_steps=3, save_every=None)
+    odb = opst.post.CreateODB(odb_tag="test-options-b")
+    assert odb._max_steps is None and odb._stream_writer is None
+
+
+def test_streamed_odb():
+    _run_static_analysis("test-memory", save_every=None)
+    _run_static_analysis("test-stream", save_every=4)
+    resp1 = opst.post.get_element_responses("test-memory", ele_type="Frame")
+    resp2 = opst.post.get_element_responses("test-stream", ele_type="Frame")
+    xr.testing.assert_allclose(resp1, resp2)
+    resp1 = opst.post.get_nodal_responses("test-memory")
+    resp2 = opst.post.get_nodal_responses("test-stream")
+    assert resp2.sizes["time"] == 7
+    xr.testing.assert_allclose(resp1, resp2)
+
+
+def test_model_update_versions():
+    _run_static_analysis("test-update", model_update=True)
+    data = opst.post.get_model_data(odb_tag="test-update", data_type="Nodal", from_responses=True)
+    assert data.sizes["time"] == 7
+    xr.testing.assert_identical(data.isel(time=0, drop=True), data.isel(time=-1, drop=True))
+
+
+def test_model_update_coords():
+    _run_static_analysis("test-update-coords", num_steps=2, model_update=True)
+    odb = opst.post.CreateODB(odb_tag="test-update-coords", model_update=True)
+    tag = ops.getNodeTags()[-1]
+    for i in range(2):
+        ops.setNodeCoord(tag, 1, ops.nodeCoord(tag, 1) + i)
+        ops.analyze(1)
+        odb.fetch_response_step()
+    odb.save_response()
+    data = opst.post.get_model_data(odb_tag="test-update-coords", data_type="Nodal", from_responses=True)
+    x = data.sel(tags=tag, coords="x").values
+    assert x[-1] == x[-2] + 1
+
+
+def test_keep_last_steps():
+    _run_static_analysis("test-all", save_every=None, keep_last_steps=None)
+    _run_static_analysis("test-last", save_every=None, keep_last_steps=3)
+    resp1 = opst.post.get_nodal_responses("test-all")
+    resp2 = opst.post.get_nodal_responses("test-last")
+    assert resp2.sizes["time"] == 3
+    xr.testing.assert_allclose(resp1.isel(time=slice(-3, None)), resp2)
+
+
+def test_lazy_read():
+    _run_static_analysis("test-lazy", save_every=None, keep_last_steps=None)
+    resp = opst.post.get_nodal_responses("test-lazy", resp_type="disp")
+    node_tags = resp.coords["nodeTags"].values[:3]
+    lazy_resp = opst.post.get_nodal_responses(
+        "test-lazy", resp_type="disp", node_tags=node_tags, time_range=(0.02, 0.04), lazy=True
+    )
+    assert lazy_resp.sizes["time"] == 3
+    xr.testing.assert_identical(
+        lazy_resp.load(), resp.sel(nodeTags=node_tags, time=slice(0.02, 0.04))
+    )
+
+
+def test_record_policies():
+    _run_static_analysis("test-all", num_steps=9)
+    resp = opst.post.get_nodal_responses("test-all")
+    _run_static_analysis("test-every", num_steps=9, record_every=3)
+    resp_every = opst.post.get_nodal_responses("test-every")
+    assert resp_every.sizes["time"] == 4
+    xr.testing.assert_allclose(resp_every, resp.sel(time=resp_every.coords["time"]))
+
+    disp = resp["disp"].sel(DOFs="UZ")
+    node_tag = int(abs(disp.isel(time=-1)).idxmax())
+    threshold = float(abs(disp.sel(nodeTags=node_tag)).isel(time=6))
+    _run_static_analysis(
+        "test-trigger", num_steps=9, monitor_node_tags=node_tag, monitor_dofs=3, trigger_disp=threshold
+    )
+    resp_trigger = opst.post.get_nodal_responses("test-trigger")
+    monitored = opst.post.get_monitored_responses("test-trigger")
+    assert resp_trigger.sizes["time"] == 5
+    assert monitored.sizes["time"] == 10
+    xr.testing.assert_allclose(
+        monitored["disp"].sel(DOFs="UZ", drop=True),
+        resp["disp"].sel(nodeTags=[node_tag], DOFs="UZ", drop=True),
+    )
+
+
+def test_stress_measures():
+    rng = np.random.default_rng(0)
+    stresses = rng.normal(size=(5, 4, 3, 6))
+    stresses[0, 0, 0] = [2.0, 2.0, 2.0, 0.0, 0.0, 0.0]
+    stresses[1, 1, 1, 2] = np.nan
+    measures = _calculate_measures_3D(stresses, dtype=dict(float=np.float64), max_points=7)
+    tensor = stresses[..., [[0, 3, 5], [3, 1, 4], [5, 4, 2]]]
+    valid = ~np.isnan(stresses).any(axis=-1)
+    principal = np.linalg.eigvalsh(tensor[valid])[:, ::-1]
+    np.testing.assert_allclose(measures[valid][:, :3], principal, atol=1e-10)
+    assert np.isnan(measures[~valid]).all()
+
+
+def test_sharded_odbs():
+    _run_static_analysis("test-all")
+    for i in range(3):
+        _run_static_analysis(f"test-shard-{i}", num_shards=3, shard_index=i)
+    opst.post.merge_odbs([f"test-shard-{i}" for i in range(3)], "test-merged")
+    resp1 = opst.post.get_element_responses("test-all", ele_type="Frame")
+    resp2 = opst.post.get_element_responses("test-merged", ele_type="Frame")
+    xr.testing.assert_allclose(resp1.sortby("eleTags"), resp2)
+    resp1 = opst.post.get_nodal_responses("test-all")
+    resp2 = opst.post.get_nodal_responses("test-merged")
+    xr.testing.assert_allclose(resp1, resp2)
+
+
+def test_storage_profiles():
+    _run_static_analysis("test-all")
+    resp = opst.post.get_nodal_responses("test-all")
+    data = opst.post.get_model_data(odb_tag="test-all", data_type="Nodal", from_responses=True)
+    for profile in ["archive", "fast-write", "visualization"]:
+        _run_static_analysis(f"test-{profile}", profile=profile)
+        resp2 = opst.post.get_nodal_responses(f"test-{profile}")
+        data2 = opst.post.get_model_data(odb_tag=f"test-{profile}", data_type="Nodal", from_responses=True)
+        xr.testing.assert_identical(data, data2)
+        if profile == "visualization":
+            xr.testing.assert_allclose(resp, resp2, rtol=1e-3, atol=1e-12)
+        else:
+            xr.testing.assert_identical(resp, resp2)
+
+
+def test_model_data_snapshot():
+    ops.wipe()
+    ops.model("basic", "-ndm", 2, "-ndf", 2)
+    for i, (x, y) in enumerate([(0, 0), (1, 0), (2, 0), (0, 1), (1, 1), (2, 1), (3, 1), (3, 0)]):
+        ops.node(i + 1, x, y)
+    ops.nDMaterial("ElasticIsotropic", 1, 1e3, 0.2)
+    ops.uniaxialMaterial("Elastic", 1, 1e3)
+    ops.element("quad", 1, 1, 2, 5, 4, 1.0, "PlaneStress", 1)
+    ops.element("tri31", 2, 2, 3, 6, 1.0, "PlaneStress", 1)
+    ops.element("truss", 3, 2, 6, 1.0, 1)
+    ops.element("zeroLength", 4, 3, 8, "-mat", 1, "-dir", 1)
+    ops.element("truss", 5, 6, 7, 1.0, 1)
+    model_data = GetFEMData()
+    model_info, cells = model_data.get_model_info()
+    assert list(cells) == ["FourNodeQuad", "Tri31", "Truss", "ZeroLength"]
+    np.testing.assert_array_equal(cells["Truss"].values, [[2, 1, 5, 3], [2, 5, 6, 3]])
+    np.testing.assert_array_equal(
+        model_info["UnstructuralData"].values, [[4, 0, 1, 4, 3, 9], [3, 1, 2, 5, -1, 5]]
+    )
+    np.testing.assert_allclose(model_info["eleCenters"].sel(eleTags=2).values, [5 / 3, 1 / 3, 0.0], rtol=1e-6)
+    assert model_info["eleCenters"].coords["eleTags"].values.tolist() == [1, 2, 3, 4, 5]
+    assert {"eleQuery", "eleGroups", "eleCells"} <= set(model_data.timings)
+
+
+def test_model_data_cache():
+    opst.load_ops_examples("Frame3D")
+    fingerprint = opst.post.get_model_fingerprint()
+    model_info, cells = opst.post.load_model_data(odb_tag=None)
+    model_info2, _ = opst.post.load_model_data(odb_tag=None)
+    xr.testing.assert_identical(model_info2["NodalData"], model_info["NodalData"])
+    # the cached snapshot is not changed by the caller
+    nodal_data = model_info["NodalData"].copy()
+    model_info2["NodalData"][0, 0] = 1e10
+    model_info3, _ = opst.post.load_model_data(odb_tag=None)
+    xr.testing.assert_identical(model_info3["NodalData"], nodal_data)
+    opst.post.save_model_data(odb_tag="test-cache")
+    saved_info, _ = opst.post.load_model_data(odb_tag="test-cache", resave=True)
+    xr.testing.assert_allclose(saved_info["NodalData"], model_info["NodalData"])
+    ops.node(99999, 0.0, 0.0, 0.0)
+    assert opst.post.get_model_fingerprint() != fingerprint
+    model_info3, _ = opst.post.load_model_data(odb_tag=None)
+    assert model_info3["NodalData"].sizes["tags"] == model_info["NodalData"].sizes["tags"] + 1
+
+
+def test_model_data_cache_ele_class():
+    ops.wipe()
+    ops.model("basic", "-ndm", 3, "-ndf", 6)
+    ops.node(1, 0.0, 0.0, 0.0)
+    ops.node(2, 1.0, 0.0, 0.0)
+    ops.fix(1, 1, 1, 1, 1, 1, 1)
+    ops.uniaxialMaterial("Elastic", 1, 1.0)
+    ops.element("Truss", 1, 1, 2, 1.0, 1)
+    fingerprint = opst.post.get_model_fingerprint()
+    model_info, _ = opst.post.load_model_data(odb_tag=None)
+    assert model_info["TrussData"].sizes["eleTags"] == 1
+    ops.remove("element", 1)
+    ops.geomTransf("Linear", 1, 0.0, 0.0, 1.0)
+    ops.element("elasticBeamColumn", 1, 1, 2, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1)
+    fingerprint2 = opst.post.get_model_fingerprint()
+    assert fingerprint2 != fingerprint
+    model_info, _ = opst.post.load_model_data(odb_tag=None)
+    assert model_info["BeamData"].sizes["eleTags"] == 1
+    # the orientation of the beam
+    ops.remove("element", 1)
+    ops.geomTransf("Linear", 2, 0.0, 1.0, 0.0)
+    ops.element("elasticBeamColumn", 1, 1, 2, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 2)
+    assert opst.post.get_model_fingerprint() not in (fingerprint, fingerprint2)
+
+
+def _run_loaded_cantilevers(odb_tag, ndm, build):
+    ops.wipe()
+    ops.model("basic", "-ndm", ndm, "-ndf", 3 * (ndm - 1))
+    ops.timeSeries("Linear", 1)
+    build()
+    ops.system("BandGeneral")
+    ops.numberer("Plain")
+    ops.constraints("Plain")
+    ops.test("NormDispIncr", 1e-10, 10)
+    ops.algorithm("Newton")
+    ops.integrator("LoadControl", 1.0)
+    ops.analysis("Static")
+    odb = opst.post.CreateODB(odb_tag=odb_tag)
+    ops.analyze(1)
+    odb.fetch_response_step()
+    odb.save_response()
+    resp = opst.post.get_element_responses(odb_tag, ele_type="Frame", print_info=False).isel(time=-1)
+    return resp["sectionForces"].values, resp["sectionLocs"].sel(locs="alpha").values
+
+
+def _cantilever_sec_forces(x, length, loads):
+    """The closed-form section forces (N, MZ, VY, MY, VZ) of a cantilever fixed at end i,
+    ``loads`` are (wx, wy, wz, a, b) uniform over [a, b], or point loads if a == b, in ratios of the length."""
+    forces = np.zeros((len(x), 5))
+    for wx, wy, wz, a, b in loads:
+        a, b = a * length, b * length
+        start = np.maximum(x, a)
+        if a == b:  # the resultant and its arm of the load beyond x
+            total, arm = np.where(x < a, 1.0, 0.0), a - x
+        else:
+            total = np.clip(b - start, 0.0, None)
+            arm = np.where(x < b, 0.5 * (b + start), 0.0) - x
+        forces += np.column_stack([wx * total, wy * total * arm, -wy * total, -wz * total * arm, wz * total])
+    return forces
+
+
+def test_elastic_beam_sec_forces():
+    length = 2.0
+    point = (1.5, -3.0, 2.0, 0.3, 0.3)
+    full = (0.25, -1.0, 0.5, 0.0, 1.0)
+
+    def build_3d():
+        ops.geomTransf("Linear", 1, 0.0, 0.0, 1.0)
+        ops.section("Elastic", 1, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0)
+        ops.beamIntegration("Lobatto", 1, 1, 5)
+        for k in range(3):
+            ops.node(10 * k + 1, 0.0, 5.0 * k, 0.0)
+            ops.node(10 * k + 2, length, 5.0 * k, 0.0)
+            ops.fix(10 * k + 1, 1, 1, 1, 1, 1, 1)
+        # the force-based beam in the middle, between the elastic beams
+        ops.element("elasticBeamColumn", 1, 1, 2, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1)
+        ops.element("forceBeamColumn", 2, 11, 12, 1, 1)
+        ops.element("elasticBeamColumn", 3, 21, 22, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1)
+        ops.pattern("Plain", 1, 1)
+        ops.eleLoad("-ele", 1, "-type", "-beamPoint", point[1], point[2], point[3], point[0])
+        ops.eleLoad("-ele", 2, 3, "-type", "-beamUniform", full[1], full[2], full[0])
+
+    sec_forces, locs = _run_loaded_cantilevers("test-beam-loads-3d", 3, build_3d)
+    for k, loads in enumerate([[point], [full], [full]]):
+        x = locs[k][~np.isnan(locs[k])] * length
+        expected = _cantilever_sec_forces(x, length, loads)
+        if k == 1:  # the elastic section of the force-based beam has no shear forces
+            np.testing.assert_allclose(sec_forces[k, : len(x), [0, 1, 3]].T, expected[:, [0, 1, 3]], atol=1e-5)
+        else:
+            np.testing.assert_allclose(sec_forces[k, : len(x), :5], expected, atol=1e-5)
+
+    partial = (0.5, -2.0, 0.0, 0.25, 0.75)
+
+    def build_2d():
+        ops.geomTransf("Linear", 1)
+        ops.node(1, 0.0, 0.0)
+        ops.node(2, length, 0.0)
+        ops.fix(1, 1, 1, 1)
+        ops.element("elasticBeamColumn", 1, 1, 2, 1.0, 1.0, 1.0, 1)
+        ops.pattern("Plain", 1, 1)
+        ops.eleLoad("-ele", 1, "-type", "-beamUniform", partial[1], partial[0], partial[3], partial[4])
+
+    sec_forces, locs = _run_loaded_cantilevers("test-beam-loads-2d", 2, build_2d)
+    expected = _cantilever_sec_forces(locs[0] * length, length, [partial])
+    np.testing.assert_allclose(sec_forces[0, :, :3], expected[:, :3], atol=1e-5)
+
+    def build_force_beam():
+        ops.geomTransf("Linear", 1, 0.0, 0.0, 1.0)
+        ops.section("Elastic", 1, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0)
+        ops.beamIntegration("Lobatto", 1, 1, 3)
+        ops.node(1, 0.0, 0.0, 0.0)
+        ops.node(2, length, 0.0, 0.0)
+        ops.fix(1, 1, 1, 1, 1, 1, 1)
+        ops.element("forceBeamColumn", 1, 1, 2, 1, 1)
+        ops.pattern("Plain", 1, 1)
+        ops.eleLoad("-ele", 1, "-type", "-beamUniform", full[1], full[2], full[0])
+
+    # no elastic beams, and fewer sections than the points of the elastic beams
+    sec_forces, locs = _run_loaded_cantilevers("test-beam-loads-force", 3, build_force_beam)
+    expected = _cantilever_sec_forces(locs[0] * length, length, [full])
+    np.testing.assert_allclose(sec_forces[0][:, [0, 1, 3]], expected[:, [0, 1, 3]], atol=1e-5)
+
+
+def test_fiber_sec_resp():
+    ops.wipe()
+    ops.model("basic", "-ndm", 3, "-ndf", 6)
+    ops.uniaxialMaterial("Concrete01", 1, -30.0, -0.002, -15.0, -0.005)
+    ops.uniaxialMaterial("Steel01", 2, 400.0, 2.0e5, 0.02)
+    ops.section("Fiber", 1, "-GJ", 1e6)
+    ops.patch("rect", 1, 6, 4, -0.25, -0.2, 0.25, 0.2)
+    ops.layer("straight", 2, 3, 5e-4, -0.2, -0.15, 0.2, -0.15)
+    ops.layer("straight", 2, 3, 5e-4, -0.2, 0.15, 0.2, 0.15)
+    ops.section("Fiber", 2, "-GJ", 1e6)
+    ops.patch("rect", 1, 4, 4, -0.25, -0.2, 0.25, 0.2)
+    ops.layer("straight", 2, 2, 5e-4, -0.2, -0.15, 0.2, -0.15)
+    ops.layer("straight", 2, 2, 5e-4, -0.2, 0.15, 0.2, 0.15)
+    ops.geomTransf("Linear", 1, 1.0, 0.0, 0.0)
+    ops.beamIntegration("Lobatto", 1, 1, 5)
+    ops.beamIntegration("Lobatto", 2, 2, 3)
+    ops.node(1, 0.0, 0.0, 0.0)
+    ops.node(2, 0.0, 0.0, 3.0)
+    ops.node(3, 0.0, 0.0, 6.0)
+    ops.fix(1, 1, 1, 1, 1, 1, 1)
+    # the elements of different numbers of sections and fibers
+    ops.element("forceBeamColumn", 1, 1, 2, 1, 1)
+    ops.element("forceBeamColumn", 2, 2, 3, 1, 2)
+    ops.timeSeries("Linear", 1)
+    ops.pattern("Plain", 1, 1)
+    ops.load(3, 10.0, 0.0, -100.0, 0.0, 0.0, 0.0)
+    ops.system("BandGeneral")
+    ops.numberer("Plain")
+    ops.constraints("Plain")
+    ops.test("NormDispIncr", 1e-10, 20)
+    ops.algorithm("Newton")
+    ops.integrator("LoadControl", 0.2)
+    ops.analysis("Static")
+    odb = opst.post.CreateODB(odb_tag="test-fiber-sec", fiber_ele_tags="all")
+    for _ in range(5):
+        assert ops.analyze(1) == 0
+        odb.fetch_response_step()
+    odb.save_response()
+    resp = opst.post.get_element_responses("test-fiber-sec", ele_type="FiberSection", print_info=False)
+    for ele_tag, num_secs in ((1, 5), (2, 3)):
+        for i in range(num_secs):
+            fiber_data = _get_fiber_sec_data(ele_tag, i + 1)
+            data = resp.sel(eleTags=ele_tag, secPoints=i + 1)
+            n = len(fiber_data)
+            assert np.all(np.isnan(data["Stresses"].isel(time=-1, fiberPoints=slice(n, None))))
+            data = data.isel(fiberPoints=slice(0, n))
+            np.testing.assert_allclose(data["ys"], fiber_data[:, 0])
+            np.testing.assert_allclose(data["zs"], fiber_data[:, 1])
+            np.testing.assert_allclose(data["Stresses"].isel(time=-1), fiber_data[:, 4], rtol=1e-5, atol=1e-3)
+            np.testing.assert_allclose(data["Strains"].isel(time=-1), fiber_data[:, 5], rtol=1e-5, atol=1e-9)
+    assert np.all(np.isnan(resp["Stresses"].sel(eleTags=2, secPoints=[4, 5])))
+
+    # the fibers not returned in a step are NaN
+    num_fibers = np.array([[len(_get_fiber_sec_data(1, 1)) + 2]])
+    stress, strain, _, _ = _get_fiber_sec_resp({1: 1}, num_fibers, dtype=dict(float=np.float64))
+    np.testing.assert_allclose(stress[0, 0, :-2], _get_fiber_sec_data(1, 1)[:, 4], rtol=1e-5)
+    assert np.all(np.isnan(stress[0, 0, -2:])) and np.all(np.isnan(strain[0, 0, -2:]))
@@ -0,0 +1,90 @@
+import numpy as np
+import opstool as opst
+from opstool.pre.section.sec_mesh import _SEC_PROPS_CACHE
+
+
+def _build_l_section(mesh_size=0.05):
+    outlines = [[0, 0], [1.0, 0], [1.0, 0.2], [0.3, 0.2], [0.3, 0.8], [0, 0.8]]
+    sec_mesh = opst.pre.section.FiberSecMesh()
+    sec_mesh.add_patch_group({"web": opst.pre.section.create_polygon_patch(outlines)})
+    sec_mesh.set_mesh_size(mesh_size)
+    sec_mesh.set_ops_mat_tag(1)
+    sec_mesh.mesh()
+    return sec_mesh
+
+
+def test_sec_props_cache(tmp_path):
+    _SEC_PROPS_CACHE.clear()
+    sec_mesh = _build_l_section().set_props_cache_dir(tmp_path)
+    frame_props = sec_mesh.get_frame_props()
+    # no warping analysis for the frame props
+    assert "warping" not in _SEC_PROPS_CACHE[sec_mesh._props_key]
+    sec_props = sec_mesh.get_sec_props()
+    assert np.isclose(frame_props["J"], sec_props["J"])
+
+    # the same section is not solved again, from memory and from disk
+    sec_mesh2 = _build_l_section()
+    assert sec_mesh2.get_sec_props() == sec_props and not sec_mesh2._section_solved
+    _SEC_PROPS_CACHE.clear()
+    sec_mesh3 = _build_l_section().set_props_cache_dir(tmp_path)
+    assert sec_mesh3.get_sec_props()["Asy"] == sec_props["Asy"] and not sec_mesh3._section_solved
+
+    # the rotated props agree with the props of the rotated mesh
+    sec_mesh2.rotate(30, remesh=True)
+    rotated = sec_mesh2.get_sec_props()
+    assert not sec_mesh2._section_solved
+    section = sec_mesh2.get_section()
+    section.calculate_geometric_properties()
+    section.calculate_warping_properties()
+    assert np.allclose(rotated["centroid"], section.get_c())
+    assert np.allclose([rotated["Iy"], rotated["Iz"], rotated["Iyz"]], section.get_ic())
+    assert np.allclose([rotated["Wyt"], rotated["Wyb"], rotated["Wzt"], rotated["Wzb"]], section.get_z())
+    assert np.allclose([rotated["Asy"], rotated["Asz"]], section.get_as(), rtol=1e-3)
+    assert np.isclose(rotated["phi"], section.get_phi())
+
+    # the centroidal props are not changed by the centring
+    sec_mesh2.centring()
+    centred = sec_mesh2.get_sec_props()
+    assert centred["centroid"] == (0.0, 0.0)
+    assert np.isclose(centred["Iy"], rotated["Iy"]) and np.isclose(centred["Asz"], rotated["Asz"])
+
+
+def _box_patches(b, h, t):
+    outlines = [[0, 0], [b, 0], [b, h], [0, h]]
+    holes = [[t, t], [b - t, t], [b - t, h - t], [t, h - t]]
+    return {"box": opst.pre.section.create_polygon_patch(outlines, holes=[holes])}
+
+
+def test_mesh_var_sections():
+    sec_mesh_i = opst.pre.section.FiberSecMesh("pier")
+    sec_mesh_i.add_patch_group(_box_patches(2.0, 3.0, 0.4))
+    sec_mesh_i.set_mesh_size(0.2)
+    sec_mesh_i.set_ops_mat_tag(1)
+    sec_mesh_i.add_rebar_points([[0.2, 0.2], [1.8, 0.2]], dia=0.02, ops_mat_tag=2)
+    sec_mesh_j = opst.pre.section.FiberSecMesh()
+    sec_mesh_j.add_patch_group(_box_patches(2.5, 5.0, 0.5))
+    sec_mesh_j.add_rebar_points([[0.2, 0.2], [2.3, 0.2]], dia=0.03, ops_mat_tag=2)
+    path = [[0, 0, 0], [0, 0, 10]]
+    sec_meshes = opst.pre.section.mesh_var_sections(
+        sec_mesh_i, sec_mesh_j, path, n_sec=5, y_degree=1, z_degree=2, sec_props="frame"
+    )
+    outlines = opst.pre.section.var_line_string(
+        [[0, 0], [2.0, 0], [2.0, 3.0], [0, 3.0]], [[0, 0], [2.5, 0], [2.5, 5.0], [0, 5.0]], path,
+        n_sec=5, y_degree=1, z_degree=2,
+    )
+    holes = opst.pre.section.var_line_string(
+        [[0.4, 0.4], [1.6, 0.4], [1.6, 2.6], [0.4, 2.6]], [[0.5, 0.5], [2.0, 0.5], [2.0, 4.5], [0.5, 4.5]], path,
+        n_sec=5, y_degree=1, z_degree=2,
+    )
+    assert len(sec_meshes) == 5
+    # the same mesh at end i
+    np.testing.assert_allclose(sec_meshes[0].fiber_centers_map["box"], sec_mesh_i.fiber_centers_map["box"])
+    for sec_mesh, outline, hole in zip(sec_meshes, outlines, holes):
+        (x0, y0), (x1, y1) = np.min(outline, axis=0), np.max(outline, axis=0)
+        (u0, v0), (u1, v1) = np.min(hole, axis=0), np.max(hole, axis=0)
+        area = (x1 - x0) * (y1 - y0) - (u1 - u0) * (v1 - v0)
+        iy = ((x1 - x0) * (y1 - y0) ** 3 - (u1 - u0) * (v1 - v0) ** 3) / 12
+        assert np.isclose(sec_mesh.get_geom_area(), area)
+        assert np.isclose(sec_mesh.get_iy(), iy)
+    assert np.allclose(sec_meshes[-1].rebar_data[0]["rebar_xy"], [[0.2, 0.2], [2.3, 0.2]])
+    assert np.isclose(sec_meshes[2].rebar_data[0]["dia"], 0.025)